@@ -0,0 +1,250 @@
+"""
+Structured audit trail for master table writes.
+
+The CRUD helpers used to format every serialized row into an ``audit`` log
+line on the request thread. They now record one event per written row -
+action, table, row id, user, timestamp and only the fields that changed as
+``{field: [old, new]}`` - once the write's transaction commits.
+
+In ``async`` mode events go onto a bounded in-process queue drained by a
+``QueueListener`` thread, which writes them in batches: events that queued
+up while a batch was being written go out together, up to ``batch_size``
+per write. ``durable`` mode writes on the request thread instead. The sink
+is the append-only ``MasterAuditLog`` table (queried through ``/audit/``)
+or a JSONL file.
+
+When the queue is full the ``overflow`` policy applies:
+    block: wait up to ``block_timeout`` for room, then write on the
+        request thread.
+    inline: write on the request thread right away.
+    drop: discard the events and count them as dropped.
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import logging
+from logging.handlers import QueueListener
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, models, transaction
+from django.utils import timezone
+
+from .models import MasterAuditLog
+
+logger = logging.getLogger(__name__)
+
+DURABLE = 'durable'
+ASYNC = 'async'
+
+DATABASE = 'database'
+JSONL = 'jsonl'
+
+BLOCK = 'block'
+INLINE = 'inline'
+DROP = 'drop'
+
+
+def field_changes(model, instance, data):
+	"""
+	Return ``{field: [old, new]}`` for the fields in ``data`` whose value
+	differs from ``instance`` (``None`` for a new row). Related objects are
+	reduced to their primary key.
+	"""
+	changes = {}
+	for name, value in data.items():
+		field = model._meta.get_field(name)
+		old = field.value_from_object(instance) if instance is not None else None
+		if isinstance(value, models.Model):
+			value = value.pk
+		if old != value:
+			changes[name] = [old, value]
+	return changes
+
+
+class AuditQueueListener(QueueListener):
+	"""QueueListener whose shutdown waits for room in a full queue."""
+
+	def enqueue_sentinel(self):
+		self.queue.put(self._sentinel)
+
+
+class AuditBatchWriter:
+	"""
+	Listener handler collecting events and writing them once the queue is
+	drained or ``batch_size`` events are buffered.
+	"""
+
+	def __init__(self, trail, events):
+		self.trail = trail
+		self.events = events
+		self.batch = []
+
+	def handle(self, event):
+		self.batch.append(event)
+		if len(self.batch) >= self.trail.batch_size or self.events.empty():
+			self.flush()
+
+	def flush(self):
+		batch, self.batch = self.batch, []
+		if not batch:
+			return
+		try:
+			self.trail.write(batch)
+		except Exception as e:
+			self.trail.count('dropped', len(batch))
+			logger.error(f"Audit batch of {len(batch)} events lost: {str(e)}")
+		finally:
+			close_old_connections()
+
+
+class AuditTrail:
+	"""
+	Audit events of master table writes, written in batches.
+	"""
+
+	def __init__(self, mode=ASYNC, sink=DATABASE, path=None, batch_size=500,
+			max_pending=10000, overflow=BLOCK, block_timeout=0.05):
+		if mode not in (DURABLE, ASYNC):
+			raise ValueError(f"Unknown audit mode: {mode}")
+		if sink not in (DATABASE, JSONL) or (sink == JSONL and not path):
+			raise ValueError(f"Unknown audit sink: {sink}")
+		if overflow not in (BLOCK, INLINE, DROP):
+			raise ValueError(f"Unknown audit overflow policy: {overflow}")
+		self.mode = mode
+		self.sink = sink
+		self.path = path
+		self.batch_size = batch_size
+		self.max_pending = max_pending
+		self.overflow = overflow
+		self.block_timeout = block_timeout
+		self._lock = threading.Lock()
+		self._file_lock = threading.Lock()
+		self._events = None
+		self._listener = None
+		self._writer = None
+		self._listener_pid = None
+		self._stats = {'recorded': 0, 'written': 0, 'batches': 0, 'inline': 0, 'dropped': 0, 'errors': 0}
+		atexit.register(self.stop)
+
+	def record(self, action, table_name, user, rows, using=None):
+		"""
+		Audit ``rows`` (``[(row_id, changes)]``) of one write once the
+		current transaction commits.
+		"""
+		username = getattr(user, 'username', 'unknown')
+		created_at = timezone.now()
+		events = [
+			{
+				'action': action, 'table_name': table_name, 'row_id': row_id,
+				'username': username, 'changes': changes, 'created_at': created_at,
+			}
+			for row_id, changes in rows
+		]
+		if events:
+			transaction.on_commit(lambda: self.submit(events), using=using)
+
+	def submit(self, events):
+		"""Queue committed events, or write them as the mode and overflow policy say."""
+		self.count('recorded', len(events))
+		if self.mode == DURABLE:
+			self.write(events)
+			return
+		pending = self._get_queue()
+		for index, event in enumerate(events):
+			try:
+				if self.overflow == BLOCK:
+					pending.put(event, timeout=self.block_timeout)
+				else:
+					pending.put_nowait(event)
+			except queue.Full:
+				self._overflow(events[index:])
+				return
+
+	def _overflow(self, events):
+		if self.overflow == DROP:
+			self.count('dropped', len(events))
+			logger.warning(f"Audit queue full, dropped {len(events)} events")
+			return
+		self.count('inline', len(events))
+		self.write(events)
+
+	def write(self, events):
+		"""Write ``events`` to the sink in one batch."""
+		try:
+			if self.sink == DATABASE:
+				MasterAuditLog.objects.bulk_create(
+					[MasterAuditLog(**event) for event in events], batch_size=self.batch_size
+				)
+			else:
+				lines = ''.join(
+					json.dumps(event, cls=DjangoJSONEncoder, separators=(',', ':')) + '\n'
+					for event in events
+				)
+				with self._file_lock, open(self.path, 'a', encoding='utf-8') as audit_file:
+					audit_file.write(lines)
+		except Exception:
+			self.count('errors', 1)
+			raise
+		with self._lock:
+			self._stats['written'] += len(events)
+			self._stats['batches'] += 1
+
+	def flush(self):
+		"""Wait until every queued event has been written."""
+		with self._lock:
+			running = self._listener is not None and self._listener_pid == os.getpid()
+			events = self._events
+		if running:
+			events.join()
+
+	def stop(self):
+		"""Stop the listener after it has written every queued event."""
+		with self._lock:
+			listener, writer = self._listener, self._writer
+			running = listener is not None and self._listener_pid == os.getpid()
+			self._listener = None
+		if running:
+			try:
+				listener.stop()
+				writer.flush()
+			except Exception as e:
+				logger.error(f"Audit trail shutdown failed: {str(e)}")
+
+	def count(self, counter, amount):
+		with self._lock:
+			self._stats[counter] += amount
+
+	def stats(self):
+		"""Return audit counters and the current queue depth."""
+		with self._lock:
+			stats = dict(self._stats)
+			stats['pending'] = self._events.qsize() if self._events is not None else 0
+		stats['mode'] = self.mode
+		stats['sink'] = self.sink
+		return stats
+
+	def _get_queue(self):
+		"""Start the queue and its listener thread once per process (after fork)."""
+		pid = os.getpid()
+		with self._lock:
+			if self._listener is None or self._listener_pid != pid:
+				self._events = queue.Queue(maxsize=self.max_pending)
+				self._writer = AuditBatchWriter(self, self._events)
+				self._listener = AuditQueueListener(self._events, self._writer)
+				self._listener.start()
+				self._listener_pid = pid
+			return self._events
+
+
+audit_trail = AuditTrail(
+	mode=getattr(settings, 'MASTER_AUDIT_SETTINGS', {}).get('mode', ASYNC),
+	sink=getattr(settings, 'MASTER_AUDIT_SETTINGS', {}).get('sink', DATABASE),
+	path=getattr(settings, 'MASTER_AUDIT_SETTINGS', {}).get('path'),
+	batch_size=getattr(settings, 'MASTER_AUDIT_SETTINGS', {}).get('batch_size', 500),
+	max_pending=getattr(settings, 'MASTER_AUDIT_SETTINGS', {}).get('max_pending', 10000),
+	overflow=getattr(settings, 'MASTER_AUDIT_SETTINGS', {}).get('overflow', BLOCK),
+	block_timeout=getattr(settings, 'MASTER_AUDIT_SETTINGS', {}).get('block_timeout', 0.05),
+)
@@ -4,6 +4,10 @@ from rest_framework_simplejwt.exceptions import InvalidToken
 from types import SimpleNamespace
 
 class CustomJWTAuthentication(JWTAuthentication):
+    async def aauthenticate(self, request):
+        # The user is built from the token alone, so there is no I/O to await
+        return self.authenticate(request)
+
     def get_user(self, validated_token):
         userlogin = validated_token.get("userlogin", None)
         if not userlogin:
@@ -15,5 +19,6 @@ class CustomJWTAuthentication(JWTAuthentication):
         user.userlogin = userlogin
         user.pk = userlogin  # Add pk attribute for DRF compatibility
         user.is_authenticated = True
+        user.role = validated_token.get("role", None)  # Issued by auth_service at login
         user.is_superuser = False  # Set as needed, or extract from token if present
         return user
@@ -0,0 +1,51 @@
+"""
+Thread pool for rendering several master tables in one request.
+
+Tables missing from the cache are rendered concurrently, each worker thread
+using its own database connection. Threads are long-lived, so every one
+keeps a persistent connection (up to ``max_workers`` extra connections per
+gunicorn worker); ``close_old_connections`` around each task applies the
+usual ``CONN_MAX_AGE`` and health-check rules to them.
+"""
+
+import os
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_pid = None
+_lock = threading.Lock()
+
+
+def _get_executor(max_workers):
+	"""Create the executor lazily, once per process (after fork)."""
+	global _executor, _executor_pid
+	pid = os.getpid()
+	with _lock:
+		if _executor is None or _executor_pid != pid:
+			_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='master-batch')
+			_executor_pid = pid
+		return _executor
+
+
+def _run_with_connection(func, arg):
+	close_old_connections()
+	try:
+		return func(arg)
+	finally:
+		close_old_connections()
+
+
+def map_concurrently(func, args):
+	"""Return ``[func(arg) for arg in args]``, running calls on the batch pool."""
+	max_workers = getattr(settings, 'MASTER_BATCH_SETTINGS', {}).get('max_workers', 4)
+	if len(args) < 2 or max_workers < 2:
+		return [func(arg) for arg in args]
+	executor = _get_executor(max_workers)
+	futures = [executor.submit(_run_with_connection, func, arg) for arg in args]
+	return [future.result() for future in futures]
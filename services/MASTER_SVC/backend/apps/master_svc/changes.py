@@ -0,0 +1,130 @@
+"""
+Change tracking for delta syncs of master tables.
+
+Every create, update and delete made through the CRUD helpers appends one
+``MasterChangeLog`` row per affected row, in the same transaction as the
+write. The log id is a global, monotonic revision: a client that last synced
+at revision ``R`` asks for ``since=R`` and gets the rows of one table
+upserted or deleted after it, which costs O(changes) instead of O(table).
+
+Deletes go through ``tracked_delete`` so rows removed by ``CASCADE`` get
+tombstones as well. On PostgreSQL log rows are written under a transaction
+level advisory lock, so revisions become visible in commit order and a
+reader can never skip a revision that commits late.
+
+The log is pruned after ``retention_days`` (``prune_master_changes``); a
+client whose revision is older than the log, or unknown, gets a full
+snapshot with ``reset`` set instead of a delta.
+
+The app ships no migrations: create ``tbl_master_change_log`` on existing
+databases with ``docs/schema.sql`` before deploying, as every write
+inserts into it.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from django.db import connections, router, transaction
+from django.db.models import Max, Min
+from django.db.models.deletion import Collector
+from django.utils import timezone
+
+from .models import MasterChangeLog
+
+logger = logging.getLogger(__name__)
+
+UPSERT = MasterChangeLog.UPSERT
+DELETE = MasterChangeLog.DELETE
+
+# pg_advisory_xact_lock key serializing change log writers
+CHANGE_LOG_LOCK = 0x6d617374
+
+
+def record_changes(table_name, op, row_ids):
+	"""Append one change of ``op`` per row id of ``table_name``."""
+	row_ids = [row_id for row_id in row_ids if row_id is not None]
+	if not row_ids:
+		return
+	using = router.db_for_write(MasterChangeLog)
+	with transaction.atomic(using=using, savepoint=False):
+		connection = connections[using]
+		if connection.vendor == 'postgresql':
+			with connection.cursor() as cursor:
+				cursor.execute('SELECT pg_advisory_xact_lock(%s)', [CHANGE_LOG_LOCK])
+		MasterChangeLog.objects.using(using).bulk_create([
+			MasterChangeLog(table_name=table_name, row_id=row_id, op=op) for row_id in row_ids
+		])
+
+
+def tracked_delete(queryset, tables):
+	"""
+	Delete the rows of ``queryset`` and everything they cascade to, writing
+	a tombstone for each deleted row of a table in ``tables``. Returns
+	``{table_name: deleted row ids}``.
+	"""
+	collector = Collector(using=queryset.db, origin=queryset)
+	collector.collect(queryset)
+	deleted = defaultdict(set)
+	for model, instances in collector.data.items():
+		deleted[model._meta.db_table].update(instance.pk for instance in instances)
+	for fast_delete in collector.fast_deletes:
+		deleted[fast_delete.model._meta.db_table].update(fast_delete.values_list('pk', flat=True))
+	with transaction.atomic(using=queryset.db, savepoint=False):
+		collector.delete()
+		for table_name, row_ids in deleted.items():
+			if table_name in tables:
+				record_changes(table_name, DELETE, sorted(row_ids))
+	return dict(deleted)
+
+
+def revision_bounds():
+	"""Return the (oldest, latest) revision in the log, ``(None, None)`` when empty."""
+	bounds = MasterChangeLog.objects.aggregate(oldest=Min('id'), latest=Max('id'))
+	return bounds['oldest'], bounds['latest']
+
+
+def is_stale(since, oldest, latest):
+	"""
+	Return whether a delta from ``since`` cannot be served from the log:
+	the client has never synced, changes after ``since`` were pruned, or
+	``since`` is ahead of the log (another database or a restored backup).
+	"""
+	if since <= 0 or latest is None:
+		return True
+	return since < oldest - 1 or since > latest
+
+
+def changes_since(table_name, since, limit, latest=None):
+	"""
+	Return ``(revision, upserted ids, deleted ids, has_more)`` for the first
+	``limit`` changes of ``table_name`` after ``since``. Only the last change
+	of each row counts; ``revision`` is the last one read, or ``latest`` (the
+	log's latest revision, read before the changes) when every change was
+	read, so a quiet table's revision keeps up with the log and does not go
+	stale once older revisions are pruned.
+	"""
+	changes = list(
+		MasterChangeLog.objects.filter(table_name=table_name, id__gt=since)
+		.order_by('id').values_list('id', 'row_id', 'op')[:limit + 1]
+	)
+	has_more = len(changes) > limit
+	changes = changes[:limit]
+	last_op = {}
+	for revision, row_id, op in changes:
+		last_op.pop(row_id, None)
+		last_op[row_id] = op
+	upserted = [row_id for row_id, op in last_op.items() if op == UPSERT]
+	deleted = [row_id for row_id, op in last_op.items() if op == DELETE]
+	revision = changes[-1][0] if changes else since
+	if not has_more and latest is not None:
+		revision = max(revision, latest)
+	return revision, upserted, deleted, has_more
+
+
+def prune_changes(retention_days):
+	"""Delete changes older than ``retention_days``, keeping the latest revision."""
+	cutoff = timezone.now() - timedelta(days=retention_days)
+	latest = MasterChangeLog.objects.aggregate(latest=Max('id'))['latest']
+	deleted, _ = MasterChangeLog.objects.filter(changed_at__lt=cutoff).exclude(id=latest).delete()
+	logger.info(f"Pruned {deleted} master changes older than {retention_days} days")
+	return deleted
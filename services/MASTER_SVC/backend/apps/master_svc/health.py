@@ -1,5 +1,50 @@
 # MASTER_SVC health check logic
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
+from common_db.routers import replica_health
+from common_metrics import db_pool
+from common_metrics.request_metrics import request_metrics
+from .table_cache import table_cache
+from .audit import audit_trail
 
 def health_check(request):
-	return JsonResponse({'status': 'ok'})
+	return JsonResponse({
+		'status': 'ok',
+		'database_pool': db_pool.pool_stats(),
+		'database_replicas': replica_health.stats(),
+	})
+
+def metrics(request):
+	# Per-endpoint latency histograms and counters in Prometheus text format
+	return HttpResponse(
+		request_metrics.render_prometheus() + table_cache_metrics() + audit_metrics()
+		+ db_pool.render_prometheus('master_svc'),
+		content_type='text/plain; version=0.0.4; charset=utf-8'
+	)
+
+def table_cache_metrics():
+	# Per-table cache counters of this worker
+	lines = []
+	stats = table_cache.stats()
+	for counter, suffix, kind in (
+			('hits', 'hits_total', 'counter'),
+			('misses', 'misses_total', 'counter'),
+			('invalidations', 'invalidations_total', 'counter'),
+			('invalidation_errors', 'invalidation_errors_total', 'counter'),
+			('hit_ratio', 'hit_ratio', 'gauge')):
+		name = f'master_svc_table_cache_{suffix}'
+		lines.append(f'# TYPE {name} {kind}')
+		for table_name, counters in sorted(stats.items()):
+			lines.append(f'{name}{{table="{table_name}"}} {counters[counter]}')
+	return '\n'.join(lines) + '\n'
+
+def audit_metrics():
+	# Audit trail counters and queue depth of this worker
+	stats = audit_trail.stats()
+	lines = ['# TYPE master_svc_audit_events_total counter']
+	for outcome in ('recorded', 'written', 'inline', 'dropped'):
+		lines.append(f'master_svc_audit_events_total{{outcome="{outcome}"}} {stats[outcome]}')
+	lines.append('# TYPE master_svc_audit_write_errors_total counter')
+	lines.append(f'master_svc_audit_write_errors_total {stats["errors"]}')
+	lines.append('# TYPE master_svc_audit_queue_depth gauge')
+	lines.append(f'master_svc_audit_queue_depth {stats["pending"]}')
+	return '\n'.join(lines) + '\n'
@@ -0,0 +1,82 @@
+"""
+Ship state -> location -> activity type -> activity details tree.
+
+The active tree (or the subtree below one state, location or activity type)
+is loaded with one query per level through ``Prefetch`` querysets filtered
+on ``is_active``, turned into nested dicts in a single pass over the rows
+and rendered to JSON bytes. The bytes are cached under the generations of
+all four tables, so any write to them rebuilds the tree on the next request.
+"""
+
+from django.db.models import Prefetch
+from rest_framework.renderers import JSONRenderer
+
+from .models import ShipStateMaster, ShipLocationMaster, ActivityTypeMaster, ActivityDetailsMaster
+from .table_cache import table_cache
+
+HIERARCHY_TABLES = tuple(
+	model._meta.db_table
+	for model in (ShipStateMaster, ShipLocationMaster, ActivityTypeMaster, ActivityDetailsMaster)
+)
+
+ROOT_LEVELS = ('state', 'location', 'activity_type')
+
+
+def active(model):
+	return model.objects.filter(is_active=True).order_by('id')
+
+
+def tree_queryset(level):
+	"""Return the active rows of ``level`` with every lower level prefetched."""
+	details = Prefetch('activity_details', queryset=active(ActivityDetailsMaster))
+	if level == 'activity_type':
+		return active(ActivityTypeMaster).prefetch_related(details)
+	activity_types = Prefetch('activity_types', queryset=active(ActivityTypeMaster).prefetch_related(details))
+	if level == 'location':
+		return active(ShipLocationMaster).prefetch_related(activity_types)
+	locations = Prefetch('locations', queryset=active(ShipLocationMaster).prefetch_related(activity_types))
+	return active(ShipStateMaster).prefetch_related(locations)
+
+
+def activity_type_node(activity_type):
+	return {
+		'id': activity_type.id,
+		'ship_activity_type': activity_type.ship_activity_type,
+		'activity_details': [{'id': detail.id} for detail in activity_type.activity_details.all()],
+	}
+
+
+def location_node(location):
+	return {
+		'id': location.id,
+		'ship_location': location.ship_location,
+		'activity_types': [activity_type_node(item) for item in location.activity_types.all()],
+	}
+
+
+def state_node(state):
+	return {
+		'id': state.id,
+		'ship_state': state.ship_state,
+		'locations': [location_node(item) for item in state.locations.all()],
+	}
+
+
+NODE_BUILDERS = {'state': state_node, 'location': location_node, 'activity_type': activity_type_node}
+
+
+def build_tree(level='state', pk=None):
+	"""Return the active tree rooted at ``level`` (one node when ``pk`` is given)."""
+	queryset = tree_queryset(level)
+	if pk is not None:
+		queryset = queryset.filter(pk=pk)
+	return [NODE_BUILDERS[level](node) for node in queryset]
+
+
+def hierarchy_payload(level='state', pk=None):
+	"""Return the tree as cached JSON bytes."""
+	return table_cache.get_derived(
+		f"hierarchy:{level}:{pk if pk is not None else 'all'}",
+		HIERARCHY_TABLES,
+		lambda: JSONRenderer().render(build_tree(level, pk)),
+	)
@@ -0,0 +1,25 @@
+"""
+Management command to remove old rows from the master table change log.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from apps.master_svc.changes import prune_changes
+
+
+class Command(BaseCommand):
+	help = 'Delete tbl_master_change_log rows older than the retention period'
+
+	def add_arguments(self, parser):
+		parser.add_argument(
+			'--days',
+			type=int,
+			default=getattr(settings, 'MASTER_CHANGE_LOG_SETTINGS', {}).get('retention_days', 30),
+			help='Days of changes to keep (default: MASTER_CHANGE_LOG_RETENTION_DAYS)',
+		)
+
+	def handle(self, *args, **options):
+		deleted = prune_changes(options['days'])
+		self.stdout.write(
+			self.style.SUCCESS(f'Deleted {deleted} changes older than {options["days"]} days')
+		)
@@ -1,4 +1,5 @@
 from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
 
 class CommandMaster(models.Model):
 	command = models.CharField(max_length=255)
@@ -6,23 +7,37 @@ class CommandMaster(models.Model):
 	code = models.CharField(max_length=50)
 	class Meta:
 		db_table = 'tbl_command_master'
+		indexes = [
+			models.Index(fields=['command', 'id'], name='command_master_command_idx'),
+			models.Index(fields=['code', 'id'], name='command_master_code_idx'),
+		]
 
 class DepartmentMaster(models.Model):
 	name = models.CharField(max_length=255)
 	type = models.CharField(max_length=100)
 	class Meta:
 		db_table = 'tbl_department_master'
+		indexes = [
+			models.Index(fields=['name', 'id'], name='department_master_name_idx'),
+			models.Index(fields=['type', 'id'], name='department_master_type_idx'),
+		]
 
 class EquipmentCategoryMaster(models.Model):
 	name = models.CharField(max_length=255)
 	class Meta:
 		db_table = 'tbl_equipment_category_master'
+		indexes = [
+			models.Index(fields=['name', 'id'], name='equipment_category_name_idx'),
+		]
 
 class ShipCategoryMaster(models.Model):
 	name = models.CharField(max_length=255)
 	description = models.TextField()
 	class Meta:
 		db_table = 'tbl_ship_category_master'
+		indexes = [
+			models.Index(fields=['name', 'id'], name='ship_category_name_idx'),
+		]
 
 class RoleMaster(models.Model):
 	status = models.IntegerField()
@@ -31,6 +46,11 @@ class RoleMaster(models.Model):
 	name = models.CharField(max_length=100)
 	class Meta:
 		db_table = 'tbl_role_master'
+		indexes = [
+			models.Index(fields=['status', 'role_id'], name='role_master_status_idx'),
+			models.Index(fields=['level', 'role_id'], name='role_master_level_idx'),
+			models.Index(fields=['name', 'role_id'], name='role_master_name_idx'),
+		]
   
   
 # --- New Master Tables ---
@@ -39,6 +59,10 @@ class ShipStateMaster(models.Model):
 	is_active = models.BooleanField(default=True)
 	class Meta:
 		db_table = 'tbl_ship_state_master'
+		indexes = [
+			models.Index(fields=['ship_state', 'id'], name='ship_state_name_idx'),
+			models.Index(fields=['is_active', 'id'], name='ship_state_active_idx'),
+		]
 
 class ShipLocationMaster(models.Model):
 	ship_location = models.CharField(max_length=255)
@@ -46,6 +70,10 @@ class ShipLocationMaster(models.Model):
 	is_active = models.BooleanField(default=True)
 	class Meta:
 		db_table = 'tbl_ship_location_master'
+		indexes = [
+			models.Index(fields=['ship_location', 'id'], name='ship_location_name_idx'),
+			models.Index(fields=['is_active', 'id'], name='ship_location_active_idx'),
+		]
 
 class ActivityTypeMaster(models.Model):
 	ship_activity_type = models.CharField(max_length=255)
@@ -53,6 +81,10 @@ class ActivityTypeMaster(models.Model):
 	is_active = models.BooleanField(default=True)
 	class Meta:
 		db_table = 'tbl_activity_type_master'
+		indexes = [
+			models.Index(fields=['ship_activity_type', 'id'], name='activity_type_name_idx'),
+			models.Index(fields=['is_active', 'id'], name='activity_type_active_idx'),
+		]
 
 class ActivityDetailsMaster(models.Model):
 	# 'Missing' field not specified, so only activity_type_id and is_active are used
@@ -60,6 +92,9 @@ class ActivityDetailsMaster(models.Model):
 	is_active = models.BooleanField(default=True)
 	class Meta:
 		db_table = 'tbl_activity_details_master'
+		indexes = [
+			models.Index(fields=['is_active', 'id'], name='activity_details_active_idx'),
+		]
 
 class LubricantMaster(models.Model):
 	lubricant_name = models.CharField(max_length=255)
@@ -69,3 +104,43 @@ class LubricantMaster(models.Model):
 	is_active = models.BooleanField(default=True)
 	class Meta:
 		db_table = 'tbl_lubricant_master'
+		indexes = [
+			models.Index(fields=['lubricant_name', 'id'], name='lubricant_name_idx'),
+			models.Index(fields=['lubricant_code', 'id'], name='lubricant_code_idx'),
+			models.Index(fields=['lubricant_type', 'id'], name='lubricant_type_idx'),
+			models.Index(fields=['is_active', 'id'], name='lubricant_active_idx'),
+		]
+
+
+# --- Change Tracking ---
+class MasterChangeLog(models.Model):
+	# One row per row written through the CRUD helpers; the id is the revision
+	UPSERT = 'upsert'
+	DELETE = 'delete'
+	id = models.BigAutoField(primary_key=True)
+	table_name = models.CharField(max_length=64)
+	row_id = models.BigIntegerField()
+	op = models.CharField(max_length=6, choices=[(UPSERT, 'Upsert'), (DELETE, 'Delete')])
+	changed_at = models.DateTimeField(auto_now_add=True)
+	class Meta:
+		db_table = 'tbl_master_change_log'
+		indexes = [
+			models.Index(fields=['table_name', 'id'], name='change_log_table_idx'),
+			models.Index(fields=['changed_at'], name='change_log_changed_at_idx'),
+		]
+
+class MasterAuditLog(models.Model):
+	# Append-only audit trail written in batches by apps.master_svc.audit
+	id = models.BigAutoField(primary_key=True)
+	action = models.CharField(max_length=16)
+	table_name = models.CharField(max_length=64)
+	row_id = models.BigIntegerField()
+	username = models.CharField(max_length=150)
+	changes = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+	created_at = models.DateTimeField()
+	class Meta:
+		db_table = 'tbl_master_audit_log'
+		indexes = [
+			models.Index(fields=['table_name', 'row_id', 'id'], name='audit_log_row_idx'),
+			models.Index(fields=['username', 'id'], name='audit_log_username_idx'),
+		]
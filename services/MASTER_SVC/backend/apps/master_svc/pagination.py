@@ -0,0 +1,120 @@
+"""
+Keyset pagination, filtering, ordering and sparse fieldsets for the generic
+master table listing.
+
+A cursor holds the ordering value and primary key of the last row returned,
+so every page is an index range scan (no OFFSET). Filters and ordering are
+limited to the columns each table declares in ``TABLE_QUERY_OPTIONS``,
+which are all indexed.
+"""
+
+import base64
+import json
+from functools import lru_cache
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class InvalidListRequest(Exception):
+	"""Exception raised for a bad filter, ordering, field list or cursor."""
+	pass
+
+
+def encode_cursor(value, pk):
+	"""Encode the last row's ordering value and pk as an opaque cursor."""
+	return base64.urlsafe_b64encode(json.dumps([value, pk]).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+	"""Return ``(value, pk)`` stored in ``cursor``."""
+	try:
+		padded = cursor + '=' * (-len(cursor) % 4)
+		value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+		return value, pk
+	except (ValueError, TypeError, UnicodeDecodeError) as e:
+		raise InvalidListRequest(f'Invalid cursor: {cursor}') from e
+
+
+def parse_page_size(value, default, maximum):
+	"""Return the requested page size clamped to ``[1, maximum]``."""
+	if value in (None, ''):
+		return default
+	try:
+		return max(1, min(int(value), maximum))
+	except (TypeError, ValueError):
+		raise InvalidListRequest(f'Invalid page_size: {value}')
+
+
+def parse_since(value):
+	"""Return the ``since`` revision of a delta request."""
+	try:
+		return int(value)
+	except (TypeError, ValueError):
+		raise InvalidListRequest(f'Invalid since: {value}')
+
+
+def parse_fields(value):
+	"""Accept ``fields`` as a comma separated string or a list."""
+	if value in (None, '', []):
+		return None
+	if isinstance(value, str):
+		value = value.split(',')
+	return tuple(field.strip() for field in value if field.strip())
+
+
+def apply_filters(queryset, params, allowed):
+	"""Apply exact-match filters for every param naming an allowed column or the pk."""
+	pk_name = queryset.model._meta.pk.name
+	filters = {}
+	for name, value in params.items():
+		if name not in allowed and name != pk_name:
+			raise InvalidListRequest(f'Invalid filter: {name}')
+		if value in ('true', 'false'):
+			value = value == 'true'
+		filters[name] = value
+	try:
+		return queryset.filter(**filters)
+	except (ValueError, ValidationError) as e:
+		raise InvalidListRequest(f'Invalid filter value: {e}') from e
+
+
+def order_queryset(queryset, ordering, allowed):
+	"""Order by an allowed column (``-`` for descending) with pk as tiebreaker."""
+	pk_name = queryset.model._meta.pk.name
+	field = ordering.lstrip('-') if ordering else pk_name
+	if field != pk_name and field not in allowed:
+		raise InvalidListRequest(f'Invalid ordering: {ordering}')
+	descending = bool(ordering) and ordering.startswith('-')
+	prefix = '-' if descending else ''
+	if field == pk_name:
+		return queryset.order_by(f'{prefix}{pk_name}'), field, descending
+	return queryset.order_by(f'{prefix}{field}', f'{prefix}{pk_name}'), field, descending
+
+
+def seek(queryset, field, descending, cursor):
+	"""Restrict ``queryset`` to rows after ``cursor`` in the current ordering."""
+	value, pk = decode_cursor(cursor)
+	pk_name = queryset.model._meta.pk.name
+	lookup = 'lt' if descending else 'gt'
+	if field == pk_name:
+		return queryset.filter(**{f'{pk_name}__{lookup}': pk})
+	return queryset.filter(
+		Q(**{f'{field}__{lookup}': value}) | Q(**{field: value, f'{pk_name}__{lookup}': pk})
+	)
+
+
+def cursor_for(instance, field):
+	"""Return the cursor pointing after ``instance``."""
+	value = getattr(instance, instance._meta.get_field(field).attname)
+	return encode_cursor(value, instance.pk)
+
+
+@lru_cache(maxsize=256)
+def sparse_serializer(serializer_class, fields):
+	"""Return a subclass of ``serializer_class`` limited to ``fields``."""
+	available = serializer_class().fields
+	unknown = [field for field in fields if field not in available]
+	if unknown:
+		raise InvalidListRequest(f'Invalid fields: {", ".join(unknown)}')
+	meta = type('Meta', (serializer_class.Meta,), {'fields': fields})
+	return type(f'Sparse{serializer_class.__name__}', (serializer_class,), {'Meta': meta})
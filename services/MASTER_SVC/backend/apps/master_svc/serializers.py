@@ -2,6 +2,7 @@
 from .models import ShipStateMaster, ShipLocationMaster, ActivityTypeMaster, ActivityDetailsMaster, LubricantMaster
 from rest_framework import serializers
 from .models import CommandMaster, DepartmentMaster, EquipmentCategoryMaster, ShipCategoryMaster, RoleMaster
+from .models import MasterAuditLog
 
 class CommandMasterSerializer(serializers.ModelSerializer):
 	class Meta:
@@ -53,3 +54,7 @@ class LubricantMasterSerializer(serializers.ModelSerializer):
 		model = LubricantMaster
 		fields = '__all__'
 
+class MasterAuditLogSerializer(serializers.ModelSerializer):
+	class Meta:
+		model = MasterAuditLog
+		fields = '__all__'
@@ -0,0 +1,152 @@
+"""
+Read-through cache of serialized master table listings.
+
+The unfiltered list of a table is rendered once to JSON bytes and stored in
+the shared cache under ``<prefix>:<table>:<generation>``. ``crud_create``,
+``crud_update`` and ``crud_delete`` bump the table's generation counter
+after writing, so every worker and replica reading the same cache switches
+to a fresh entry on its next request; old generations simply expire.
+
+The write has already committed when the generation is bumped, so a cache
+failure there is logged and counted instead of failing the request. This
+worker then bypasses the table's entries and retries the bump on its next
+read; other workers may serve the old entry until it expires, which
+``ttl`` bounds (five minutes by default).
+
+Payloads derived from several tables (the ship hierarchy tree) are cached
+with ``get_derived`` under the generations of all of them, so a write to
+any one table invalidates them.
+
+A per-process cache cannot be invalidated from other workers, so caching is
+disabled on the local memory backend unless ``enabled`` is set explicitly.
+"""
+
+import threading
+import time
+import logging
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from common_auth import async_cache
+from common_db.routers import primary_reads
+
+logger = logging.getLogger(__name__)
+
+
+class MasterTableCache:
+	"""
+	Serialized table payloads keyed by (table, generation).
+	"""
+
+	def __init__(self, key_prefix='master_table', ttl=300, enabled=None):
+		self.key_prefix = key_prefix
+		self.ttl = ttl
+		if enabled is None:
+			backend = settings.CACHES['default']['BACKEND']
+			enabled = 'locmem' not in backend.lower()
+		self.enabled = enabled
+		self._lock = threading.Lock()
+		self._stats = {}
+		# Tables whose generation bump failed, bypassed until one succeeds
+		self._stale = set()
+
+	def get(self, table_name, render):
+		"""Return the cached bytes for ``table_name``, calling ``render()`` on a miss."""
+		return self.get_derived(table_name, (table_name,), render)
+
+	async def aget(self, table_name, render):
+		"""``get`` for async views: a hit is read without blocking, anything else runs ``get`` in a thread."""
+		if self.enabled and table_name not in self._stale:
+			try:
+				generation = await async_cache.aget(f"{self.key_prefix}:generation:{table_name}")
+				body = None
+				if generation is not None:
+					body = await async_cache.aget(f"{self.key_prefix}:{table_name}:{generation}")
+			except Exception as e:
+				logger.warning(f"Master table cache unavailable, rendering {table_name}: {str(e)}")
+				body = None
+			if body is not None:
+				self._count(table_name, 'hits')
+				return body
+		return await sync_to_async(self.get)(table_name, render)
+
+	def get_derived(self, name, table_names, render):
+		"""Return cached bytes for ``name``, valid until any of ``table_names`` is written."""
+		if not self.enabled:
+			return render()
+		stale = self._stale.intersection(table_names)
+		if stale and not all([self.invalidate(table_name) for table_name in stale]):
+			return render()
+		try:
+			generations = ':'.join(str(self.generation(table_name)) for table_name in table_names)
+			cache_key = f"{self.key_prefix}:{name}:{generations}"
+			body = cache.get(cache_key)
+		except Exception as e:
+			logger.warning(f"Master table cache unavailable, rendering {name}: {str(e)}")
+			return render()
+		if body is not None:
+			self._count(name, 'hits')
+			return body
+
+		self._count(name, 'misses')
+		# Cached until the next write, so never rendered from a lagging replica
+		with primary_reads():
+			body = render()
+		try:
+			cache.set(cache_key, body, self.ttl)
+		except Exception as e:
+			logger.warning(f"Master table cache write failed for {name}: {str(e)}")
+		return body
+
+	def generation(self, table_name):
+		"""Return the table's generation, initializing it if needed."""
+		generation_key = f"{self.key_prefix}:generation:{table_name}"
+		generation = cache.get(generation_key)
+		if generation is None:
+			# Seed from the clock so a lost counter never reuses old entries
+			cache.add(generation_key, int(time.time()), None)
+			generation = cache.get(generation_key)
+		return generation
+
+	def invalidate(self, table_name):
+		"""Bump the table's generation after a write; return False if the cache failed."""
+		generation_key = f"{self.key_prefix}:generation:{table_name}"
+		try:
+			try:
+				cache.incr(generation_key)
+			except ValueError:
+				cache.set(generation_key, int(time.time()), None)
+		except Exception as e:
+			logger.error(f"Master table cache invalidation failed for {table_name}: {str(e)}")
+			with self._lock:
+				self._stale.add(table_name)
+			self._count(table_name, 'invalidation_errors')
+			return False
+		with self._lock:
+			self._stale.discard(table_name)
+		self._count(table_name, 'invalidations')
+		logger.debug(f"Master table cache invalidated: {table_name}")
+		return True
+
+	def stats(self):
+		"""Return per-table hit/miss counters for this process."""
+		with self._lock:
+			stats = {table: dict(counters) for table, counters in self._stats.items()}
+		for counters in stats.values():
+			lookups = counters['hits'] + counters['misses']
+			counters['hit_ratio'] = round(counters['hits'] / lookups, 4) if lookups else 0.0
+		return stats
+
+	def _count(self, table_name, name):
+		with self._lock:
+			counters = self._stats.setdefault(
+				table_name, {'hits': 0, 'misses': 0, 'invalidations': 0, 'invalidation_errors': 0}
+			)
+			counters[name] += 1
+
+
+table_cache = MasterTableCache(
+	key_prefix=getattr(settings, 'MASTER_TABLE_CACHE_SETTINGS', {}).get('key_prefix', 'master_table'),
+	ttl=getattr(settings, 'MASTER_TABLE_CACHE_SETTINGS', {}).get('ttl', 300),
+	enabled=getattr(settings, 'MASTER_TABLE_CACHE_SETTINGS', {}).get('enabled'),
+)
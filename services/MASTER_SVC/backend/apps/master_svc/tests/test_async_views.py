@@ -0,0 +1,58 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import path
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.master_svc.models import CommandMaster
+from apps.master_svc.table_cache import MasterTableCache
+from apps.master_svc.views import AsyncGenericListView
+
+urlpatterns = [
+    path('view/', AsyncGenericListView.as_view(), name='generic-list'),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncGenericListViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.table_cache = MasterTableCache(key_prefix='test_async', enabled=True)
+        patcher = mock.patch('apps.master_svc.views.table_cache', self.table_cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        token = AccessToken()
+        token['userlogin'] = 'tester'
+        self.headers = {'Authorization': f'Bearer {token}'}
+        CommandMaster.objects.create(command='Western', hq='Mumbai', code='WNC')
+        CommandMaster.objects.create(command='Eastern', hq='Visakhapatnam', code='ENC')
+
+    async def list_commands(self, **params):
+        return await self.async_client.get(
+            '/view/', {'table_name': 'tbl_command_master', **params}, headers=self.headers
+        )
+
+    async def test_unfiltered_list_served_from_cache(self):
+        first = await self.list_commands()
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual([row['code'] for row in first.json()], ['WNC', 'ENC'])
+        second = await self.list_commands()
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(self.table_cache.stats()['tbl_command_master'], {
+            'hits': 1, 'misses': 1, 'invalidations': 0, 'invalidation_errors': 0, 'hit_ratio': 0.5,
+        })
+
+    async def test_filtered_list(self):
+        response = await self.list_commands(code='ENC')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['command'] for row in response.json()], ['Eastern'])
+
+        response = await self.list_commands(hq='Mumbai')
+        self.assertEqual(response.status_code, 400)
+
+    async def test_rejects_unknown_table_and_anonymous(self):
+        response = await self.async_client.get('/view/', {'table_name': 'auth_user'}, headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+        response = await self.async_client.get('/view/', {'table_name': 'tbl_command_master'})
+        self.assertEqual(response.status_code, 401)
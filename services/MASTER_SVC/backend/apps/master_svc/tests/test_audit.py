@@ -0,0 +1,147 @@
+import json
+import os
+import tempfile
+import threading
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.master_svc.audit import AuditTrail
+from apps.master_svc.models import LubricantMaster, MasterAuditLog, ShipLocationMaster, ShipStateMaster
+from apps.master_svc.tests.test_bulk import WrapperClientMixin, lubricant
+from apps.master_svc.tests.test_views import authenticated_client
+
+
+class AuditTrailTest(WrapperClientMixin, TestCase):
+    def setUp(self):
+        self.client = authenticated_client(role='admin')
+        self.trail = AuditTrail(mode='durable')
+        patcher = mock.patch('apps.master_svc.views.audit_trail', self.trail)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def wrapper(self, method_name, data, table_name='tbl_lubricant_master'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return super().wrapper(method_name, data, table_name)
+
+    def test_update_records_changed_fields_only(self):
+        row = self.wrapper('create', lubricant(0)).json()
+        self.wrapper('update', {'id': row['id'], 'unit': 'Kg', 'lubricant_type': 'Oil'})
+
+        create, update = MasterAuditLog.objects.order_by('id')
+        self.assertEqual((create.action, create.row_id, create.username), ('create', row['id'], 'tester'))
+        self.assertEqual(create.changes['unit'], [None, 'L'])
+        self.assertEqual(update.changes, {'unit': ['L', 'Kg']})
+
+    def test_bulk_writes_and_cascades(self):
+        created = self.wrapper('bulk_create', [lubricant(index) for index in range(3)]).json()['data']
+        self.wrapper('bulk_update', [{'id': created[0]['id'], 'is_active': False}])
+        self.assertEqual(MasterAuditLog.objects.filter(action='create').count(), 3)
+        self.assertEqual(
+            MasterAuditLog.objects.get(action='update').changes, {'is_active': [True, False]}
+        )
+
+        state = ShipStateMaster.objects.create(ship_state='Refit')
+        location = ShipLocationMaster.objects.create(ship_location='Dock', ship_state=state)
+        with mock.patch('apps.master_svc.views.check_permission'):
+            self.wrapper('delete', {'id': state.pk}, table_name='tbl_ship_state_master')
+        self.assertEqual(
+            set(MasterAuditLog.objects.filter(action='delete').values_list('table_name', 'row_id')),
+            {('tbl_ship_state_master', state.pk), ('tbl_ship_location_master', location.pk)}
+        )
+
+    def test_rolled_back_write_not_audited(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.post(reverse('wrapper-api'), {
+                'table_name': 'tbl_lubricant_master', 'method_name': 'bulk_create',
+                'data': [lubricant(0), {'lubricant_name': 'x'}],
+            }, format='json')
+        self.assertEqual(callbacks, [])
+
+    def test_audit_query_api(self):
+        rows = [self.wrapper('create', lubricant(index)).json() for index in range(3)]
+        self.wrapper('update', {'id': rows[0]['id'], 'unit': 'Kg'})
+        url = reverse('audit-log')
+
+        response = self.client.get(url, {'table_name': 'tbl_lubricant_master', 'row_id': rows[0]['id']})
+        self.assertEqual([event['action'] for event in response.json()['results']], ['update', 'create'])
+        first = self.client.get(url, {'username': 'tester', 'page_size': 2}).json()
+        second = self.client.get(url, {'username': 'tester', 'cursor': first['next_cursor']}).json()
+        self.assertEqual(len(first['results']) + len(second['results']), 4)
+        self.assertFalse(second['has_more'])
+
+        self.assertEqual(self.client.get(url).status_code, 400)
+        self.assertEqual(self.client.get(url, {'row_id': 1}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'username': 'tester', 'status': 1}).status_code, 400)
+
+    def test_audit_query_requires_permission(self):
+        url = reverse('audit-log')
+        for client in (authenticated_client(), authenticated_client(role='user')):
+            self.assertEqual(client.get(url, {'username': 'tester'}).status_code, 403)
+        with self.settings(MASTER_AUDIT_ROLES=['auditor']):
+            self.assertEqual(self.client.get(url, {'username': 'tester'}).status_code, 403)
+            client = authenticated_client(role='auditor')
+            self.assertEqual(client.get(url, {'username': 'tester'}).status_code, 200)
+
+
+class AuditPipelineTest(TestCase):
+    def event(self, index):
+        return {
+            'action': 'create', 'table_name': 'tbl_lubricant_master', 'row_id': index,
+            'username': 'tester', 'changes': {'unit': [None, 'L']}, 'created_at': None,
+        }
+
+    def blocked_writes(self, trail):
+        """Hold writes of the listener thread until ``release`` is set."""
+        started, release = threading.Event(), threading.Event()
+        write = trail.write
+
+        def blocked_write(events):
+            if threading.current_thread() is not threading.main_thread():
+                started.set()
+                release.wait(5)
+            write(events)
+        return mock.patch.object(trail, 'write', side_effect=blocked_write), started, release
+
+    def test_listener_batches_queued_events(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'audit.jsonl')
+            trail = AuditTrail(sink='jsonl', path=path, batch_size=50)
+            patcher, started, release = self.blocked_writes(trail)
+            with patcher:
+                trail.submit([self.event(0)])
+                started.wait(5)
+                for index in range(1, 120):
+                    trail.submit([self.event(index)])
+                self.assertEqual(trail.stats()['pending'], 119)
+                release.set()
+                trail.flush()
+            trail.stop()
+            with open(path, encoding='utf-8') as audit_file:
+                lines = [json.loads(line) for line in audit_file]
+
+        self.assertEqual([line['row_id'] for line in lines], list(range(120)))
+        stats = trail.stats()
+        self.assertEqual((stats['written'], stats['batches'], stats['pending']), (120, 4, 0))
+
+    def test_overflow_policies(self):
+        for overflow, written, dropped in (('inline', 7, 0), ('drop', 2, 5), ('block', 7, 0)):
+            trail = AuditTrail(sink='jsonl', path=os.devnull, max_pending=1, overflow=overflow, block_timeout=0.01)
+            patcher, started, release = self.blocked_writes(trail)
+            with patcher:
+                trail.submit([self.event(0)])
+                started.wait(5)
+                trail.submit([self.event(index) for index in range(1, 7)])
+                release.set()
+                trail.flush()
+            trail.stop()
+            stats = trail.stats()
+            self.assertEqual((stats['written'], stats['dropped']), (written, dropped), overflow)
+            self.assertEqual(stats['inline'], 5 if overflow != 'drop' else 0, overflow)
+
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            AuditTrail(overflow='spill')
+        with self.assertRaises(ValueError):
+            AuditTrail(sink='jsonl')
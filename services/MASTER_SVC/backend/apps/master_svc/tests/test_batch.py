@@ -0,0 +1,85 @@
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from common_metrics.testing import QueryBudgetMixin
+from apps.master_svc.models import CommandMaster, DepartmentMaster, RoleMaster
+from apps.master_svc.table_cache import MasterTableCache
+from apps.master_svc.tests.test_views import authenticated_client
+from apps.master_svc import views
+
+
+def batch_list(client, table_names, versions=None):
+    return client.post(reverse('wrapper-api'), {
+        'method_name': 'batch_list',
+        'data': {'table_names': table_names, 'versions': versions or {}},
+    }, format='json')
+
+
+@override_settings(MASTER_BATCH_SETTINGS={'max_workers': 1})
+class BatchListTest(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch(
+            'apps.master_svc.views.table_cache', MasterTableCache(key_prefix='test_batch', enabled=True)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = authenticated_client()
+        CommandMaster.objects.create(command='Western', hq='Mumbai', code='WNC')
+        DepartmentMaster.objects.create(name='Engineering', type='Technical')
+
+    def test_returns_every_table(self):
+        response = batch_list(self.client, ['tbl_command_master', 'tbl_department_master', 'tbl_role_master'])
+        tables = response.json()['tables']
+        self.assertEqual(list(tables), ['tbl_command_master', 'tbl_department_master', 'tbl_role_master'])
+        self.assertEqual(tables['tbl_command_master']['data'][0]['code'], 'WNC')
+        self.assertEqual(tables['tbl_department_master']['data'][0]['name'], 'Engineering')
+        self.assertEqual(tables['tbl_role_master']['data'], [])
+
+    def test_unchanged_tables_skipped(self):
+        tables = batch_list(self.client, ['tbl_command_master', 'tbl_department_master']).json()['tables']
+        versions = {name: table['version'] for name, table in tables.items()}
+        DepartmentMaster.objects.create(name='Logistics', type='Support')
+        views.table_cache.invalidate('tbl_department_master')
+
+        with self.assertQueryBudget(1):
+            tables = batch_list(self.client, list(versions), versions).json()['tables']
+        self.assertEqual(tables['tbl_command_master'], {
+            'version': versions['tbl_command_master'], 'unchanged': True,
+        })
+        self.assertEqual(len(tables['tbl_department_master']['data']), 2)
+        self.assertNotEqual(tables['tbl_department_master']['version'], versions['tbl_department_master'])
+
+    def test_matches_single_table_list(self):
+        single = self.client.get(reverse('generic-list'), {'table_name': 'tbl_command_master'})
+        batched = batch_list(self.client, ['tbl_command_master']).json()['tables']
+        self.assertEqual(batched['tbl_command_master']['data'], single.json())
+
+    def test_invalid_requests(self):
+        self.assertEqual(batch_list(self.client, ['tbl_command_master', 'auth_user']).status_code, 400)
+        self.assertEqual(batch_list(self.client, []).status_code, 400)
+        self.assertEqual(batch_list(self.client, 'tbl_command_master').status_code, 400)
+
+
+@override_settings(MASTER_BATCH_SETTINGS={'max_workers': 4})
+class BatchListConcurrencyTest(TransactionTestCase):
+    def test_misses_rendered_on_pool_threads(self):
+        CommandMaster.objects.create(command='Western', hq='Mumbai', code='WNC')
+        RoleMaster.objects.create(status=1, level='L1', name='Admin')
+        threads = set()
+        render = views.table_payload
+
+        def record_thread(table_name):
+            threads.add(threading.current_thread().name)
+            return render(table_name)
+
+        with mock.patch('apps.master_svc.views.table_payload', side_effect=record_thread):
+            response = batch_list(authenticated_client(), ['tbl_command_master', 'tbl_role_master'])
+        tables = response.json()['tables']
+        self.assertEqual(tables['tbl_role_master']['data'][0]['name'], 'Admin')
+        self.assertEqual(tables['tbl_command_master']['data'][0]['code'], 'WNC')
+        self.assertTrue(all(name.startswith('master-batch') for name in threads))
@@ -0,0 +1,92 @@
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+
+from common_metrics.testing import QueryBudgetMixin
+from apps.master_svc.models import LubricantMaster, ShipLocationMaster, ShipStateMaster
+from apps.master_svc.tests.test_views import authenticated_client
+
+
+def lubricant(index, **overrides):
+    return {
+        'lubricant_name': f'Oil {index}', 'lubricant_code': f'L{index}',
+        'lubricant_type': 'Oil', 'unit': 'L', **overrides,
+    }
+
+
+class WrapperClientMixin:
+    def wrapper(self, method_name, data, table_name='tbl_lubricant_master'):
+        return self.client.post(reverse('wrapper-api'), {
+            'table_name': table_name, 'method_name': method_name, 'data': data,
+        }, format='json')
+
+
+class WrapperBulkTest(WrapperClientMixin, QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.client = authenticated_client()
+
+    def test_bulk_create(self):
+        with self.assertQueryBudget(4), self.captureOnCommitCallbacks() as callbacks:
+            response = self.wrapper('bulk_create', [lubricant(index) for index in range(50)])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['count'], 50)
+        self.assertEqual(LubricantMaster.objects.count(), 50)
+        self.assertEqual(len(callbacks), 1)
+
+    def test_bulk_create_reports_item_errors(self):
+        items = [lubricant(0), lubricant(1, unit=None), lubricant(2), {'lubricant_name': 'x'}]
+        response = self.wrapper('bulk_create', items)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([item['index'] for item in response.json()['items']], [1, 3])
+        self.assertIn('unit', response.json()['items'][0]['errors'])
+        self.assertFalse(LubricantMaster.objects.exists())
+
+    def test_bulk_create_resolves_foreign_keys(self):
+        state = ShipStateMaster.objects.create(ship_state='Refit')
+        response = self.wrapper('bulk_create', [
+            {'ship_location': 'Dock 1', 'ship_state': state.pk},
+            {'ship_location': 'Dock 2', 'ship_state': state.pk},
+        ], table_name='tbl_ship_location_master')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(state.locations.count(), 2)
+
+    def test_bulk_update(self):
+        rows = LubricantMaster.objects.bulk_create([LubricantMaster(**lubricant(i)) for i in range(3)])
+        with self.assertQueryBudget(5):
+            response = self.wrapper('bulk_update', [
+                {'id': rows[0].pk, 'is_active': False},
+                {'id': rows[2].pk, 'unit': 'Kg'},
+            ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 2)
+        self.assertFalse(LubricantMaster.objects.get(pk=rows[0].pk).is_active)
+        self.assertEqual(LubricantMaster.objects.get(pk=rows[2].pk).unit, 'Kg')
+        self.assertEqual(LubricantMaster.objects.get(pk=rows[1].pk).unit, 'L')
+
+    def test_bulk_update_unknown_id_writes_nothing(self):
+        row = LubricantMaster.objects.create(**lubricant(0))
+        response = self.wrapper('bulk_update', [{'id': row.pk, 'unit': 'Kg'}, {'id': 999, 'unit': 'Kg'}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['items'], [{'index': 1, 'errors': {'id': ['Not found.']}}])
+        self.assertEqual(LubricantMaster.objects.get(pk=row.pk).unit, 'L')
+
+    def test_bulk_delete(self):
+        rows = LubricantMaster.objects.bulk_create([LubricantMaster(**lubricant(i)) for i in range(4)])
+        with mock.patch('apps.master_svc.views.check_permission'):
+            missing = self.wrapper('bulk_delete', [rows[0].pk, 999])
+            with self.assertQueryBudget(6):
+                response = self.wrapper('bulk_delete', [rows[0].pk, {'id': rows[1].pk}])
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(response.json(), {'success': True, 'count': 2})
+        self.assertEqual(LubricantMaster.objects.count(), 2)
+
+    def test_bulk_delete_requires_permission(self):
+        row = LubricantMaster.objects.create(**lubricant(0))
+        response = self.wrapper('bulk_delete', [row.pk])
+        self.assertEqual(response.status_code, 403)
+        self.assertTrue(LubricantMaster.objects.exists())
+
+    def test_bulk_requires_list(self):
+        self.assertEqual(self.wrapper('bulk_create', {'lubricant_name': 'x'}).status_code, 400)
+        self.assertEqual(self.wrapper('create', [lubricant(0)]).status_code, 400)
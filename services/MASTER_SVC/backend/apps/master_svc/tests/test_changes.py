@@ -0,0 +1,123 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from common_metrics.testing import QueryBudgetMixin
+from apps.master_svc.models import (
+    ActivityTypeMaster, LubricantMaster, MasterChangeLog, ShipLocationMaster, ShipStateMaster
+)
+from apps.master_svc.tests.test_bulk import WrapperClientMixin, lubricant
+from apps.master_svc.tests.test_views import authenticated_client
+
+
+class DeltaSyncTest(WrapperClientMixin, QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.client = authenticated_client()
+        patcher = mock.patch('apps.master_svc.views.check_permission')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def delta(self, since, table_name='tbl_lubricant_master', **params):
+        return self.client.get(
+            reverse('generic-list'), {'table_name': table_name, 'since': since, **params}
+        )
+
+    def test_initial_sync_is_a_reset_snapshot(self):
+        LubricantMaster.objects.create(**lubricant(0))
+        self.wrapper('create', lubricant(1))
+        body = self.delta(0).json()
+        self.assertTrue(body['reset'])
+        self.assertEqual(len(body['upserts']), 2)
+        self.assertEqual(body['revision'], MasterChangeLog.objects.get().id)
+
+    def test_delta_returns_only_changes(self):
+        rows = [self.wrapper('create', lubricant(index)).json() for index in range(5)]
+        revision = self.delta(0).json()['revision']
+
+        self.wrapper('update', {'id': rows[1]['id'], 'unit': 'Kg'})
+        self.wrapper('delete', {'id': rows[2]['id']})
+        created = self.wrapper('create', lubricant(9)).json()
+        with self.assertQueryBudget(3):
+            body = self.delta(revision, fields='id,unit').json()
+
+        self.assertFalse(body['reset'])
+        self.assertEqual(body['upserts'], [{'id': rows[1]['id'], 'unit': 'Kg'}, {'id': created['id'], 'unit': 'L'}])
+        self.assertEqual(body['deletes'], [rows[2]['id']])
+        self.assertFalse(body['has_more'])
+        self.assertEqual(self.delta(body['revision']).json()['upserts'], [])
+
+    def test_delta_pages_and_collapses_row_changes(self):
+        row = self.wrapper('create', lubricant(0)).json()
+        revision = self.delta(0).json()['revision']
+        for unit in ('Kg', 'g', 'mL'):
+            self.wrapper('update', {'id': row['id'], 'unit': unit})
+        self.wrapper('delete', {'id': row['id']})
+
+        first = self.wrapper('list', {'since': revision, 'page_size': 2}).json()
+        self.assertTrue(first['has_more'])
+        self.assertEqual(first['deletes'], [row['id']])
+        second = self.wrapper('list', {'since': first['revision'], 'page_size': 2}).json()
+        self.assertFalse(second['has_more'])
+        self.assertEqual((second['upserts'], second['deletes']), ([], [row['id']]))
+
+    def test_bulk_writes_are_tracked(self):
+        self.wrapper('create', lubricant(9))
+        revision = self.delta(0).json()['revision']
+        created = self.wrapper('bulk_create', [lubricant(index) for index in range(3)]).json()['data']
+        ids = [row['id'] for row in created]
+        self.wrapper('bulk_update', [{'id': ids[0], 'is_active': False}])
+        self.wrapper('bulk_delete', ids[1:])
+
+        body = self.delta(revision).json()
+        self.assertEqual([row['id'] for row in body['upserts']], [ids[0]])
+        self.assertFalse(body['upserts'][0]['is_active'])
+        self.assertEqual(sorted(body['deletes']), ids[1:])
+
+    def test_cascaded_deletes_get_tombstones(self):
+        state = ShipStateMaster.objects.create(ship_state='Refit')
+        location = ShipLocationMaster.objects.create(ship_location='Dock', ship_state=state)
+        activity_type = ActivityTypeMaster.objects.create(ship_activity_type='Paint', ship_location=location)
+        self.wrapper('create', {'ship_state': 'Operational'}, table_name='tbl_ship_state_master')
+
+        self.wrapper('delete', {'id': state.pk}, table_name='tbl_ship_state_master')
+        for table_name, row_id in (
+                ('tbl_ship_location_master', location.pk),
+                ('tbl_activity_type_master', activity_type.pk)):
+            body = self.delta(1, table_name=table_name).json()
+            self.assertEqual(body['deletes'], [row_id])
+
+    def test_stale_revision_resets(self):
+        self.wrapper('create', lubricant(0))
+        latest = MasterChangeLog.objects.get().id
+        self.assertTrue(self.delta(latest + 10).json()['reset'])
+
+        self.wrapper('create', lubricant(1))
+        self.wrapper('create', lubricant(2))
+        MasterChangeLog.objects.update(changed_at=timezone.now() - timedelta(days=60))
+        call_command('prune_master_changes', days=30, stdout=StringIO())
+        self.assertEqual(MasterChangeLog.objects.count(), 1)
+        body = self.delta(latest).json()
+        self.assertTrue(body['reset'])
+        self.assertEqual(len(body['upserts']), 3)
+
+    def test_quiet_table_revision_follows_log(self):
+        self.wrapper('create', {'ship_state': 'Operational'}, table_name='tbl_ship_state_master')
+        revision = self.delta(0, table_name='tbl_ship_state_master').json()['revision']
+        for index in range(3):
+            self.wrapper('create', lubricant(index))
+        latest = MasterChangeLog.objects.latest('id').id
+
+        body = self.delta(revision, table_name='tbl_ship_state_master').json()
+        self.assertEqual((body['revision'], body['upserts']), (latest, []))
+        MasterChangeLog.objects.exclude(id=latest).update(changed_at=timezone.now() - timedelta(days=60))
+        call_command('prune_master_changes', days=30, stdout=StringIO())
+        self.assertFalse(self.delta(body['revision'], table_name='tbl_ship_state_master').json()['reset'])
+
+    def test_since_rejects_filters(self):
+        self.assertEqual(self.delta(1, is_active='true').status_code, 400)
+        self.assertEqual(self.delta('latest').status_code, 400)
@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from common_api.serializers import list_data
+from apps.master_svc.models import LubricantMaster, MasterAuditLog, ShipLocationMaster, ShipStateMaster
+from apps.master_svc.serializers import MasterAuditLogSerializer
+from apps.master_svc.tests.test_views import authenticated_client
+
+FAST_REST_FRAMEWORK = {
+    **settings.REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': ['common_api.renderers.ORJSONRenderer'],
+    'DEFAULT_PARSER_CLASSES': ['common_api.parsers.ORJSONParser'],
+}
+
+
+class FastJsonListTest(TestCase):
+    def setUp(self):
+        self.client = authenticated_client()
+        state = ShipStateMaster.objects.create(ship_state='Operational')
+        for index in range(3):
+            ShipLocationMaster.objects.create(ship_location=f'Berth {index}', ship_state=state)
+        for index, name in enumerate(['Grease', 'Hydraulic', 'Engine']):
+            LubricantMaster.objects.create(
+                lubricant_name=name, lubricant_code=f'L{index}', lubricant_type='Oil', unit='L',
+            )
+
+    def assertSameBody(self, table_name, **params):
+        url = reverse('generic-list')
+        expected = self.client.get(url, {'table_name': table_name, **params})
+        with override_settings(FAST_JSON=True, REST_FRAMEWORK=FAST_REST_FRAMEWORK):
+            response = self.client.get(url, {'table_name': table_name, **params})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, expected.content)
+
+    def test_full_list(self):
+        self.assertSameBody('tbl_ship_location_master')
+        self.assertSameBody('tbl_lubricant_master')
+
+    def test_filtered_sparse_list(self):
+        self.assertSameBody('tbl_lubricant_master', lubricant_type='Oil', fields='lubricant_name,unit')
+
+    def test_delta_reset(self):
+        self.assertSameBody('tbl_lubricant_master', since=0)
+
+    def test_converted_columns(self):
+        MasterAuditLog.objects.create(
+            action='update', table_name='tbl_lubricant_master', row_id=1, username='tester',
+            changes={'unit': ['L', 'ml']}, created_at=datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+        )
+        queryset = MasterAuditLog.objects.all()
+        with override_settings(FAST_JSON=True):
+            rows = list_data(MasterAuditLogSerializer, queryset)
+        self.assertEqual(rows, MasterAuditLogSerializer(queryset, many=True).data)
+        self.assertEqual(rows[0]['created_at'], '2025-01-02T03:04:05.678901Z')
@@ -9,3 +9,11 @@ class HealthEndpointTest(TestCase):
         response = self.client.get(reverse('health'))
         self.assertEqual(response.status_code, 200)
         self.assertIn('status', response.json())
+
+    def test_metrics_endpoint(self):
+        self.client.get(reverse('health'))
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('master_svc_requests_total{view="health",method="GET",status="200"}',
+                      response.content.decode())
+        self.assertIn('master_svc_audit_queue_depth', response.content.decode())
@@ -0,0 +1,91 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from common_metrics.testing import QueryBudgetMixin
+from apps.master_svc.models import (
+    ActivityDetailsMaster, ActivityTypeMaster, ShipLocationMaster, ShipStateMaster
+)
+from apps.master_svc.table_cache import MasterTableCache
+from apps.master_svc.tests.test_views import authenticated_client
+
+
+class HierarchyTest(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.table_cache = MasterTableCache(key_prefix='test_hierarchy', enabled=True)
+        for target in ('apps.master_svc.views.table_cache', 'apps.master_svc.hierarchy.table_cache'):
+            patcher = mock.patch(target, self.table_cache)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = authenticated_client()
+
+        self.state = ShipStateMaster.objects.create(ship_state='Operational')
+        ShipStateMaster.objects.create(ship_state='Decommissioned', is_active=False)
+        self.location = ShipLocationMaster.objects.create(ship_location='Harbour', ship_state=self.state)
+        ShipLocationMaster.objects.create(ship_location='Closed', ship_state=self.state, is_active=False)
+        self.activity_type = ActivityTypeMaster.objects.create(
+            ship_activity_type='Maintenance', ship_location=self.location
+        )
+        self.detail = ActivityDetailsMaster.objects.create(activity_type=self.activity_type)
+        ActivityDetailsMaster.objects.create(activity_type=self.activity_type, is_active=False)
+
+    def get_tree(self, **params):
+        return self.client.get(reverse('hierarchy'), params)
+
+    def test_full_active_tree(self):
+        with self.assertQueryBudget(4):
+            response = self.get_tree()
+        self.assertEqual(response.json(), [{
+            'id': self.state.id,
+            'ship_state': 'Operational',
+            'locations': [{
+                'id': self.location.id,
+                'ship_location': 'Harbour',
+                'activity_types': [{
+                    'id': self.activity_type.id,
+                    'ship_activity_type': 'Maintenance',
+                    'activity_details': [{'id': self.detail.id}],
+                }],
+            }],
+        }])
+
+    def test_query_count_independent_of_size(self):
+        for index in range(10):
+            location = ShipLocationMaster.objects.create(ship_location=f'Berth {index}', ship_state=self.state)
+            ActivityTypeMaster.objects.create(ship_activity_type=f'Type {index}', ship_location=location)
+        with self.assertQueryBudget(4):
+            response = self.get_tree()
+        self.assertEqual(len(response.json()[0]['locations']), 11)
+
+    def test_subtree(self):
+        with self.assertQueryBudget(3):
+            response = self.get_tree(root='location', id=self.location.id)
+        self.assertEqual([node['ship_location'] for node in response.json()], ['Harbour'])
+        self.assertEqual(self.get_tree(root='activity_type', id=999).json(), [])
+        self.assertEqual(self.get_tree(root='ship', id=1).status_code, 400)
+
+    def test_cached_until_any_table_written(self):
+        self.get_tree()
+        with self.assertQueryBudget(0):
+            self.get_tree()
+
+        response = self.client.post(reverse('wrapper-api'), {
+            'table_name': 'tbl_activity_details_master',
+            'method_name': 'create',
+            'data': {'activity_type': self.activity_type.id},
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        details = self.get_tree().json()[0]['locations'][0]['activity_types'][0]['activity_details']
+        self.assertEqual(len(details), 2)
+
+    def test_delete_invalidates_cascaded_lists(self):
+        locations = {'table_name': 'tbl_ship_location_master'}
+        self.assertEqual(len(self.client.get(reverse('generic-list'), locations).json()), 2)
+        with mock.patch('apps.master_svc.views.check_permission'):
+            self.client.delete(reverse('generic-delete', args=[self.state.id]),
+                               {'table_name': 'tbl_ship_state_master'}, format='json')
+        self.assertEqual(self.client.get(reverse('generic-list'), locations).json(), [])
+        self.assertEqual(self.get_tree().json(), [])
@@ -0,0 +1,81 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from common_metrics.testing import QueryBudgetMixin
+from apps.master_svc.models import CommandMaster
+from apps.master_svc.table_cache import MasterTableCache
+from apps.master_svc.tests.test_views import authenticated_client
+
+
+class MasterTableCacheTest(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.table_cache = MasterTableCache(key_prefix='test_table', enabled=True)
+        for target in ('apps.master_svc.views.table_cache', 'apps.master_svc.health.table_cache'):
+            patcher = mock.patch(target, self.table_cache)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = authenticated_client()
+        CommandMaster.objects.create(command='Western', hq='Mumbai', code='WNC')
+
+    def list_commands(self):
+        return self.client.get(reverse('generic-list'), {'table_name': 'tbl_command_master'})
+
+    def test_second_read_served_from_cache(self):
+        first = self.list_commands()
+        with self.assertQueryBudget(0):
+            second = self.list_commands()
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.json()[0]['code'], 'WNC')
+        self.assertEqual(self.table_cache.stats()['tbl_command_master']['hits'], 1)
+
+    def test_writes_invalidate(self):
+        self.list_commands()
+        response = self.client.post(reverse('wrapper-api'), {
+            'table_name': 'tbl_command_master',
+            'method_name': 'create',
+            'data': {'command': 'Eastern', 'hq': 'Visakhapatnam', 'code': 'ENC'},
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([row['code'] for row in self.list_commands().json()], ['WNC', 'ENC'])
+
+        pk = CommandMaster.objects.get(code='ENC').pk
+        self.client.put(reverse('generic-update', args=[pk]), {
+            'table_name': 'tbl_command_master', 'data': {'code': 'ENC-1'},
+        }, format='json')
+        self.assertEqual([row['code'] for row in self.list_commands().json()], ['WNC', 'ENC-1'])
+        self.assertEqual(self.table_cache.stats()['tbl_command_master']['invalidations'], 2)
+
+    def test_failed_invalidation_does_not_fail_write(self):
+        self.list_commands()
+        with mock.patch('apps.master_svc.table_cache.cache.incr', side_effect=ConnectionError('down')):
+            response = self.client.post(reverse('wrapper-api'), {
+                'table_name': 'tbl_command_master',
+                'method_name': 'create',
+                'data': {'command': 'Eastern', 'hq': 'Visakhapatnam', 'code': 'ENC'},
+            }, format='json')
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual([row['code'] for row in self.list_commands().json()], ['WNC', 'ENC'])
+        counters = self.table_cache.stats()['tbl_command_master']
+        self.assertEqual((counters['invalidations'], counters['invalidation_errors']), (0, 2))
+
+        self.assertEqual([row['code'] for row in self.list_commands().json()], ['WNC', 'ENC'])
+        self.assertEqual(self.table_cache.stats()['tbl_command_master']['invalidations'], 1)
+        with self.assertQueryBudget(0):
+            self.list_commands()
+
+    def test_filtered_lists_bypass_cache(self):
+        self.client.get(reverse('generic-list'), {'table_name': 'tbl_command_master', 'code': 'WNC'})
+        self.assertEqual(self.table_cache.stats(), {})
+
+    def test_disabled_on_local_memory_cache(self):
+        self.assertFalse(MasterTableCache().enabled)
+
+    def test_hit_ratio_in_metrics(self):
+        self.list_commands()
+        self.list_commands()
+        body = self.client.get(reverse('metrics')).content.decode()
+        self.assertIn('master_svc_table_cache_hit_ratio{table="tbl_command_master"} 0.5', body)
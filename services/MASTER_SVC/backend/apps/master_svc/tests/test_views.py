@@ -0,0 +1,109 @@
+import os
+import re
+
+from django.apps import apps
+from django.conf import settings
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from common_metrics.testing import QueryBudgetMixin
+from apps.master_svc.models import LubricantMaster, ShipStateMaster, ShipLocationMaster
+from apps.master_svc.views import ALLOWED_TABLES, TABLE_QUERY_OPTIONS
+
+
+def authenticated_client(role=None):
+    token = AccessToken()
+    token['userlogin'] = 'tester'
+    if role:
+        token['role'] = role
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+class GenericListQueryBudgetTest(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.client = authenticated_client()
+        state = ShipStateMaster.objects.create(ship_state='Operational')
+        for index in range(5):
+            ShipLocationMaster.objects.create(ship_location=f'Berth {index}', ship_state=state)
+
+    def test_list_with_foreign_keys_uses_one_query(self):
+        with self.assertQueryBudget(1, max_repeats=1):
+            response = self.client.get(reverse('generic-list'), {'table_name': 'tbl_ship_location_master'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 5)
+        self.assertIn('db;dur=', response['Server-Timing'])
+
+
+class GenericListQueryTest(TestCase):
+    def setUp(self):
+        self.client = authenticated_client()
+        for index, name in enumerate(['Grease', 'Hydraulic', 'Engine', 'Gear', 'Turbine']):
+            LubricantMaster.objects.create(
+                lubricant_name=name, lubricant_code=f'L{index}', lubricant_type='Oil',
+                unit='L', is_active=name != 'Gear',
+            )
+
+    def list(self, **params):
+        return self.client.get(reverse('generic-list'), {'table_name': 'tbl_lubricant_master', **params})
+
+    def test_unpaginated_list_unchanged(self):
+        response = self.list()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 5)
+
+    def test_cursor_walks_ordered_pages(self):
+        names = []
+        response = self.list(ordering='-lubricant_name', page_size=2)
+        while True:
+            body = response.json()
+            names.extend(row['lubricant_name'] for row in body['results'])
+            if not body['has_more']:
+                break
+            response = self.list(ordering='-lubricant_name', page_size=2, cursor=body['next_cursor'])
+        self.assertEqual(names, ['Turbine', 'Hydraulic', 'Grease', 'Gear', 'Engine'])
+        self.assertIsNone(body['next_cursor'])
+
+    def test_filters_and_sparse_fields(self):
+        response = self.list(is_active='true', fields='id,lubricant_name', ordering='lubricant_name')
+        self.assertEqual(response.json(), [
+            {'id': row.id, 'lubricant_name': row.lubricant_name}
+            for row in LubricantMaster.objects.filter(is_active=True).order_by('lubricant_name')
+        ])
+
+    def test_rejects_undeclared_columns(self):
+        self.assertEqual(self.list(unit='L').status_code, 400)
+        self.assertEqual(self.list(ordering='unit').status_code, 400)
+        self.assertEqual(self.list(fields='id,missing').status_code, 400)
+        self.assertEqual(self.list(page_size=2, cursor='not-a-cursor').status_code, 400)
+
+    def test_wrapper_list_options(self):
+        response = self.client.post(reverse('wrapper-api'), {
+            'table_name': 'tbl_lubricant_master',
+            'method_name': 'list',
+            'data': {'lubricant_type': 'Oil', 'page_size': 3, 'fields': ['lubricant_code']},
+        }, format='json')
+        body = response.json()
+        self.assertEqual(body['results'], [{'lubricant_code': code} for code in ('L0', 'L1', 'L2')])
+        self.assertTrue(body['has_more'])
+
+    def test_declared_columns_are_indexed(self):
+        self.assertEqual(set(TABLE_QUERY_OPTIONS), set(ALLOWED_TABLES))
+        for table_name, options in TABLE_QUERY_OPTIONS.items():
+            model = ALLOWED_TABLES[table_name][0]
+            leading = {model._meta.get_field(index.fields[0]).name for index in model._meta.indexes}
+            for column in set(options['filters']) | set(options['ordering']):
+                field = model._meta.get_field(column)
+                self.assertTrue(field.name in leading or field.db_index, f'{table_name}.{column}')
+
+    def test_schema_script_covers_models(self):
+        with open(os.path.join(settings.BASE_DIR, 'docs', 'schema.sql'), encoding='utf-8') as schema:
+            script = schema.read()
+        created = set(re.findall(r'CREATE INDEX IF NOT EXISTS (\w+)', script))
+        for model in apps.get_app_config('master_svc').get_models():
+            self.assertLessEqual({index.name for index in model._meta.indexes}, created, model.__name__)
+        for table_name in ('tbl_master_change_log', 'tbl_master_audit_log'):
+            self.assertIn(f'CREATE TABLE IF NOT EXISTS {table_name}', script)
@@ -1,12 +1,16 @@
 from django.urls import path
+from common_auth.async_views import select_view
 
 from . import views, health
 
 urlpatterns = [
     path('health/', health.health_check, name='health'),
+    path('metrics/', health.metrics, name='metrics'),
     path('create/', views.GenericCreateView.as_view(), name='generic-create'),
-    path('view/', views.GenericListView.as_view(), name='generic-list'),
+    path('view/', select_view(views.AsyncGenericListView), name='generic-list'),
     path('update/<int:pk>/', views.GenericUpdateView.as_view(), name='generic-update'),
     path('delete/<int:pk>/', views.GenericDeleteView.as_view(), name='generic-delete'),
     path('wrapper/', views.WrapperAPIView.as_view(), name='wrapper-api'),
+    path('hierarchy/', views.HierarchyView.as_view(), name='hierarchy'),
+    path('audit/', views.AuditLogView.as_view(), name='audit-log'),
 ]
@@ -1,17 +1,40 @@
 
 
+from functools import partial
+
+from asgiref.sync import sync_to_async
 from rest_framework import permissions, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.http import HttpResponse
+from rest_framework.settings import api_settings
+
+from common_api.serializers import list_data
+from common_auth.async_views import AsyncAPIView
+from common_db.routers import primary_reads, reads_from_replica, replica_reads
 from .authentication import CustomJWTAuthentication
+from .pagination import (
+	InvalidListRequest, apply_filters, cursor_for, order_queryset,
+	parse_fields, parse_page_size, parse_since, seek, sparse_serializer
+)
+from .table_cache import table_cache
+from .hierarchy import ROOT_LEVELS, HIERARCHY_TABLES, hierarchy_payload
+from .batch import map_concurrently
+from .audit import audit_trail, field_changes
+from .changes import (
+	UPSERT, changes_since, is_stale, record_changes, revision_bounds, tracked_delete
+)
 
 # import all master models
 from .models import (
 	CommandMaster, DepartmentMaster, EquipmentCategoryMaster,
 	ShipCategoryMaster, RoleMaster, ShipStateMaster,
 	ShipLocationMaster, ActivityTypeMaster, ActivityDetailsMaster,
-	LubricantMaster
+	LubricantMaster, MasterAuditLog
 )
 
 # import all master serializers
@@ -19,14 +42,14 @@ from .serializers import (
 	CommandMasterSerializer, DepartmentMasterSerializer, EquipmentCategoryMasterSerializer,
 	ShipCategoryMasterSerializer, RoleMasterSerializer, ShipStateMasterSerializer,
 	ShipLocationMasterSerializer, ActivityTypeMasterSerializer, ActivityDetailsMasterSerializer,
-	LubricantMasterSerializer
+	LubricantMasterSerializer, MasterAuditLogSerializer
 )
 
 
 
 # --- Generic CRUD Views ---
 
-import logging
+import hashlib
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.views import APIView
 
@@ -47,13 +70,64 @@ ALLOWED_TABLES = {
 	'tbl_lubricant_master': (LubricantMaster, LubricantMasterSerializer),
 }
 
-# Audit logger
-audit_logger = logging.getLogger('audit')
+# Columns each table may be filtered and ordered by in crud_list. Every column
+# listed here is indexed (Meta.indexes or a ForeignKey index), so a client
+# filter can never force a sequential scan.
+TABLE_QUERY_OPTIONS = {
+	'tbl_command_master': {'filters': ('command', 'code'), 'ordering': ('command', 'code')},
+	'tbl_department_master': {'filters': ('name', 'type'), 'ordering': ('name', 'type')},
+	'tbl_equipment_category_master': {'filters': ('name',), 'ordering': ('name',)},
+	'tbl_ship_category_master': {'filters': ('name',), 'ordering': ('name',)},
+	'tbl_role_master': {'filters': ('status', 'level', 'name'), 'ordering': ('status', 'level', 'name')},
+	'tbl_ship_state_master': {'filters': ('ship_state', 'is_active'), 'ordering': ('ship_state',)},
+	'tbl_ship_location_master': {
+		'filters': ('ship_location', 'ship_state', 'is_active'), 'ordering': ('ship_location',)
+	},
+	'tbl_activity_type_master': {
+		'filters': ('ship_activity_type', 'ship_location', 'is_active'), 'ordering': ('ship_activity_type',)
+	},
+	'tbl_activity_details_master': {'filters': ('activity_type', 'is_active'), 'ordering': ()},
+	'tbl_lubricant_master': {
+		'filters': ('lubricant_name', 'lubricant_code', 'lubricant_type', 'is_active'),
+		'ordering': ('lubricant_name', 'lubricant_code', 'lubricant_type'),
+	},
+}
+
+# Query options of crud_list; every other parameter is a column filter
+LIST_OPTIONS = ('cursor', 'page_size', 'ordering', 'fields', 'since')
+
+BULK_METHODS = ('bulk_create', 'bulk_update', 'bulk_delete')
+
+def cascade_tables(model):
+	"""Return the allowed tables whose rows are deleted along with rows of ``model``."""
+	tables = []
+	for relation in model._meta.related_objects:
+		related = relation.related_model
+		if relation.on_delete is models.CASCADE and related._meta.db_table in ALLOWED_TABLES:
+			tables.append(related._meta.db_table)
+			tables.extend(cascade_tables(related))
+	return tables
+
+# Cached lists invalidated by a delete (the table plus its CASCADE dependents)
+DELETE_INVALIDATES = {
+	table_name: (table_name, *cascade_tables(model)) for table_name, (model, _) in ALLOWED_TABLES.items()
+}
+
+# Filters of the audit log query API; table_name or username is required
+AUDIT_FILTERS = ('table_name', 'row_id', 'username', 'action')
+
+def can_read_audit_log(user):
+	"""Superusers and users whose token role is in ``MASTER_AUDIT_ROLES`` may read the audit log."""
+	if getattr(user, 'is_superuser', False):
+		return True
+	return getattr(user, 'role', None) in getattr(settings, 'MASTER_AUDIT_ROLES', ())
 
 # Example permission check (replace with real logic)
 def check_permission(user, table_name, method_name):
 	if method_name == 'delete' and not getattr(user, 'is_superuser', False):
 		raise PermissionDenied('You do not have permission to delete.')
+	if method_name == 'audit' and not can_read_audit_log(user):
+		raise PermissionDenied('You do not have permission to view the audit log.')
 	return True
 
 # --- CRUD Logic Utilities ---
@@ -62,17 +136,166 @@ def crud_create(user, table_name, data):
 	model, serializer_class = ALLOWED_TABLES[table_name]
 	serializer = serializer_class(data=data)
 	if serializer.is_valid():
-		instance = serializer.save()
-		audit_logger.info(f"CREATE {table_name} by {getattr(user, 'username', 'unknown')}: {serializer.data}")
+		changes = field_changes(model, None, serializer.validated_data)
+		with transaction.atomic():
+			instance = serializer.save()
+			record_changes(table_name, UPSERT, [instance.pk])
+			audit_trail.record('create', table_name, user, [(instance.pk, changes)])
+		table_cache.invalidate(table_name)
 		return Response(serializer.data, status=status.HTTP_201_CREATED)
 	return Response({'error': 'Invalid data.'}, status=status.HTTP_400_BAD_REQUEST)
 
-def crud_list(user, table_name):
+def crud_list(user, table_name, params=None):
+	"""
+	List a table, optionally filtered (exact match on TABLE_QUERY_OPTIONS
+	columns), ordered (``ordering=name`` or ``-name``) and limited to
+	``fields``. Without ``cursor``/``page_size`` all rows are returned as a
+	plain list; with either, one keyset page is returned together with
+	``next_cursor`` and ``has_more``. The plain, unfiltered list is served
+	from ``table_cache``. ``since`` returns only the rows changed after a
+	revision (see ``crud_changes``).
+	"""
 	check_permission(user, table_name, 'view')
 	model, serializer_class = ALLOWED_TABLES[table_name]
-	queryset = model.objects.all()
-	serializer = serializer_class(queryset, many=True)
-	return Response(serializer.data)
+	query_options = TABLE_QUERY_OPTIONS[table_name]
+	params = dict(params or {})
+	options = {name: params.pop(name, None) for name in LIST_OPTIONS}
+	list_settings = getattr(settings, 'MASTER_LIST_SETTINGS', {})
+	if options['since'] is not None:
+		return crud_changes(table_name, options, params)
+	if not params and not any(options.values()):
+		return HttpResponse(table_payload(table_name), content_type='application/json')
+	try:
+		queryset = apply_filters(model.objects.all(), params, query_options['filters'])
+		queryset, order_field, descending = order_queryset(
+			queryset, options['ordering'], query_options['ordering']
+		)
+		fields = parse_fields(options['fields'])
+		if fields:
+			serializer_class = sparse_serializer(serializer_class, fields)
+			queryset = queryset.only(*set(fields) | {order_field})
+
+		if options['cursor'] is None and options['page_size'] is None:
+			return Response(list_data(serializer_class, queryset))
+
+		page_size = parse_page_size(
+			options['page_size'],
+			list_settings.get('default_page_size', 50),
+			list_settings.get('max_page_size', 500),
+		)
+		if options['cursor']:
+			queryset = seek(queryset, order_field, descending, options['cursor'])
+		rows = list(queryset[:page_size + 1])
+	except InvalidListRequest as e:
+		return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+	has_more = len(rows) > page_size
+	rows = rows[:page_size]
+	return Response({
+		'results': serializer_class(rows, many=True).data,
+		'next_cursor': cursor_for(rows[-1], order_field) if has_more else None,
+		'has_more': has_more,
+	})
+
+def crud_changes(table_name, options, params):
+	"""
+	Return the rows of a table inserted, updated or deleted after revision
+	``since`` as ``{"revision", "reset", "upserts", "deletes", "has_more"}``.
+	Upserts are the current rows (limited to ``fields``), deletes their
+	primary keys; at most ``page_size`` changes are read per call. When the
+	change log cannot serve ``since`` (0, pruned or unknown) the whole table
+	is returned as upserts with ``reset`` set, and the client replaces its
+	copy. The client stores ``revision`` and passes it as the next ``since``.
+	"""
+	model, serializer_class = ALLOWED_TABLES[table_name]
+	change_settings = getattr(settings, 'MASTER_CHANGE_LOG_SETTINGS', {})
+	if params or options['cursor'] or options['ordering']:
+		return Response(
+			{'error': 'since cannot be combined with filters, ordering or cursor.'},
+			status=status.HTTP_400_BAD_REQUEST
+		)
+	queryset = model.objects.order_by(model._meta.pk.name)
+	try:
+		since = parse_since(options['since'])
+		max_changes = change_settings.get('max_changes', 1000)
+		limit = parse_page_size(options['page_size'], max_changes, max_changes)
+		fields = parse_fields(options['fields'])
+		if fields:
+			serializer_class = sparse_serializer(serializer_class, fields)
+			queryset = queryset.only(*fields)
+	except InvalidListRequest as e:
+		return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+	oldest, latest = revision_bounds()
+	if is_stale(since, oldest, latest) and reads_from_replica():
+		# The replica may not have replayed the client's revision yet
+		with primary_reads():
+			return crud_changes(table_name, options, params)
+	if is_stale(since, oldest, latest):
+		# Read the revision before the rows: changes racing the snapshot are sent again
+		return Response({
+			'revision': latest or 0,
+			'reset': True,
+			'upserts': list_data(serializer_class, queryset),
+			'deletes': [],
+			'has_more': False,
+		})
+
+	revision, upserted, deleted, has_more = changes_since(table_name, since, limit, latest)
+	rows = list(queryset.filter(pk__in=upserted)) if upserted else []
+	# Rows upserted and then deleted past the last change read are gone too
+	found = {row.pk for row in rows}
+	deleted.extend(row_id for row_id in upserted if row_id not in found)
+	return Response({
+		'revision': revision,
+		'reset': False,
+		'upserts': serializer_class(rows, many=True).data,
+		'deletes': deleted,
+		'has_more': has_more,
+	})
+
+def table_payload(table_name):
+	"""Return the full table as JSON bytes, from ``table_cache`` when fresh."""
+	return table_cache.get(table_name, partial(render_table, table_name))
+
+def render_table(table_name):
+	"""Serialize the full table, in primary key order, to JSON bytes."""
+	model, serializer_class = ALLOWED_TABLES[table_name]
+	return api_settings.DEFAULT_RENDERER_CLASSES[0]().render(
+		list_data(serializer_class, model.objects.order_by(model._meta.pk.name))
+	)
+
+def crud_batch_list(user, data):
+	"""
+	Return the full contents of several tables in one response.
+
+	``data`` holds ``table_names`` and optionally ``versions`` (table -> the
+	version the client already has). Each table is returned as
+	``{"version": ..., "data": [...]}``, or ``{"version": ..., "unchanged":
+	true}`` when the client's version is current. Versions are hashes of the
+	payload, so they are valid across workers whether or not the cache is
+	shared. Tables not in the cache are queried concurrently.
+	"""
+	table_names = data.get('table_names')
+	versions = data.get('versions') or {}
+	if (not isinstance(table_names, list) or not table_names or not isinstance(versions, dict)
+			or any(table_name not in ALLOWED_TABLES for table_name in table_names)):
+		return Response({'error': 'Invalid request.'}, status=status.HTTP_400_BAD_REQUEST)
+	table_names = list(dict.fromkeys(table_names))
+	for table_name in table_names:
+		check_permission(user, table_name, 'view')
+
+	payloads = map_concurrently(table_payload, table_names)
+	# Payloads are already JSON; splice them in instead of decoding and re-encoding
+	parts = []
+	for table_name, body in zip(table_names, payloads):
+		version = hashlib.md5(body, usedforsecurity=False).hexdigest()
+		if versions.get(table_name) == version:
+			entry = b'{"version":"%s","unchanged":true}' % version.encode()
+		else:
+			entry = b'{"version":"%s","data":%s}' % (version.encode(), body)
+		parts.append(b'"%s":%s' % (table_name.encode(), entry))
+	return HttpResponse(b'{"tables":{' + b','.join(parts) + b'}}', content_type='application/json')
 
 def crud_update(user, table_name, pk, data):
 	check_permission(user, table_name, 'update')
@@ -83,8 +306,12 @@ def crud_update(user, table_name, pk, data):
 		return Response({'error': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
 	serializer = serializer_class(instance, data=data, partial=True)
 	if serializer.is_valid():
-		serializer.save()
-		audit_logger.info(f"UPDATE {table_name} id={pk} by {getattr(user, 'username', 'unknown')}: {serializer.data}")
+		changes = field_changes(model, instance, serializer.validated_data)
+		with transaction.atomic():
+			serializer.save()
+			record_changes(table_name, UPSERT, [instance.pk])
+			audit_trail.record('update', table_name, user, [(instance.pk, changes)])
+		table_cache.invalidate(table_name)
 		return Response(serializer.data)
 	return Response({'error': 'Invalid data.'}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -93,12 +320,151 @@ def crud_delete(user, table_name, pk):
 	model, _ = ALLOWED_TABLES[table_name]
 	try:
 		instance = model.objects.get(pk=pk)
-		instance.delete()
-		audit_logger.info(f"DELETE {table_name} id={pk} by {getattr(user, 'username', 'unknown')}")
+		with transaction.atomic():
+			deleted = tracked_delete(model.objects.filter(pk=instance.pk), ALLOWED_TABLES)
+			audit_deletes(user, deleted)
+		for name in DELETE_INVALIDATES[table_name]:
+			table_cache.invalidate(name)
 		return Response({'success': True})
 	except model.DoesNotExist:
 		return Response({'error': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
 
+def audit_deletes(user, deleted):
+	"""Audit the rows removed by ``tracked_delete``, cascaded ones included."""
+	for name, row_ids in deleted.items():
+		if name in ALLOWED_TABLES:
+			audit_trail.record('delete', name, user, [(row_id, {}) for row_id in sorted(row_ids)])
+
+# --- Bulk CRUD Utilities ---
+def bulk_items_error(items):
+	"""Return an error response if ``items`` is not a list within the batch limit."""
+	max_items = getattr(settings, 'MASTER_BULK_SETTINGS', {}).get('max_items', 5000)
+	if not isinstance(items, list) or not items:
+		return Response({'error': 'data must be a non-empty list.'}, status=status.HTTP_400_BAD_REQUEST)
+	if len(items) > max_items:
+		return Response(
+			{'error': f'At most {max_items} items per request.'}, status=status.HTTP_400_BAD_REQUEST
+		)
+	return None
+
+def item_pk(model, item):
+	"""Return the primary key given by a bulk item (a pk or a dict), or None."""
+	if isinstance(item, dict):
+		item = item.get(model._meta.pk.name, item.get('id'))
+	try:
+		return model._meta.pk.to_python(item)
+	except (ValidationError, TypeError):
+		return None
+
+def item_errors(errors):
+	"""Keep only the failing items of per-item errors, with their index."""
+	# ListSerializer.errors is a list per item, or {index: errors} on newer DRF
+	indexed = errors.items() if isinstance(errors, dict) else enumerate(errors)
+	return [{'index': index, 'errors': error} for index, error in indexed if error]
+
+def crud_bulk_create(user, table_name, items):
+	"""Validate all items and insert them with one bulk_create, or none at all."""
+	check_permission(user, table_name, 'create')
+	error = bulk_items_error(items)
+	if error:
+		return error
+	model, serializer_class = ALLOWED_TABLES[table_name]
+	serializer = serializer_class(data=items, many=True)
+	if not serializer.is_valid():
+		return Response(
+			{'error': 'Invalid data.', 'items': item_errors(serializer.errors)},
+			status=status.HTTP_400_BAD_REQUEST
+		)
+	batch_size = getattr(settings, 'MASTER_BULK_SETTINGS', {}).get('batch_size', 500)
+	with transaction.atomic():
+		instances = model.objects.bulk_create(
+			[model(**attrs) for attrs in serializer.validated_data], batch_size=batch_size
+		)
+		record_changes(table_name, UPSERT, [instance.pk for instance in instances])
+		audit_trail.record('create', table_name, user, [
+			(instance.pk, field_changes(model, None, attrs))
+			for instance, attrs in zip(instances, serializer.validated_data)
+		])
+	table_cache.invalidate(table_name)
+	return Response({
+		'success': True,
+		'count': len(instances),
+		'data': serializer_class(instances, many=True).data,
+	}, status=status.HTTP_201_CREATED)
+
+def crud_bulk_update(user, table_name, items):
+	"""Validate partial updates of existing rows and apply them with one bulk_update."""
+	check_permission(user, table_name, 'update')
+	error = bulk_items_error(items)
+	if error:
+		return error
+	model, serializer_class = ALLOWED_TABLES[table_name]
+	pk_name = model._meta.pk.name
+	ids = [item_pk(model, item) if isinstance(item, dict) else None for item in items]
+	instances = model.objects.in_bulk([pk for pk in ids if pk is not None])
+
+	errors, updated, fields, audit_rows = [], [], set(), []
+	for item, pk in zip(items, ids):
+		instance = instances.get(pk)
+		if instance is None:
+			errors.append({pk_name: ['Not found.']})
+			continue
+		serializer = serializer_class(instance, data=item, partial=True)
+		if not serializer.is_valid():
+			errors.append(serializer.errors)
+			continue
+		audit_rows.append((pk, field_changes(model, instance, serializer.validated_data)))
+		for field, value in serializer.validated_data.items():
+			setattr(instance, field, value)
+			fields.add(field)
+		errors.append({})
+		updated.append(instance)
+	if any(errors):
+		return Response(
+			{'error': 'Invalid data.', 'items': item_errors(errors)},
+			status=status.HTTP_400_BAD_REQUEST
+		)
+
+	fields.discard(pk_name)
+	if fields:
+		batch_size = getattr(settings, 'MASTER_BULK_SETTINGS', {}).get('batch_size', 500)
+		with transaction.atomic():
+			model.objects.bulk_update(updated, sorted(fields), batch_size=batch_size)
+			record_changes(table_name, UPSERT, [instance.pk for instance in updated])
+			audit_trail.record('update', table_name, user, audit_rows)
+		table_cache.invalidate(table_name)
+	return Response({
+		'success': True,
+		'count': len(updated),
+		'data': serializer_class(updated, many=True).data,
+	})
+
+def crud_bulk_delete(user, table_name, ids):
+	"""Delete rows by primary key in one statement if all of them exist."""
+	check_permission(user, table_name, 'delete')
+	error = bulk_items_error(ids)
+	if error:
+		return error
+	model, _ = ALLOWED_TABLES[table_name]
+	pk_name = model._meta.pk.name
+	ids = [item_pk(model, item) for item in ids]
+	existing = set(
+		model.objects.filter(pk__in=[pk for pk in ids if pk is not None]).values_list(pk_name, flat=True)
+	)
+	errors = [{} if pk in existing else {pk_name: ['Not found.']} for pk in ids]
+	if any(errors):
+		return Response(
+			{'error': 'Not found', 'items': item_errors(errors)}, status=status.HTTP_404_NOT_FOUND
+		)
+
+	with transaction.atomic():
+		# Single DELETE ... WHERE pk IN (...) unless related rows must cascade
+		deleted = tracked_delete(model.objects.filter(pk__in=existing), ALLOWED_TABLES)
+		audit_deletes(user, deleted)
+	for name in DELETE_INVALIDATES[table_name]:
+		table_cache.invalidate(name)
+	return Response({'success': True, 'count': len(existing)})
+
 # --- Generic CRUD Views ---
 class GenericCreateView(APIView):
 	authentication_classes = [CustomJWTAuthentication]
@@ -113,11 +479,35 @@ class GenericCreateView(APIView):
 class GenericListView(APIView):
 	authentication_classes = [CustomJWTAuthentication]
 	permission_classes = [permissions.IsAuthenticated]
+	@replica_reads
 	def get(self, request):
 		table_name = request.query_params.get('table_name')
 		if table_name not in ALLOWED_TABLES:
 			return Response({'error': 'Invalid request.'}, status=status.HTTP_400_BAD_REQUEST)
-		return crud_list(request.user, table_name)
+		params = request.query_params.dict()
+		params.pop('table_name')
+		return crud_list(request.user, table_name, params)
+
+class AsyncGenericListView(AsyncAPIView):
+	"""
+	GET of GenericListView served on the event loop. The unfiltered list is
+	read from ``table_cache`` without blocking; filtered, paged and delta
+	requests, and cache misses, run ``crud_list`` in a thread.
+	"""
+	sync_view = GenericListView
+
+	@replica_reads
+	async def get(self, request):
+		table_name = request.GET.get('table_name')
+		if table_name not in ALLOWED_TABLES:
+			return self.render({'error': 'Invalid request.'}, status=status.HTTP_400_BAD_REQUEST)
+		params = request.GET.dict()
+		params.pop('table_name')
+		if params:
+			return await sync_to_async(crud_list)(request.user, table_name, params)
+		check_permission(request.user, table_name, 'view')
+		body = await table_cache.aget(table_name, partial(render_table, table_name))
+		return HttpResponse(body, content_type='application/json')
 
 class GenericUpdateView(APIView):
 	authentication_classes = [CustomJWTAuthentication]
@@ -146,17 +536,27 @@ class WrapperAPIView(APIView):
 		table_name = request.data.get('table_name')
 		method_name = request.data.get('method_name')
 		data = request.data.get('data', {})
-		pk = data.get('id')
+		pk = data.get('id') if isinstance(data, dict) else None
 
+		if method_name == 'batch_list' and isinstance(data, dict):
+			return self.list_tables(request, data)
 		if table_name not in ALLOWED_TABLES:
 			return Response({'error': 'Invalid request.'}, status=status.HTTP_400_BAD_REQUEST)
-		if method_name not in ['create', 'list', 'view', 'update', 'delete']:
+		if method_name not in ['create', 'list', 'view', 'update', 'delete', *BULK_METHODS]:
+			return Response({'error': 'Invalid request.'}, status=status.HTTP_400_BAD_REQUEST)
+		if method_name not in BULK_METHODS and not isinstance(data, dict):
 			return Response({'error': 'Invalid request.'}, status=status.HTTP_400_BAD_REQUEST)
 
-		if method_name == 'create':
+		if method_name == 'bulk_create':
+			return crud_bulk_create(request.user, table_name, data)
+		elif method_name == 'bulk_update':
+			return crud_bulk_update(request.user, table_name, data)
+		elif method_name == 'bulk_delete':
+			return crud_bulk_delete(request.user, table_name, data)
+		elif method_name == 'create':
 			return crud_create(request.user, table_name, data)
 		elif method_name == 'list' or method_name == 'view':
-			return crud_list(request.user, table_name)
+			return self.list_table(request, table_name, data)
 		elif method_name == 'update':
 			if not pk:
 				return Response({'error': 'Invalid request.'}, status=status.HTTP_400_BAD_REQUEST)
@@ -168,6 +568,71 @@ class WrapperAPIView(APIView):
 		else:
 			return Response({'error': 'Invalid request.'}, status=status.HTTP_400_BAD_REQUEST)
 
+	@replica_reads
+	def list_table(self, request, table_name, data):
+		return crud_list(request.user, table_name, data)
+
+	@replica_reads
+	def list_tables(self, request, data):
+		return crud_batch_list(request.user, data)
+
+class HierarchyView(APIView):
+	"""
+	Active ship state -> location -> activity type -> activity details tree,
+	optionally rooted at one node (``root=state|location|activity_type&id=``).
+	"""
+	authentication_classes = [CustomJWTAuthentication]
+	permission_classes = [permissions.IsAuthenticated]
+
+	@replica_reads
+	def get(self, request):
+		root = request.query_params.get('root', 'state')
+		pk = request.query_params.get('id')
+		if root not in ROOT_LEVELS or (pk is not None and not pk.isdigit()):
+			return Response({'error': 'Invalid request.'}, status=status.HTTP_400_BAD_REQUEST)
+		for table_name in HIERARCHY_TABLES:
+			check_permission(request.user, table_name, 'view')
+		body = hierarchy_payload(root, int(pk) if pk is not None else None)
+		return HttpResponse(body, content_type='application/json')
 
+class AuditLogView(APIView):
+	"""
+	Audit events of master table writes, newest first, filtered by
+	``table_name`` (and ``row_id``) or ``username`` and optionally ``action``.
+	"""
+	authentication_classes = [CustomJWTAuthentication]
+	permission_classes = [permissions.IsAuthenticated]
 
+	@replica_reads
+	def get(self, request):
+		params = request.query_params.dict()
+		options = {name: params.pop(name, None) for name in ('cursor', 'page_size')}
+		if 'table_name' not in params and 'username' not in params:
+			return Response(
+				{'error': 'table_name or username is required.'}, status=status.HTTP_400_BAD_REQUEST
+			)
+		if 'row_id' in params and 'table_name' not in params:
+			return Response({'error': 'row_id requires table_name.'}, status=status.HTTP_400_BAD_REQUEST)
+		check_permission(request.user, params.get('table_name'), 'audit')
+		list_settings = getattr(settings, 'MASTER_LIST_SETTINGS', {})
+		try:
+			queryset = apply_filters(MasterAuditLog.objects.all(), params, AUDIT_FILTERS)
+			queryset, order_field, descending = order_queryset(queryset, '-id', ())
+			page_size = parse_page_size(
+				options['page_size'],
+				list_settings.get('default_page_size', 50),
+				list_settings.get('max_page_size', 500),
+			)
+			if options['cursor']:
+				queryset = seek(queryset, order_field, descending, options['cursor'])
+			rows = list(queryset[:page_size + 1])
+		except InvalidListRequest as e:
+			return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+		has_more = len(rows) > page_size
+		rows = rows[:page_size]
+		return Response({
+			'results': MasterAuditLogSerializer(rows, many=True).data,
+			'next_cursor': cursor_for(rows[-1], order_field) if has_more else None,
+			'has_more': has_more,
+		})
@@ -0,0 +1,10 @@
+"""
+ASGI config for MASTER_SVC backend service.
+"""
+
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+application = get_asgi_application()
@@ -9,7 +9,7 @@ Production-ready settings with JWT authentication support.
 
 import os, sys
 from datetime import timedelta
-from decouple import config
+from decouple import Csv, config
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -40,6 +40,9 @@ LOCAL_APPS = [
 ]
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 MIDDLEWARE = [
+    'common_metrics.middleware.RequestMetricsMiddleware',
+    'common_metrics.middleware.QueryMetricsMiddleware',
+    'common_db.middleware.ReplicaStickinessMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     # Add MASTER_SVC-specific middleware here if needed
@@ -67,6 +70,12 @@ TEMPLATES = [
     },
 ]
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
+
+# Route the hot read endpoints to their async views (common_auth.async_views).
+# Enable only when served by config.asgi (uvicorn workers).
+ASYNC_VIEWS = config('ASYNC_VIEWS', default=False, cast=bool)
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -82,6 +91,37 @@ DATABASES = {
         'CONN_HEALTH_CHECKS': True,
     }
 }
+
+# Server-side connection pool (psycopg 3 with psycopg_pool). Each worker
+# process shares at most DATABASE_POOL_MAX_SIZE connections between its
+# threads; Django requires CONN_MAX_AGE = 0 with a pool.
+if config('DATABASE_POOL', default=False, cast=bool):
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': config('DATABASE_POOL_MIN_SIZE', default=2, cast=int),
+        'max_size': config('DATABASE_POOL_MAX_SIZE', default=10, cast=int),
+        'timeout': config('DATABASE_POOL_TIMEOUT', default=10, cast=float),
+        'max_idle': config('DATABASE_POOL_MAX_IDLE', default=300, cast=float),
+        'max_lifetime': config('DATABASE_POOL_MAX_LIFETIME', default=3600, cast=float),
+    }
+
+# Read replicas (common_db.routers): comma separated hosts of streaming
+# replicas of the default database. Views annotated with replica_reads read
+# from them; everything else, and every write, uses the primary.
+DATABASE_REPLICA_HOSTS = config('DATABASE_REPLICA_HOSTS', default='', cast=Csv())
+for index, host in enumerate(DATABASE_REPLICA_HOSTS, 1):
+    DATABASES[f'replica{index}'] = dict(
+        DATABASES['default'], HOST=host, OPTIONS=dict(DATABASES['default']['OPTIONS']),
+        TEST={'MIRROR': 'default'},
+    )
+DATABASE_ROUTERS = ['common_db.routers.ReplicaRouter']
+REPLICA_SETTINGS = {
+    'aliases': [f'replica{index}' for index in range(1, len(DATABASE_REPLICA_HOSTS) + 1)],
+    # Reads of a user who wrote stay on the primary this long
+    'sticky_seconds': config('REPLICA_STICKY_SECONDS', default=5, cast=float),
+    'check_interval': config('REPLICA_CHECK_INTERVAL', default=5, cast=float),
+    'max_lag': config('REPLICA_MAX_LAG', default=10, cast=float),
+}
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -122,6 +162,13 @@ REST_FRAMEWORK = {
         'user': '1000/hour'
     }
 }
+
+# orjson renderer/parser, and list endpoints built from .values() rows (common_api)
+FAST_JSON = config('FAST_JSON', default=False, cast=bool)
+if FAST_JSON:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = ['common_api.renderers.ORJSONRenderer']
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'][0] = 'common_api.parsers.ORJSONParser'
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=config('ACCESS_TOKEN_LIFETIME_MINUTES', default=60, cast=int)),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=config('REFRESH_TOKEN_LIFETIME_DAYS', default=7, cast=int)),
@@ -146,6 +193,9 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
 }
 
+# Roles (the auth service's "role" token claim) allowed to read /audit/
+MASTER_AUDIT_ROLES = config('MASTER_AUDIT_ROLES', default='admin', cast=Csv())
+
 try:
     import redis
     redis_client = redis.Redis.from_url(config('REDIS_URL', default='redis://localhost:6379/1'))
@@ -248,6 +298,56 @@ CIRCUIT_BREAKER_SETTINGS = {
     'recovery_timeout': 30,
     'expected_exception': Exception
 }
+# Generic list pagination (apps.master_svc.views.crud_list)
+MASTER_LIST_SETTINGS = {
+    'default_page_size': config('MASTER_LIST_PAGE_SIZE', default=50, cast=int),
+    'max_page_size': config('MASTER_LIST_MAX_PAGE_SIZE', default=500, cast=int),
+}
+# Wrapper API bulk_create/bulk_update/bulk_delete limits
+MASTER_BULK_SETTINGS = {
+    'max_items': config('MASTER_BULK_MAX_ITEMS', default=5000, cast=int),
+    'batch_size': config('MASTER_BULK_BATCH_SIZE', default=500, cast=int),
+}
+# Wrapper API batch_list: threads rendering uncached tables concurrently
+MASTER_BATCH_SETTINGS = {
+    'max_workers': config('MASTER_BATCH_MAX_WORKERS', default=4, cast=int),
+}
+# Change log behind list/wrapper since= delta syncs (apps.master_svc.changes)
+# Changes older than retention_days are removed by manage.py prune_master_changes
+MASTER_CHANGE_LOG_SETTINGS = {
+    'max_changes': config('MASTER_CHANGE_LOG_MAX_CHANGES', default=1000, cast=int),
+    'retention_days': config('MASTER_CHANGE_LOG_RETENTION_DAYS', default=30, cast=int),
+}
+# Audit trail of master table writes (apps.master_svc.audit)
+# overflow is block, inline or drop; the jsonl sink appends to MASTER_AUDIT_PATH
+MASTER_AUDIT_SETTINGS = {
+    'mode': config('MASTER_AUDIT_MODE', default='async'),
+    'sink': config('MASTER_AUDIT_SINK', default='database'),
+    'path': config('MASTER_AUDIT_PATH', default=os.path.join(BASE_DIR, 'logs', 'audit.jsonl')),
+    'batch_size': config('MASTER_AUDIT_BATCH_SIZE', default=500, cast=int),
+    'max_pending': config('MASTER_AUDIT_MAX_PENDING', default=10000, cast=int),
+    'overflow': config('MASTER_AUDIT_OVERFLOW', default='block'),
+    'block_timeout': config('MASTER_AUDIT_BLOCK_TIMEOUT', default=0.05, cast=float),
+}
+# Read-through cache of unfiltered master table lists (apps.master_svc.table_cache)
+# Disabled on the local memory cache, which other workers cannot invalidate
+# ttl bounds how long other workers serve a table whose invalidation failed
+MASTER_TABLE_CACHE_SETTINGS = {
+    'ttl': config('MASTER_TABLE_CACHE_TTL', default=300, cast=int),
+}
+# Per-endpoint latency histograms and counters (common_metrics.request_metrics)
+# Set METRICS_MULTIPROC_DIR to merge all gunicorn workers; empty it on startup
+REQUEST_METRICS_SETTINGS = {
+    'prefix': 'master_svc',
+    'multiprocess_dir': config('METRICS_MULTIPROC_DIR', default=''),
+    'flush_interval': config('METRICS_FLUSH_INTERVAL', default=5, cast=int),
+}
+# Per-request query counting (common_metrics.middleware.QueryMetricsMiddleware)
+# A query shape repeated repeat_threshold times in one request is logged as N+1
+QUERY_METRICS_SETTINGS = {
+    'repeat_threshold': config('QUERY_REPEAT_THRESHOLD', default=5, cast=int),
+    'server_timing': config('QUERY_SERVER_TIMING', default=True, cast=bool),
+}
 REQUEST_TIMEOUT = config('REQUEST_TIMEOUT', default=30, cast=int)
 CORS_ALLOWED_ORIGINS = config(
     'CORS_ALLOWED_ORIGINS',
@@ -0,0 +1,59 @@
+-- Schema changes of MASTER_SVC for existing PostgreSQL databases.
+--
+-- The master_svc app ships no Django migrations; its tables are managed
+-- outside Django. Apply this script before deploying code that uses the
+-- objects below, e.g.:
+--
+--     psql "$DATABASE_URL" -f docs/schema.sql
+--
+-- Every statement is idempotent. Index names match Meta.indexes in
+-- apps/master_svc/models.py.
+
+-- Keyset pagination, filters and ordering of the generic lists: one
+-- (column, pk) index per filterable/orderable column
+CREATE INDEX IF NOT EXISTS command_master_command_idx ON tbl_command_master (command, id);
+CREATE INDEX IF NOT EXISTS command_master_code_idx ON tbl_command_master (code, id);
+CREATE INDEX IF NOT EXISTS department_master_name_idx ON tbl_department_master (name, id);
+CREATE INDEX IF NOT EXISTS department_master_type_idx ON tbl_department_master (type, id);
+CREATE INDEX IF NOT EXISTS equipment_category_name_idx ON tbl_equipment_category_master (name, id);
+CREATE INDEX IF NOT EXISTS ship_category_name_idx ON tbl_ship_category_master (name, id);
+CREATE INDEX IF NOT EXISTS role_master_status_idx ON tbl_role_master (status, role_id);
+CREATE INDEX IF NOT EXISTS role_master_level_idx ON tbl_role_master (level, role_id);
+CREATE INDEX IF NOT EXISTS role_master_name_idx ON tbl_role_master (name, role_id);
+CREATE INDEX IF NOT EXISTS ship_state_name_idx ON tbl_ship_state_master (ship_state, id);
+CREATE INDEX IF NOT EXISTS ship_state_active_idx ON tbl_ship_state_master (is_active, id);
+CREATE INDEX IF NOT EXISTS ship_location_name_idx ON tbl_ship_location_master (ship_location, id);
+CREATE INDEX IF NOT EXISTS ship_location_active_idx ON tbl_ship_location_master (is_active, id);
+CREATE INDEX IF NOT EXISTS activity_type_name_idx ON tbl_activity_type_master (ship_activity_type, id);
+CREATE INDEX IF NOT EXISTS activity_type_active_idx ON tbl_activity_type_master (is_active, id);
+CREATE INDEX IF NOT EXISTS activity_details_active_idx ON tbl_activity_details_master (is_active, id);
+CREATE INDEX IF NOT EXISTS lubricant_name_idx ON tbl_lubricant_master (lubricant_name, id);
+CREATE INDEX IF NOT EXISTS lubricant_code_idx ON tbl_lubricant_master (lubricant_code, id);
+CREATE INDEX IF NOT EXISTS lubricant_type_idx ON tbl_lubricant_master (lubricant_type, id);
+CREATE INDEX IF NOT EXISTS lubricant_active_idx ON tbl_lubricant_master (is_active, id);
+
+-- Change log of the delta syncs (?since=); written in the transaction of
+-- every create, update and delete, so it must exist before the code runs
+CREATE TABLE IF NOT EXISTS tbl_master_change_log (
+    id bigint NOT NULL PRIMARY KEY GENERATED BY DEFAULT AS IDENTITY,
+    table_name varchar(64) NOT NULL,
+    row_id bigint NOT NULL,
+    op varchar(6) NOT NULL,
+    changed_at timestamp with time zone NOT NULL
+);
+CREATE INDEX IF NOT EXISTS change_log_table_idx ON tbl_master_change_log (table_name, id);
+CREATE INDEX IF NOT EXISTS change_log_changed_at_idx ON tbl_master_change_log (changed_at);
+
+-- Audit trail of master writes, written by the default
+-- MASTER_AUDIT_SINK=database and queried by /audit/
+CREATE TABLE IF NOT EXISTS tbl_master_audit_log (
+    id bigint NOT NULL PRIMARY KEY GENERATED BY DEFAULT AS IDENTITY,
+    action varchar(16) NOT NULL,
+    table_name varchar(64) NOT NULL,
+    row_id bigint NOT NULL,
+    username varchar(150) NOT NULL,
+    changes jsonb NOT NULL,
+    created_at timestamp with time zone NOT NULL
+);
+CREATE INDEX IF NOT EXISTS audit_log_row_idx ON tbl_master_audit_log (table_name, row_id, id);
+CREATE INDEX IF NOT EXISTS audit_log_username_idx ON tbl_master_audit_log (username, id);
@@ -1,5 +1,6 @@
 # SRAR health check logic
 from django.http import JsonResponse
+from common_metrics import db_pool
 
 def health_check(request):
-	return JsonResponse({'status': 'ok'})
+	return JsonResponse({'status': 'ok', 'database_pool': db_pool.pool_stats()})
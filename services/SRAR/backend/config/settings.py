@@ -7,11 +7,17 @@ Production-ready settings with JWT authentication support.
 # ...copied and adapted from auth_service settings.py...
 # Change SERVICE_NAME and any app-specific settings as needed
 
-import os
+import os, sys
 from datetime import timedelta
 from decouple import config
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Shared packages (common_metrics) live next to the service directories
+SERVICES_DIR = os.path.abspath(os.path.join(BASE_DIR, '../..'))
+
+if SERVICES_DIR not in sys.path:
+    sys.path.insert(0, SERVICES_DIR)
 SECRET_KEY = config('SECRET_KEY', default='django-insecure-change-me-in-production')
 DEBUG = config('DEBUG', default=True, cast=bool)
 ALLOWED_HOSTS = config('ALLOWED_HOSTS', default='localhost,127.0.0.1', cast=lambda v: [s.strip() for s in v.split(',')])
@@ -77,6 +83,19 @@ DATABASES = {
         'CONN_HEALTH_CHECKS': True,
     }
 }
+
+# Server-side connection pool (psycopg 3 with psycopg_pool). Each worker
+# process shares at most DATABASE_POOL_MAX_SIZE connections between its
+# threads; Django requires CONN_MAX_AGE = 0 with a pool.
+if config('DATABASE_POOL', default=False, cast=bool):
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': config('DATABASE_POOL_MIN_SIZE', default=2, cast=int),
+        'max_size': config('DATABASE_POOL_MAX_SIZE', default=10, cast=int),
+        'timeout': config('DATABASE_POOL_TIMEOUT', default=10, cast=float),
+        'max_idle': config('DATABASE_POOL_MAX_IDLE', default=300, cast=float),
+        'max_lifetime': config('DATABASE_POOL_MAX_LIFETIME', default=3600, cast=float),
+    }
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -9,3 +9,7 @@ class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.users'
     verbose_name = 'Users'
+
+    def ready(self):
+        # Connect the tab cache invalidation and readiness refresh signals
+        from . import homepage_cache, readiness  # noqa: F401
@@ -2,6 +2,8 @@
 Circuit breaker pattern implementation for microservice resilience.
 """
 
+import os
+import threading
 import time
 import logging
 from functools import wraps
@@ -16,18 +18,54 @@ class CircuitBreakerError(Exception):
     pass
 
 
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
 class CircuitBreaker:
     """
     Circuit breaker implementation for database and external service calls.
+
+    State lives in process memory, so a protected call does no cache I/O.
+    Outcomes are counted in a rolling window of ``window`` seconds split
+    into ``buckets``; the breaker opens when the window holds
+    ``failure_threshold`` failures, or when ``error_rate_threshold`` is set
+    and at least ``minimum_calls`` calls failed at that rate. After
+    ``recovery_timeout`` seconds it lets ``half_open_max_calls`` concurrent
+    probes through; one success closes it, one failure re-opens it.
+
+    A background thread reconciles state with the shared cache every
+    ``sync_interval`` seconds (last transition wins), so a trip in one
+    worker reaches the others within two sync intervals (publish + read).
     """
     
-    def __init__(self, name, failure_threshold=5, recovery_timeout=30):
+    def __init__(self, name, failure_threshold=5, recovery_timeout=30, window=60, buckets=10,
+                 error_rate_threshold=None, minimum_calls=10, half_open_max_calls=1,
+                 sync_interval=1.0, expected_exception=Exception):
         self.name = name
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
-        self.failure_count_key = f"circuit_breaker:{name}:failures"
-        self.last_failure_key = f"circuit_breaker:{name}:last_failure"
+        self.window = window
+        self.bucket_seconds = window / buckets
+        self.error_rate_threshold = error_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.half_open_max_calls = half_open_max_calls
+        self.sync_interval = sync_interval
+        self.expected_exception = expected_exception
         self.state_key = f"circuit_breaker:{name}:state"
+
+        self._lock = threading.Lock()
+        # [bucket index, successes, failures] per slot of the rolling window
+        self._buckets = [[-1, 0, 0] for _ in range(buckets)]
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._changed_at = 0.0
+        self._published_at = 0.0
+        self._probes = 0
+        self._rejected = 0
+        self._sync_thread = None
+        self._sync_pid = None
     
     def __call__(self, func):
         """Decorator to wrap functions with circuit breaker."""
@@ -35,79 +73,186 @@ class CircuitBreaker:
         def wrapper(*args, **kwargs):
             return self._call_with_circuit_breaker(func, *args, **kwargs)
         return wrapper
+
+    @property
+    def state(self):
+        """Current state as seen by this process."""
+        return self._state
+
+    def stats(self):
+        """Return state and rolling-window counters."""
+        now = time.time()
+        with self._lock:
+            successes, failures = self._window_totals(now)
+            return {
+                'state': self._state,
+                'successes': successes,
+                'failures': failures,
+                'rejected': self._rejected,
+                'opened_at': self._opened_at or None,
+            }
     
     def _call_with_circuit_breaker(self, func, *args, **kwargs):
         """Execute function with circuit breaker protection."""
-        state = self._get_state()
-        
-        if state == 'open':
-            if self._should_attempt_reset():
-                self._set_state('half_open')
-            else:
-                logger.warning(f"Circuit breaker {self.name} is OPEN - rejecting call")
-                raise CircuitBreakerError(f"Circuit breaker {self.name} is open")
-        
+        self._ensure_sync_thread()
+        probe = self._before_call()
         try:
             result = func(*args, **kwargs)
-            self._on_success()
-            return result
-        except Exception as e:
-            self._on_failure()
-            raise e
-    
-    def _get_state(self):
-        """Get current circuit breaker state."""
-        return cache.get(self.state_key, 'closed')
-    
-    def _set_state(self, state):
-        """Set circuit breaker state."""
-        cache.set(self.state_key, state, timeout=3600)
-        logger.info(f"Circuit breaker {self.name} state changed to: {state}")
-    
-    def _get_failure_count(self):
-        """Get current failure count."""
-        return cache.get(self.failure_count_key, 0)
-    
-    def _increment_failure_count(self):
-        """Increment failure count."""
-        count = self._get_failure_count() + 1
-        cache.set(self.failure_count_key, count, timeout=3600)
-        cache.set(self.last_failure_key, time.time(), timeout=3600)
-        return count
-    
-    def _reset_failure_count(self):
-        """Reset failure count."""
-        cache.delete(self.failure_count_key)
-        cache.delete(self.last_failure_key)
-    
-    def _should_attempt_reset(self):
-        """Check if enough time has passed to attempt reset."""
-        last_failure = cache.get(self.last_failure_key, 0)
-        return time.time() - last_failure >= self.recovery_timeout
-    
-    def _on_success(self):
+        except self.expected_exception:
+            self._on_failure(probe)
+            raise
+        except BaseException:
+            if probe:
+                self._release_probe()
+            raise
+        self._on_success(probe)
+        return result
+
+    def _before_call(self):
+        """Admit or reject a call; return True if it is a half-open probe."""
+        with self._lock:
+            if self._state == CLOSED:
+                return False
+            if self._state == OPEN and time.time() - self._opened_at >= self.recovery_timeout:
+                self._transition(HALF_OPEN)
+            if self._state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+            self._rejected += 1
+        logger.warning(f"Circuit breaker {self.name} is OPEN - rejecting call")
+        raise CircuitBreakerError(f"Circuit breaker {self.name} is open")
+
+    def _on_success(self, probe):
         """Handle successful call."""
-        state = self._get_state()
-        if state == 'half_open':
-            self._set_state('closed')
-            self._reset_failure_count()
-            logger.info(f"Circuit breaker {self.name} reset to CLOSED")
-    
-    def _on_failure(self):
+        with self._lock:
+            self._record(time.time(), failed=False)
+            if probe:
+                self._probes = max(self._probes - 1, 0)
+                if self._state == HALF_OPEN:
+                    self._transition(CLOSED)
+                    self._reset_window()
+                    logger.info(f"Circuit breaker {self.name} reset to CLOSED")
+
+    def _on_failure(self, probe):
         """Handle failed call."""
-        failure_count = self._increment_failure_count()
-        logger.warning(f"Circuit breaker {self.name} failure count: {failure_count}")
-        
-        if failure_count >= self.failure_threshold:
-            self._set_state('open')
-            logger.error(f"Circuit breaker {self.name} opened due to {failure_count} failures")
+        now = time.time()
+        with self._lock:
+            self._record(now, failed=True)
+            if probe:
+                self._probes = max(self._probes - 1, 0)
+                if self._state == HALF_OPEN:
+                    self._open(now)
+                return
+            successes, failures = self._window_totals(now)
+            if self._state == CLOSED and self._should_trip(successes, failures):
+                self._open(now)
+                logger.error(f"Circuit breaker {self.name} opened due to {failures} failures")
+
+    def _release_probe(self):
+        with self._lock:
+            self._probes = max(self._probes - 1, 0)
+
+    def _should_trip(self, successes, failures):
+        if failures >= self.failure_threshold:
+            return True
+        calls = successes + failures
+        return (
+            self.error_rate_threshold is not None
+            and calls >= self.minimum_calls
+            and failures / calls >= self.error_rate_threshold
+        )
+
+    def _open(self, now):
+        self._opened_at = now
+        self._transition(OPEN)
+
+    def _transition(self, state, changed_at=None):
+        """Change state (caller holds the lock)."""
+        self._state = state
+        self._changed_at = changed_at or time.time()
+        if state != HALF_OPEN:
+            self._probes = 0
+        logger.info(f"Circuit breaker {self.name} state changed to: {state}")
+
+    def _record(self, now, failed):
+        index = int(now // self.bucket_seconds)
+        bucket = self._buckets[index % len(self._buckets)]
+        if bucket[0] != index:
+            bucket[:] = [index, 0, 0]
+        bucket[2 if failed else 1] += 1
+
+    def _window_totals(self, now):
+        oldest = int(now // self.bucket_seconds) - len(self._buckets) + 1
+        successes = failures = 0
+        for index, bucket_successes, bucket_failures in self._buckets:
+            if index >= oldest:
+                successes += bucket_successes
+                failures += bucket_failures
+        return successes, failures
+
+    def _reset_window(self):
+        for bucket in self._buckets:
+            bucket[:] = [-1, 0, 0]
+
+    def sync(self):
+        """Publish a local transition or adopt a newer shared one."""
+        with self._lock:
+            local = {
+                'state': self._state,
+                'opened_at': self._opened_at,
+                'changed_at': self._changed_at,
+            }
+        try:
+            shared = cache.get(self.state_key)
+            if shared and shared['changed_at'] > local['changed_at']:
+                with self._lock:
+                    if shared['changed_at'] > self._changed_at:
+                        self._opened_at = shared['opened_at']
+                        # Probes are admitted per process, not shared
+                        state = OPEN if shared['state'] == HALF_OPEN else shared['state']
+                        self._transition(state, changed_at=shared['changed_at'])
+                        if state == CLOSED:
+                            self._reset_window()
+                        self._published_at = shared['changed_at']
+            elif local['changed_at'] > self._published_at:
+                cache.set(self.state_key, local, timeout=3600)
+                self._published_at = local['changed_at']
+        except Exception as e:
+            logger.warning(f"Circuit breaker {self.name} sync failed: {str(e)}")
+
+    def _ensure_sync_thread(self):
+        """Start the sync thread in this process if it is not running."""
+        if not self.sync_interval:
+            return
+        pid = os.getpid()
+        if self._sync_thread is not None and self._sync_pid == pid and self._sync_thread.is_alive():
+            return
+        with self._lock:
+            if self._sync_thread is not None and self._sync_pid == pid and self._sync_thread.is_alive():
+                return
+            self._sync_thread = threading.Thread(
+                target=self._run_sync, name=f'circuit-breaker-{self.name}', daemon=True
+            )
+            self._sync_pid = pid
+            self._sync_thread.start()
+
+    def _run_sync(self):
+        while True:
+            time.sleep(self.sync_interval)
+            self.sync()
 
 
 # Pre-configured circuit breakers
 database_circuit_breaker = CircuitBreaker(
     name='database',
     failure_threshold=getattr(settings, 'CIRCUIT_BREAKER_SETTINGS', {}).get('failure_threshold', 5),
-    recovery_timeout=getattr(settings, 'CIRCUIT_BREAKER_SETTINGS', {}).get('recovery_timeout', 30)
+    recovery_timeout=getattr(settings, 'CIRCUIT_BREAKER_SETTINGS', {}).get('recovery_timeout', 30),
+    window=getattr(settings, 'CIRCUIT_BREAKER_SETTINGS', {}).get('window', 60),
+    error_rate_threshold=getattr(settings, 'CIRCUIT_BREAKER_SETTINGS', {}).get('error_rate_threshold'),
+    minimum_calls=getattr(settings, 'CIRCUIT_BREAKER_SETTINGS', {}).get('minimum_calls', 10),
+    half_open_max_calls=getattr(settings, 'CIRCUIT_BREAKER_SETTINGS', {}).get('half_open_max_calls', 1),
+    sync_interval=getattr(settings, 'CIRCUIT_BREAKER_SETTINGS', {}).get('sync_interval', 1.0),
+    expected_exception=getattr(settings, 'CIRCUIT_BREAKER_SETTINGS', {}).get('expected_exception', Exception),
 )
 
 
@@ -0,0 +1,124 @@
+"""
+Feedback aggregates for the analytics endpoint.
+
+Every feedback insert increments running totals in ``FeedbackAggregate``
+for each answered question, once in the all-time bucket and once in the
+bucket for the day it was submitted. Dashboards read those rows only, so a
+summary costs O(modules x questions x days) regardless of how many feedback
+rows exist. ``manage.py rebuild_feedback_aggregates`` recomputes the table
+from ``tbl_usermgmt_feedback`` for backfills or after manual edits.
+"""
+
+import logging
+from datetime import timedelta
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from .models import FeedbackAggregate
+
+logger = logging.getLogger(__name__)
+
+QUESTIONS = ('question1', 'question2', 'question3', 'question4')
+SCORES = (1, 2, 3, 4, 5)
+ALL_TIME = 'all'
+
+
+def parse_score(value):
+    """Return ``value`` as an int score 1-5, or None if unanswered/invalid."""
+    try:
+        score = int(value)
+    except (TypeError, ValueError):
+        return None
+    return score if score in SCORES else None
+
+
+def feedback_period(insert_datetime):
+    """Return the daily bucket key for a feedback timestamp."""
+    return timezone.localdate(insert_datetime).isoformat()
+
+
+def record_feedback(feedback):
+    """Add one feedback row to the aggregates (call inside its transaction)."""
+    period = feedback_period(feedback.insert_datetime)
+    for question in QUESTIONS:
+        score = parse_score(getattr(feedback, question))
+        if score is None:
+            continue
+        for bucket in (ALL_TIME, period):
+            _increment(feedback.module, question, bucket, score)
+
+
+def _increment(module, question, period, score):
+    score_field = f'score_{score}'
+    buckets = FeedbackAggregate.objects.filter(module=module, question=question, period=period)
+    updates = {
+        'count': F('count') + 1,
+        'total': F('total') + score,
+        score_field: F(score_field) + 1,
+        'updated_at': timezone.now(),
+    }
+    if buckets.update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            FeedbackAggregate.objects.create(
+                module=module, question=question, period=period,
+                count=1, total=score, **{score_field: 1},
+            )
+    except IntegrityError:
+        # Another request created the bucket first
+        buckets.update(**updates)
+
+
+def summarize(module=None, days=30):
+    """
+    Return per-module aggregates with per-question breakdown and a daily
+    trend covering the last ``days`` days.
+    """
+    since = (timezone.localdate() - timedelta(days=days - 1)).isoformat()
+    aggregates = FeedbackAggregate.objects.filter(Q(period=ALL_TIME) | Q(period__gte=since))
+    if module:
+        aggregates = aggregates.filter(module=module)
+
+    modules = {}
+    for row in aggregates.values('module', 'question', 'period', 'count', 'total',
+                                 *(f'score_{score}' for score in SCORES)):
+        summary = modules.setdefault(row['module'], {
+            'module': row['module'],
+            'count': 0,
+            'total': 0,
+            'histogram': dict.fromkeys(map(str, SCORES), 0),
+            'questions': {},
+            'trend': {},
+        })
+        if row['period'] == ALL_TIME:
+            summary['count'] += row['count']
+            summary['total'] += row['total']
+            histogram = {str(score): row[f'score_{score}'] for score in SCORES}
+            for score, count in histogram.items():
+                summary['histogram'][score] += count
+            summary['questions'][row['question']] = {
+                'count': row['count'],
+                'mean': _mean(row['total'], row['count']),
+                'histogram': histogram,
+            }
+        else:
+            day = summary['trend'].setdefault(row['period'], {'date': row['period'], 'count': 0, 'total': 0})
+            day['count'] += row['count']
+            day['total'] += row['total']
+
+    results = []
+    for name in sorted(modules):
+        summary = modules[name]
+        summary['mean'] = _mean(summary.pop('total'), summary['count'])
+        trend = []
+        for date in sorted(summary['trend']):
+            day = summary['trend'][date]
+            trend.append({'date': date, 'count': day['count'], 'mean': _mean(day['total'], day['count'])})
+        summary['trend'] = trend
+        results.append(summary)
+    return results
+
+
+def _mean(total, count):
+    return round(total / count, 2) if count else None
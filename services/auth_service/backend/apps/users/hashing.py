@@ -0,0 +1,163 @@
+"""
+Bounded executor for password hashing.
+
+PBKDF2 hashing in login and user management is CPU bound. Running it on the
+request thread lets a burst of logins occupy every worker. Hashes are instead
+submitted to a dedicated pool (a process pool by default) with a fixed
+concurrency cap. Requests beyond ``max_workers + max_queue`` in-flight hashes
+are rejected immediately with ``HashingPoolSaturated`` so callers can answer
+503 with Retry-After instead of queueing behind the burst.
+
+Limits apply per gunicorn worker process, and admission is only checked
+when a request arrives. Load is therefore only shed with threaded (gthread)
+or ASGI workers, where several requests share one pool. A sync worker
+serves one request at a time, so its queue never fills; bound it with the
+gunicorn backlog and ``timeout`` instead.
+
+A hash that times out keeps its slot until it actually finishes, so a
+stuck executor rejects new requests instead of queueing more work behind
+the old ones.
+"""
+
+import os
+import threading
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+from django.conf import settings
+from django.contrib.auth import hashers
+
+logger = logging.getLogger(__name__)
+
+
+class HashingPoolSaturated(Exception):
+    """Exception raised when the hashing queue is full."""
+
+    def __init__(self, retry_after):
+        super().__init__('Password hashing pool is saturated')
+        self.retry_after = retry_after
+
+
+def _initialize_worker():
+    """Make sure Django is configured in spawned hashing processes."""
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+class PasswordHashingPool:
+    """
+    Admission-controlled pool for check_password/make_password.
+    """
+
+    EXECUTORS = ('process', 'thread', 'inline')
+
+    def __init__(self, executor='process', max_workers=2, max_queue=8, timeout=10, retry_after=1):
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"Unknown hashing executor: {executor}")
+        self.executor_type = executor
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+        self._stats = {
+            'submitted': 0,
+            'rejected': 0,
+            'timed_out': 0,
+            'in_flight': 0,
+            'total_seconds': 0.0,
+            'max_seconds': 0.0,
+        }
+
+    def check_password(self, password, encoded):
+        """Verify ``password`` against ``encoded`` in the pool."""
+        return self._submit(hashers.check_password, password, encoded)
+
+    def make_password(self, password):
+        """Hash ``password`` in the pool."""
+        return self._submit(hashers.make_password, password)
+
+    def stats(self):
+        """Return submission counters and hash latency."""
+        with self._lock:
+            stats = dict(self._stats)
+        completed = stats['submitted'] - stats['in_flight']
+        stats['avg_seconds'] = round(stats['total_seconds'] / completed, 4) if completed else 0.0
+        stats['total_seconds'] = round(stats['total_seconds'], 4)
+        stats['max_seconds'] = round(stats['max_seconds'], 4)
+        stats['executor'] = self.executor_type
+        stats['max_workers'] = self.max_workers
+        stats['max_queue'] = self.max_queue
+        return stats
+
+    def _submit(self, func, *args):
+        """Run ``func`` in the pool, rejecting when no slot is free."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats['rejected'] += 1
+            logger.warning("Password hashing pool saturated - rejecting request")
+            raise HashingPoolSaturated(self.retry_after)
+
+        with self._lock:
+            self._stats['submitted'] += 1
+            self._stats['in_flight'] += 1
+        start_time = time.perf_counter()
+        if self.executor_type == 'inline':
+            try:
+                return func(*args)
+            finally:
+                self._finish(func, start_time)
+        try:
+            future = self._get_executor().submit(func, *args)
+        except Exception:
+            self._finish(func, start_time)
+            raise
+        # The slot is freed when the hash ends, not when the caller stops waiting
+        future.add_done_callback(lambda future: self._finish(func, start_time))
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            with self._lock:
+                self._stats['timed_out'] += 1
+            logger.warning(f"Password hash {func.__name__} timed out after {self.timeout}s")
+            raise HashingPoolSaturated(self.retry_after)
+
+    def _finish(self, func, start_time):
+        """Free the slot of a finished hash and record its duration."""
+        duration = time.perf_counter() - start_time
+        self._slots.release()
+        with self._lock:
+            self._stats['in_flight'] -= 1
+            self._stats['total_seconds'] += duration
+            self._stats['max_seconds'] = max(self._stats['max_seconds'], duration)
+        logger.debug(f"Password hash {func.__name__} took {duration:.3f}s")
+
+    def _get_executor(self):
+        """Create the executor lazily, once per process (after fork)."""
+        pid = os.getpid()
+        with self._lock:
+            if self._executor is None or self._executor_pid != pid:
+                if self.executor_type == 'process':
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers, initializer=_initialize_worker
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix='password-hashing'
+                    )
+                self._executor_pid = pid
+            return self._executor
+
+
+password_hashing_pool = PasswordHashingPool(
+    executor=getattr(settings, 'PASSWORD_HASHING_SETTINGS', {}).get('executor', 'process'),
+    max_workers=getattr(settings, 'PASSWORD_HASHING_SETTINGS', {}).get('max_workers', 2),
+    max_queue=getattr(settings, 'PASSWORD_HASHING_SETTINGS', {}).get('max_queue', 8),
+    timeout=getattr(settings, 'PASSWORD_HASHING_SETTINGS', {}).get('timeout', 10),
+    retry_after=getattr(settings, 'PASSWORD_HASHING_SETTINGS', {}).get('retry_after', 1),
+)
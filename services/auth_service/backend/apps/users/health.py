@@ -3,15 +3,26 @@ Health check and monitoring endpoints for microservice deployment.
 """
 
 import time
-import psutil
 from django.conf import settings
-from django.db import connection
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.views import View
 from rest_framework.permissions import AllowAny
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from common_auth.principal_cache import principal_cache
+from common_db.routers import replica_health
+from common_metrics import db_pool
+from common_metrics.request_metrics import request_metrics
+from .token_journal import token_journal
+from .hashing import password_hashing_pool
+from .revocation import revocation_store
+from .homepage_cache import homepage_cache
+from .ratelimit import rate_limiter
+from .circuit_breaker import database_circuit_breaker
+from .system_metrics import system_sampler
+from .readiness import readiness_checker
+from . import prometheus
 import logging
 
 logger = logging.getLogger(__name__)
@@ -36,15 +47,15 @@ class ReadinessView(APIView):
     """
     Readiness probe for Kubernetes deployments.
     Checks database connectivity and critical dependencies.
+
+    Checks run concurrently with a timeout and are cached briefly, and the
+    migration status is computed once; see ``readiness.ReadinessChecker``.
     """
     permission_classes = [AllowAny]
     
     def get(self, request):
         """Check if service is ready to handle requests."""
-        checks = {
-            'database': self._check_database(),
-            'migrations': self._check_migrations()
-        }
+        checks = readiness_checker.check()
         
         all_healthy = all(checks.values())
         
@@ -53,25 +64,6 @@ class ReadinessView(APIView):
             'checks': checks,
             'timestamp': time.time()
         }, status=status.HTTP_200_OK if all_healthy else status.HTTP_503_SERVICE_UNAVAILABLE)
-    
-    def _check_database(self):
-        """Check database connectivity."""
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
-            return True
-        except Exception:
-            return False
-    
-    def _check_migrations(self):
-        """Check if migrations are applied."""
-        try:
-            from django.db.migrations.executor import MigrationExecutor
-            executor = MigrationExecutor(connection)
-            plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
-            return len(plan) == 0
-        except Exception:
-            return False
 
 
 class LivenessView(APIView):
@@ -91,36 +83,43 @@ class LivenessView(APIView):
 
 class MetricsView(APIView):
     """
-    Basic metrics endpoint for monitoring.
+    Metrics endpoint for monitoring.
+
+    Serves Prometheus text by default and JSON with ``?format=json``.
+    System statistics come from the background sampler, so a scrape never
+    blocks on CPU measurement or database queries.
     """
     permission_classes = [AllowAny]
     
     def get(self, request):
-        """Return basic system metrics."""
+        """Return system and component metrics."""
         try:
-            # System metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-            
-            # Database connection info
-            db_connections = self._get_db_connections()
-            
+            system = system_sampler.snapshot()
             metrics = {
-                'system': {
-                    'cpu_percent': cpu_percent,
-                    'memory_percent': memory.percent,
-                    'memory_available_mb': memory.available // (1024 * 1024),
-                    'disk_percent': disk.percent,
-                    'disk_free_gb': disk.free // (1024 * 1024 * 1024)
-                },
+                'system': system,
                 'database': {
-                    'connections': db_connections
+                    'connections': system['latest']['db_connections'],
+                    'pool': db_pool.pool_stats(),
+                    'replicas': replica_health.stats()
                 },
+                'principal_cache': principal_cache.stats(),
+                'token_journal': token_journal.stats(),
+                'password_hashing': password_hashing_pool.stats(),
+                'token_revocation': revocation_store.stats(),
+                'homepage_cache': homepage_cache.stats(),
+                'readiness': readiness_checker.stats(),
+                'rate_limit': rate_limiter.stats(),
+                'circuit_breakers': {'database': database_circuit_breaker.stats()},
                 'timestamp': time.time()
             }
-            
-            return Response(metrics, status=status.HTTP_200_OK)
+
+            if request.query_params.get('format') == 'json':
+                metrics['requests'] = request_metrics.summary()
+                return Response(metrics, status=status.HTTP_200_OK)
+            return HttpResponse(
+                prometheus.render(metrics) + request_metrics.render_prometheus(),
+                content_type=prometheus.CONTENT_TYPE
+            )
             
         except Exception as e:
             logger.error(f"Error collecting metrics: {str(e)}")
@@ -128,16 +127,3 @@ class MetricsView(APIView):
                 'error': 'Failed to collect metrics',
                 'timestamp': time.time()
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-    
-    def _get_db_connections(self):
-        """Get database connection count."""
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    SELECT count(*) 
-                    FROM pg_stat_activity 
-                    WHERE datname = current_database()
-                """)
-                return cursor.fetchone()[0]
-        except Exception:
-            return 0
\ No newline at end of file
@@ -0,0 +1,167 @@
+"""
+Versioned response cache for HomePageView tabs.
+
+Each tab (INSTRUCTIONS, CMMS OFFLINE, DOWNLOADS, PUBLICATIONS) is rendered
+once to JSON bytes and stored in the default cache together with its ETag,
+under a key that includes a shared version number. Saving or deleting a
+``HomePageInformation`` row (admin, views, shell) bumps the version via
+signals once the transaction commits, so every worker renders fresh content
+on its next request and never caches rows that were not yet committed.
+``QuerySet.update()``/``bulk_create`` bypass signals; call
+``homepage_cache.invalidate()`` after using them.
+
+Cache errors never fail a request or a save: reads fall back to rendering
+from the database, and a failed bump is logged, counted and retried by
+this worker's next read. A per-process (local memory) cache cannot be
+invalidated from other workers, so entries there live at most
+``local_ttl`` seconds.
+
+A request whose ``If-None-Match`` matches the cached ETag is answered 304
+without touching the database or the serializers.
+"""
+
+import hashlib
+import threading
+import time
+import logging
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.renderers import JSONRenderer
+from common_auth import async_cache
+from common_db.routers import primary_reads
+from .models import HomePageInformation
+from .serializers import (InstructionsSerializer, OfflineSerializer,
+                          DownloadsSerializer, PublicationsSerializer)
+
+logger = logging.getLogger(__name__)
+
+TAB_SERIALIZERS = {
+    'INSTRUCTIONS': InstructionsSerializer,
+    'CMMS OFFLINE': OfflineSerializer,
+    'DOWNLOADS': DownloadsSerializer,
+    'PUBLICATIONS': PublicationsSerializer,
+}
+
+
+class HomePageCache:
+    """
+    Pre-rendered tab content keyed by (version, tab).
+    """
+
+    def __init__(self, key_prefix='homepage', ttl=86400, local_ttl=60):
+        self.key_prefix = key_prefix
+        backend = settings.CACHES['default']['BACKEND']
+        self.ttl = min(ttl, local_ttl) if 'locmem' in backend.lower() else ttl
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'invalidations': 0, 'errors': 0, 'invalidation_errors': 0}
+        # Set while a version bump failed, the cache is bypassed until one succeeds
+        self._stale = False
+
+    def get(self, tab):
+        """Return ``(etag, body)`` for ``tab``, rendering it on a miss."""
+        if self._stale and not self.invalidate():
+            return self.render(tab, 'uncached')
+        try:
+            version = self.version()
+            cache_key = f"{self.key_prefix}:{version}:{tab}"
+            entry = cache.get(cache_key)
+        except Exception as e:
+            logger.warning(f"Home page cache unavailable, rendering {tab}: {str(e)}")
+            self._count('errors')
+            return self.render(tab, 'uncached')
+        if entry is not None:
+            self._count('hits')
+            return entry
+
+        self._count('misses')
+        # Cached until the next write, so never rendered from a lagging replica
+        with primary_reads():
+            entry = self.render(tab, version)
+        try:
+            cache.set(cache_key, entry, self.ttl)
+        except Exception as e:
+            logger.warning(f"Home page cache write failed for {tab}: {str(e)}")
+            self._count('errors')
+        return entry
+
+    async def aget(self, tab):
+        """``get`` for async views: hits are served without blocking, misses render in a thread."""
+        if not self._stale:
+            try:
+                version = await async_cache.aget(f"{self.key_prefix}:version")
+                entry = None
+                if version is not None:
+                    entry = await async_cache.aget(f"{self.key_prefix}:{version}:{tab}")
+            except Exception as e:
+                logger.warning(f"Home page cache unavailable, rendering {tab}: {str(e)}")
+                entry = None
+            if entry is not None:
+                self._count('hits')
+                return entry
+        return await sync_to_async(self.get)(tab)
+
+    def render(self, tab, version):
+        """Return ``(etag, body)`` of ``tab`` rendered from the database."""
+        serializer = TAB_SERIALIZERS[tab](
+            HomePageInformation.objects.filter(header_name=tab), many=True
+        )
+        body = JSONRenderer().render(serializer.data)
+        return (f'"{version}-{hashlib.md5(body, usedforsecurity=False).hexdigest()[:16]}"', body)
+
+    def version(self):
+        """Return the current content version, initializing it if needed."""
+        version_key = f"{self.key_prefix}:version"
+        version = cache.get(version_key)
+        if version is None:
+            # Seed from the clock so a lost version key never reuses old entries
+            cache.add(version_key, int(time.time()), None)
+            version = cache.get(version_key)
+        return version
+
+    def invalidate(self):
+        """Bump the version so all cached tabs are re-rendered; return False if the cache failed."""
+        version_key = f"{self.key_prefix}:version"
+        try:
+            try:
+                cache.incr(version_key)
+            except ValueError:
+                cache.set(version_key, int(time.time()), None)
+        except Exception as e:
+            logger.error(f"Home page cache invalidation failed: {str(e)}")
+            self._stale = True
+            self._count('invalidation_errors')
+            return False
+        self._stale = False
+        self._count('invalidations')
+        logger.info("Home page cache invalidated")
+        return True
+
+    def stats(self):
+        """Return hit/miss counters for this process."""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+
+homepage_cache = HomePageCache(
+    key_prefix=getattr(settings, 'HOMEPAGE_CACHE_SETTINGS', {}).get('key_prefix', 'homepage'),
+    ttl=getattr(settings, 'HOMEPAGE_CACHE_SETTINGS', {}).get('ttl', 86400),
+    local_ttl=getattr(settings, 'HOMEPAGE_CACHE_SETTINGS', {}).get('local_ttl', 60),
+)
+
+
+@receiver(post_save, sender=HomePageInformation)
+@receiver(post_delete, sender=HomePageInformation)
+def invalidate_homepage_cache(sender, **kwargs):
+    # After commit, or a concurrent miss could cache the old rows under the new version
+    transaction.on_commit(homepage_cache.invalidate)
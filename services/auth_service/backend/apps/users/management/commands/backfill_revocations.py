@@ -0,0 +1,35 @@
+"""
+Management command to load the blacklist tables into the revocation store.
+"""
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from apps.users.revocation import revocation_store
+
+
+class Command(BaseCommand):
+    help = 'Revoke every unexpired blacklisted refresh token in the revocation store'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Blacklisted tokens fetched per database round trip (default: 5000)',
+        )
+
+    def handle(self, *args, **options):
+        rows = BlacklistedToken.objects.filter(
+            token__expires_at__gt=timezone.now()
+        ).values_list('token__jti', 'token__expires_at')
+        entries = (
+            (jti, expires_at.timestamp())
+            for jti, expires_at in rows.iterator(chunk_size=options['chunk_size'])
+        )
+        count = revocation_store.backfill(entries)
+
+        backend = 'shared' if revocation_store.is_shared() else 'in-process'
+        self.stdout.write(
+            self.style.SUCCESS(f'Revoked {count} blacklisted tokens in the {backend} revocation store')
+        )
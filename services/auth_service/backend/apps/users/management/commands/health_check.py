@@ -95,9 +95,9 @@ class Command(BaseCommand):
     def check_circuit_breakers(self):
         """Check circuit breaker status."""
         try:
-            # This is a simplified check
-            # In production, you'd check the actual circuit breaker states
-            return True
+            # Pick up trips recorded by the running workers
+            database_circuit_breaker.sync()
+            return database_circuit_breaker.state != 'open'
         except Exception:
             return False
     
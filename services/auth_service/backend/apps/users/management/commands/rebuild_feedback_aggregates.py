@@ -0,0 +1,104 @@
+"""
+Management command to rebuild feedback aggregates from the feedback table.
+
+Feedback inserts increment the aggregates in their own transaction. On
+PostgreSQL the aggregate table is locked in EXCLUSIVE mode before the
+feedback rows are read, so every feedback is counted exactly once: rows
+committed before the lock are in the rebuild, and later inserts wait for it
+and then increment the rebuilt rows. Feedback submissions block for the
+duration of the rebuild. Other databases take no lock; run the command
+there only while feedback writes are stopped.
+"""
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from apps.users.feedback_analytics import ALL_TIME, QUESTIONS, SCORES, feedback_period, parse_score
+from apps.users.models import Feedback, FeedbackAggregate
+
+
+class Command(BaseCommand):
+    help = 'Rebuild tbl_usermgmt_feedback_aggregate from tbl_usermgmt_feedback'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Feedback rows fetched per database round trip (default: 5000)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Aggregate rows per bulk insert (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        modules, periods, scores = [], [], []
+        with transaction.atomic():
+            self.lock_aggregates()
+            rows = Feedback.objects.values_list('module', 'insert_datetime', *QUESTIONS)
+            for module, insert_datetime, *answers in rows.iterator(chunk_size=options['chunk_size']):
+                modules.append(module)
+                periods.append(feedback_period(insert_datetime))
+                scores.append([parse_score(answer) or 0 for answer in answers])
+
+            aggregates = self.build_aggregates(modules, periods, scores)
+            FeedbackAggregate.objects.all().delete()
+            FeedbackAggregate.objects.bulk_create(aggregates, batch_size=options['batch_size'])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Rebuilt {len(aggregates)} aggregate rows from {len(modules)} feedback rows'
+            )
+        )
+
+    def lock_aggregates(self):
+        """Block concurrent aggregate increments until the rebuild commits (PostgreSQL)."""
+        if connection.vendor != 'postgresql':
+            return
+        table = connection.ops.quote_name(FeedbackAggregate._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(f'LOCK TABLE {table} IN EXCLUSIVE MODE')
+
+    def build_aggregates(self, modules, periods, scores):
+        """Histogram every (module, question, period) bucket with np.bincount."""
+        if not modules:
+            return []
+        module_names, module_index = np.unique(np.array(modules), return_inverse=True)
+        period_names, period_index = np.unique(np.array(periods), return_inverse=True)
+        scores = np.array(scores, dtype=np.int64).reshape(len(modules), len(QUESTIONS))
+        num_modules, num_periods, num_bins = len(module_names), len(period_names), len(SCORES) + 1
+
+        aggregates = []
+        for column, question in enumerate(QUESTIONS):
+            answered = scores[:, column] > 0
+            answer_scores = scores[answered, column]
+            answer_modules = module_index[answered]
+
+            all_time = np.bincount(
+                answer_modules * num_bins + answer_scores, minlength=num_modules * num_bins
+            ).reshape(num_modules, num_bins)
+            daily = np.bincount(
+                (answer_modules * num_periods + period_index[answered]) * num_bins + answer_scores,
+                minlength=num_modules * num_periods * num_bins,
+            ).reshape(num_modules, num_periods, num_bins)
+
+            # Only buckets with at least one answer become rows
+            for m in np.flatnonzero(all_time.sum(axis=1)):
+                aggregates.append(self.to_row(module_names[m], question, ALL_TIME, all_time[m]))
+            for m, p in zip(*np.nonzero(daily.sum(axis=2))):
+                aggregates.append(self.to_row(module_names[m], question, period_names[p], daily[m, p]))
+        return aggregates
+
+    def to_row(self, module, question, period, histogram):
+        """Build a FeedbackAggregate from a histogram indexed by score."""
+        return FeedbackAggregate(
+            module=str(module),
+            question=question,
+            period=str(period),
+            count=int(histogram.sum()),
+            total=int(np.dot(histogram, np.arange(len(histogram)))),
+            **{f'score_{score}': int(histogram[score]) for score in SCORES},
+        )
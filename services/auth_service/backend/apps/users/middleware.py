@@ -7,6 +7,7 @@ import logging
 from django.core.cache import cache
 from django.http import JsonResponse
 from django.utils.deprecation import MiddlewareMixin
+from .ratelimit import rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -41,57 +42,48 @@ class SecurityHeadersMiddleware(MiddlewareMixin):
 class RateLimitMiddleware(MiddlewareMixin):
     """
     Rate limiting middleware for API endpoints.
+
+    Policies (path, limit, window) come from RATE_LIMIT_SETTINGS and are
+    enforced by ``apps.users.ratelimit`` with one atomic check per request.
     """
     
     def process_request(self, request):
         """Check rate limits for sensitive endpoints."""
-        if request.path.startswith('/api/auth/login/'):
-            return self._check_login_rate_limit(request)
-        elif request.path.startswith('/api/auth/signup/'):
-            return self._check_signup_rate_limit(request)
-        return None
-    
-    def _check_login_rate_limit(self, request):
-        """Rate limit login attempts."""
-        client_ip = self._get_client_ip(request)
-        cache_key = f"login_attempts:{client_ip}"
-        
-        attempts = cache.get(cache_key, 0)
-        if attempts >= 5:  # Max 5 attempts per 15 minutes
-            logger.warning(f"Rate limit exceeded for login from IP: {client_ip}")
-            return JsonResponse({
-                'success': False,
-                'message': 'Too many login attempts. Please try again later.',
-                'errors': {
-                    'detail': 'Rate limit exceeded',
-                    'code': 'rate_limit_exceeded'
-                }
-            }, status=429)
-        
-        # Increment counter
-        cache.set(cache_key, attempts + 1, 900)  # 15 minutes
-        return None
-    
-    def _check_signup_rate_limit(self, request):
-        """Rate limit signup attempts."""
+        policy = rate_limiter.match(request.path, request.method)
+        if policy is None:
+            return None
+
         client_ip = self._get_client_ip(request)
-        cache_key = f"signup_attempts:{client_ip}"
-        
-        attempts = cache.get(cache_key, 0)
-        if attempts >= 3:  # Max 3 signups per hour
-            logger.warning(f"Rate limit exceeded for signup from IP: {client_ip}")
-            return JsonResponse({
+        result = rate_limiter.hit(policy, client_ip)
+        if not result.allowed:
+            logger.warning(f"Rate limit exceeded for {policy.name} from IP: {client_ip}")
+            response = JsonResponse({
                 'success': False,
-                'message': 'Too many signup attempts. Please try again later.',
+                'message': f'Too many {policy.name} attempts. Please try again later.',
                 'errors': {
                     'detail': 'Rate limit exceeded',
                     'code': 'rate_limit_exceeded'
                 }
             }, status=429)
-        
-        # Increment counter
-        cache.set(cache_key, attempts + 1, 3600)  # 1 hour
+            response['Retry-After'] = str(result.retry_after)
+            return self._add_headers(response, result)
+
+        request._rate_limit = result
         return None
+
+    def process_response(self, request, response):
+        """Refund successful attempts for policies that only count failures."""
+        result = getattr(request, '_rate_limit', None)
+        if result is None:
+            return response
+        if result.policy.refund_success and response.status_code < 400:
+            rate_limiter.refund(result)
+        return self._add_headers(response, result)
+
+    def _add_headers(self, response, result):
+        response['X-RateLimit-Limit'] = str(result.policy.limit)
+        response['X-RateLimit-Remaining'] = str(result.remaining)
+        return response
     
     def _get_client_ip(self, request):
         """Get client IP address."""
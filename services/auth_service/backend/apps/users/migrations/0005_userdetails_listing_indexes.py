@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_remove_userdetails_e_remove_userdetails_h_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userdetails',
+            index=models.Index(fields=['status', 'id'], name='user_details_status_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userdetails',
+            index=models.Index(fields=['status', 'role', 'id'], name='user_details_status_role_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userdetails',
+            index=models.Index(fields=['status', 'rank', 'id'], name='user_details_status_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userdetails',
+            index=models.Index(fields=['status', 'ship_name', 'id'], name='user_details_status_ship_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userdetails',
+            index=models.Index(fields=['status', 'establishment', 'id'], name='user_details_status_estab_idx'),
+        ),
+    ]
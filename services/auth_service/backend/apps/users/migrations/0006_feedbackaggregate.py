@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-18 11:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_userdetails_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedbackAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('module', models.CharField(max_length=90)),
+                ('question', models.CharField(max_length=20)),
+                ('period', models.CharField(max_length=10)),
+                ('count', models.IntegerField(default=0)),
+                ('total', models.IntegerField(default=0)),
+                ('score_1', models.IntegerField(default=0)),
+                ('score_2', models.IntegerField(default=0)),
+                ('score_3', models.IntegerField(default=0)),
+                ('score_4', models.IntegerField(default=0)),
+                ('score_5', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'tbl_usermgmt_feedback_aggregate',
+                'indexes': [models.Index(fields=['period', 'module'], name='feedback_aggregate_period_idx')],
+                'constraints': [models.UniqueConstraint(fields=('module', 'question', 'period'), name='feedback_aggregate_unique_bucket')],
+            },
+        ),
+    ]
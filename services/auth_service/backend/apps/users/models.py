@@ -58,6 +58,41 @@ class Feedback(models.Model):
     def __str__(self):
         return f"{self.username} - Avg: {self.avg_feedback}"
 
+
+class FeedbackAggregate(models.Model):
+    """
+    Running feedback totals per (module, question, period).
+
+    ``period`` is ``'all'`` for all-time totals or an ISO date for the daily
+    trend buckets. Maintained on insert by ``apps.users.feedback_analytics``
+    and rebuilt with ``manage.py rebuild_feedback_aggregates``.
+    """
+    module = models.CharField(max_length=90)
+    question = models.CharField(max_length=20)
+    period = models.CharField(max_length=10)
+    count = models.IntegerField(default=0)
+    total = models.IntegerField(default=0)
+    score_1 = models.IntegerField(default=0)
+    score_2 = models.IntegerField(default=0)
+    score_3 = models.IntegerField(default=0)
+    score_4 = models.IntegerField(default=0)
+    score_5 = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'tbl_usermgmt_feedback_aggregate'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['module', 'question', 'period'], name='feedback_aggregate_unique_bucket'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['period', 'module'], name='feedback_aggregate_period_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.module} {self.question} {self.period}: {self.count}"
+
 class RoleMaster(models.Model):
     role_id = models.AutoField(primary_key=True)
     name = models.CharField(max_length=100)
@@ -98,6 +133,14 @@ class UserDetails(models.Model):
     
     class Meta:
         db_table = 'tbl_user_details'
+        # Keyset listing filters on status (+ one attribute) and pages on id
+        indexes = [
+            models.Index(fields=['status', 'id'], name='user_details_status_id_idx'),
+            models.Index(fields=['status', 'role', 'id'], name='user_details_status_role_idx'),
+            models.Index(fields=['status', 'rank', 'id'], name='user_details_status_rank_idx'),
+            models.Index(fields=['status', 'ship_name', 'id'], name='user_details_status_ship_idx'),
+            models.Index(fields=['status', 'establishment', 'id'], name='user_details_status_estab_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user_login} ({self.name})"
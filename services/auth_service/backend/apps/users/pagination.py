@@ -0,0 +1,83 @@
+"""
+Keyset pagination helpers for user listings.
+
+Pages are addressed by an opaque cursor holding the last ``id`` returned, so
+fetching page N costs the same index range scan as page 1 (no OFFSET). The
+total is an estimate: the planner's row estimate on PostgreSQL, an exact
+count elsewhere, cached per filter combination for ``count_cache_ttl``
+seconds so the listing never runs ``COUNT(*)`` per request.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+from django.core.cache import cache
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidCursor(Exception):
+    """Exception raised when a pagination cursor cannot be decoded."""
+    pass
+
+
+def encode_cursor(last_id):
+    """Encode the last returned id as an opaque cursor."""
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return the id stored in ``cursor``."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        prefix, last_id = base64.urlsafe_b64decode(padded.encode()).decode().split(':', 1)
+        if prefix != 'id':
+            raise ValueError(prefix)
+        return int(last_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+def parse_page_size(value, default, maximum):
+    """Return the requested page size clamped to ``[1, maximum]``."""
+    if value in (None, ''):
+        return default
+    try:
+        return max(1, min(int(value), maximum))
+    except (TypeError, ValueError):
+        return default
+
+
+def estimate_count(queryset, cache_key_prefix, filters, ttl):
+    """Return a cached row estimate for ``queryset``."""
+    digest = hashlib.md5(json.dumps(filters, sort_keys=True).encode(), usedforsecurity=False).hexdigest()
+    cache_key = f"{cache_key_prefix}:{digest}"
+    estimate = cache.get(cache_key)
+    if estimate is not None:
+        return estimate
+
+    estimate = _planner_estimate(queryset)
+    if estimate is None:
+        estimate = queryset.count()
+    cache.set(cache_key, estimate, ttl)
+    return estimate
+
+
+def _planner_estimate(queryset):
+    """Read the planner's row estimate on PostgreSQL; None elsewhere."""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    try:
+        sql, params = queryset.order_by().values('id').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+    except Exception as e:
+        logger.warning(f"Row estimate failed, falling back to COUNT: {str(e)}")
+        return None
@@ -0,0 +1,48 @@
+"""
+Prometheus text exposition for the metrics endpoint.
+
+Nested metric dicts are flattened into gauges named after their path, e.g.
+``{'system': {'latest': {'cpu_percent': 3.5}}}`` becomes
+``auth_service_system_latest_cpu_percent 3.5``. Booleans are exported as
+0/1 and strings as an ``_info`` gauge with a ``value`` label.
+"""
+
+import re
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_invalid_name_chars = re.compile(r'[^a-zA-Z0-9_]')
+
+
+def metric_name(*parts):
+    """Join path parts into a valid Prometheus metric name."""
+    return _invalid_name_chars.sub('_', '_'.join(str(part) for part in parts)).lower()
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def render(metrics, prefix='auth_service'):
+    """Render a nested dict of metrics as Prometheus text."""
+    lines = []
+    _flatten(metrics, [prefix], lines)
+    return '\n'.join(lines) + '\n'
+
+
+def _flatten(value, path, lines):
+    if isinstance(value, dict):
+        for key, child in value.items():
+            _flatten(child, path + [key], lines)
+        return
+
+    name = metric_name(*path)
+    if isinstance(value, bool):
+        lines.append(f'# TYPE {name} gauge')
+        lines.append(f'{name} {int(value)}')
+    elif isinstance(value, (int, float)):
+        lines.append(f'# TYPE {name} gauge')
+        lines.append(f'{name} {value}')
+    elif isinstance(value, str):
+        lines.append(f'# TYPE {name}_info gauge')
+        lines.append(f'{name}_info{{value="{escape_label(value)}"}} 1')
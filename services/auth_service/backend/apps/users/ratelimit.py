@@ -0,0 +1,215 @@
+"""
+Sliding-window rate limiter for sensitive endpoints.
+
+Each policy allows ``limit`` requests per ``window`` seconds per client IP,
+estimated with a sliding window counter: the current fixed window's count
+plus the previous window's count weighted by how much of it still overlaps
+the sliding window. On Redis the check and the increment run in one Lua
+script (one round trip, atomic across gunicorn workers). On the local
+memory cache the same algorithm runs in process, so limits are enforced per
+worker and are approximate across workers.
+
+Policies with ``refund_success`` give the slot back when the response is
+successful, so only failed attempts count (used for login).
+"""
+
+import math
+import threading
+import time
+import logging
+from collections import namedtuple
+from django.conf import settings
+from django.core.cache import cache
+from .redis_client import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+RateLimitPolicy = namedtuple(
+    'RateLimitPolicy', ['name', 'path', 'limit', 'window', 'methods', 'refund_success']
+)
+RateLimitResult = namedtuple(
+    'RateLimitResult', ['policy', 'identity', 'window_index', 'allowed', 'remaining', 'retry_after']
+)
+
+DEFAULT_POLICIES = {
+    'login': {'path': '/api/v1/auth/login/', 'limit': 5, 'window': 900, 'refund_success': True},
+    'signup': {'path': '/api/v1/auth/signup/', 'limit': 3, 'window': 3600},
+}
+
+# KEYS[1] current window, KEYS[2] previous window
+# ARGV[1] limit, ARGV[2] window seconds, ARGV[3] elapsed fraction of the current window
+SLIDING_WINDOW_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local estimated = previous * (1 - tonumber(ARGV[3])) + current
+if estimated + 1 > tonumber(ARGV[1]) then
+    return {0, 0}
+end
+current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]) * 2)
+end
+return {1, math.floor(tonumber(ARGV[1]) - estimated - 1)}
+"""
+
+REFUND_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+if current > 0 then
+    return redis.call('DECR', KEYS[1])
+end
+return 0
+"""
+
+
+def load_policies(configured):
+    """Build RateLimitPolicy objects from the ``policies`` setting."""
+    policies = []
+    for name, options in configured.items():
+        policies.append(RateLimitPolicy(
+            name=name,
+            path=options['path'],
+            limit=options['limit'],
+            window=options['window'],
+            methods=tuple(options.get('methods', ('POST',))),
+            refund_success=options.get('refund_success', False),
+        ))
+    return policies
+
+
+class RateLimiter:
+    """
+    Per-route sliding-window limiter backed by Redis or process memory.
+    """
+
+    def __init__(self, policies, key_prefix='ratelimit'):
+        self.policies = policies
+        self.key_prefix = key_prefix
+        self._lock = threading.Lock()
+        self._windows = {}
+        self._checks = 0
+        self._sliding_window = None
+        self._refund = None
+        self._stats = {
+            policy.name: {'allowed': 0, 'rejected': 0, 'refunded': 0} for policy in policies
+        }
+
+    def match(self, path, method):
+        """Return the policy covering ``path``/``method``, or None."""
+        for policy in self.policies:
+            if path.startswith(policy.path) and method in policy.methods:
+                return policy
+        return None
+
+    def hit(self, policy, identity):
+        """Count a request for ``identity`` and return a RateLimitResult."""
+        now = time.time()
+        window_index, elapsed = divmod(now, policy.window)
+        window_index = int(window_index)
+        fraction = elapsed / policy.window
+        retry_after = max(1, math.ceil(policy.window - elapsed))
+
+        redis_client = get_redis_connection()
+        allowed = remaining = None
+        if redis_client is not None:
+            try:
+                allowed, remaining = self._script(redis_client, 'sliding_window')(
+                    keys=[
+                        self._key(policy, identity, window_index),
+                        self._key(policy, identity, window_index - 1),
+                    ],
+                    args=[policy.limit, policy.window, fraction],
+                )
+            except Exception as e:
+                logger.warning(f"Redis rate limit check failed, using local counters: {str(e)}")
+                allowed = None
+        if allowed is None:
+            allowed, remaining = self._hit_local(policy, identity, window_index, fraction)
+
+        with self._lock:
+            self._stats[policy.name]['allowed' if allowed else 'rejected'] += 1
+        return RateLimitResult(
+            policy, identity, window_index, bool(allowed), max(int(remaining), 0), retry_after
+        )
+
+    def refund(self, result):
+        """Give back the slot taken by an allowed request."""
+        redis_client = get_redis_connection()
+        refunded = False
+        if redis_client is not None:
+            try:
+                self._script(redis_client, 'refund')(
+                    keys=[self._key(result.policy, result.identity, result.window_index)]
+                )
+                refunded = True
+            except Exception as e:
+                logger.warning(f"Redis rate limit refund failed: {str(e)}")
+        if not refunded:
+            with self._lock:
+                window = self._windows.get((result.policy.name, result.identity))
+                if window and window[0] == result.window_index and window[1] > 0:
+                    window[1] -= 1
+        with self._lock:
+            self._stats[result.policy.name]['refunded'] += 1
+
+    def stats(self):
+        """Return per-policy allowed/rejected/refunded counters."""
+        with self._lock:
+            stats = {name: dict(counters) for name, counters in self._stats.items()}
+        stats['backend'] = 'redis' if get_redis_connection() is not None else 'local'
+        return stats
+
+    def reset(self):
+        """Forget in-process windows and counters."""
+        with self._lock:
+            self._windows.clear()
+            for counters in self._stats.values():
+                for name in counters:
+                    counters[name] = 0
+
+    def _hit_local(self, policy, identity, window_index, fraction):
+        """In-process sliding window counter; returns (allowed, remaining)."""
+        bucket = (policy.name, identity)
+        with self._lock:
+            self._checks += 1
+            if self._checks % 1000 == 0:
+                self._prune()
+            # [window index, current count, previous count, window seconds]
+            window = self._windows.get(bucket)
+            if window is None or window[0] < window_index - 1:
+                window = [window_index, 0, 0, policy.window]
+            elif window[0] == window_index - 1:
+                window = [window_index, 0, window[1], policy.window]
+            self._windows[bucket] = window
+
+            estimated = window[2] * (1 - fraction) + window[1]
+            if estimated + 1 > policy.limit:
+                return False, 0
+            window[1] += 1
+            return True, math.floor(policy.limit - estimated - 1)
+
+    def _prune(self):
+        """Drop local windows that no longer affect any estimate."""
+        now = time.time()
+        self._windows = {
+            bucket: window for bucket, window in self._windows.items()
+            if window[0] >= int(now // window[3]) - 1
+        }
+
+    def _key(self, policy, identity, window_index):
+        return cache.make_key(f"{self.key_prefix}:{policy.name}:{identity}:{window_index}")
+
+    def _script(self, redis_client, name):
+        """Return a registered Lua script (EVALSHA with EVAL fallback)."""
+        if name == 'sliding_window':
+            if self._sliding_window is None:
+                self._sliding_window = redis_client.register_script(SLIDING_WINDOW_SCRIPT)
+            return self._sliding_window
+        if self._refund is None:
+            self._refund = redis_client.register_script(REFUND_SCRIPT)
+        return self._refund
+
+
+rate_limiter = RateLimiter(
+    load_policies(getattr(settings, 'RATE_LIMIT_SETTINGS', {}).get('policies', DEFAULT_POLICIES)),
+    key_prefix=getattr(settings, 'RATE_LIMIT_SETTINGS', {}).get('key_prefix', 'ratelimit'),
+)
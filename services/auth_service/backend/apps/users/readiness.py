@@ -0,0 +1,151 @@
+"""
+Cached, concurrent readiness checks.
+
+``ReadinessView`` used to build a ``MigrationExecutor`` and load the whole
+migration graph from disk on every Kubernetes probe. Migration status is now
+determined once per worker and kept while it is "applied"; a ``post_migrate``
+signal (or ``refresh_migrations()``) recomputes it. While migrations are
+pending it is re-evaluated on every check, so a pod becomes ready as soon as
+an init job finishes migrating.
+
+The database (``SELECT 1`` on the check thread's persistent connection) and
+the cache are checked concurrently on a long-lived thread pool, each bounded
+by ``check_timeout``. A check that is still running from an earlier probe is
+awaited rather than resubmitted, so a hung dependency cannot pile up
+threads. Results are reused for ``cache_ttl`` seconds.
+"""
+
+import os
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+from common_metrics.db_pool import release_connection
+
+logger = logging.getLogger(__name__)
+
+
+class ReadinessChecker:
+    """
+    Dependency checks for the readiness probe with a short result cache.
+    """
+
+    CHECKS = ('database', 'cache', 'migrations')
+
+    def __init__(self, cache_ttl=2.0, check_timeout=0.5, cache_key='readiness:probe'):
+        self.cache_ttl = cache_ttl
+        self.check_timeout = check_timeout
+        self.cache_key = cache_key
+        self._lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+        self._pending = {}
+        self._result = None
+        self._checked_at = 0.0
+        self._migrations_applied = False
+        self._stats = {'probes': 0, 'cached': 0, 'checks_run': 0, 'timeouts': 0}
+
+    def check(self):
+        """Return ``{check: bool}``, reusing a result younger than ``cache_ttl``."""
+        with self._lock:
+            self._stats['probes'] += 1
+            if self._result is not None and time.monotonic() - self._checked_at < self.cache_ttl:
+                self._stats['cached'] += 1
+                return dict(self._result)
+
+            executor = self._get_executor()
+            futures = {}
+            for name in self.CHECKS:
+                future = self._pending.get(name)
+                if future is None or future.done():
+                    future = self._pending[name] = executor.submit(
+                        getattr(self, f'_check_{name}')
+                    )
+                futures[name] = future
+
+            deadline = time.monotonic() + self.check_timeout
+            result = {}
+            for name, future in futures.items():
+                try:
+                    result[name] = future.result(timeout=max(deadline - time.monotonic(), 0))
+                except TimeoutError:
+                    self._stats['timeouts'] += 1
+                    logger.warning(f"Readiness check {name} timed out after {self.check_timeout}s")
+                    result[name] = False
+                except Exception as e:
+                    logger.warning(f"Readiness check {name} failed: {str(e)}")
+                    result[name] = False
+
+            self._stats['checks_run'] += 1
+            self._result = result
+            self._checked_at = time.monotonic()
+            return dict(result)
+
+    def refresh_migrations(self):
+        """Forget the migration status so the next check recomputes it."""
+        with self._lock:
+            self._migrations_applied = False
+            self._result = None
+        logger.info("Readiness migration status will be recomputed")
+
+    def stats(self):
+        """Return probe counters and the last result."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['last_result'] = dict(self._result) if self._result is not None else None
+            stats['migrations_applied'] = self._migrations_applied
+        return stats
+
+    def _check_database(self):
+        connection.close_if_unusable_or_obsolete()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except Exception:
+            # Reconnect on the next probe instead of reusing a broken connection
+            connection.close()
+            raise
+        release_connection(connection)
+        return True
+
+    def _check_cache(self):
+        cache.set(self.cache_key, 1, 30)
+        return cache.get(self.cache_key) == 1
+
+    def _check_migrations(self):
+        if self._migrations_applied:
+            return True
+        executor = MigrationExecutor(connection)
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        self._migrations_applied = len(plan) == 0
+        if plan:
+            logger.warning(f"Readiness: {len(plan)} unapplied migrations")
+        return self._migrations_applied
+
+    def _get_executor(self):
+        """Create the thread pool lazily, once per process (after fork)."""
+        pid = os.getpid()
+        if self._executor is None or self._executor_pid != pid:
+            self._executor = ThreadPoolExecutor(
+                max_workers=len(self.CHECKS), thread_name_prefix='readiness'
+            )
+            self._executor_pid = pid
+            self._pending = {}
+        return self._executor
+
+
+readiness_checker = ReadinessChecker(
+    cache_ttl=getattr(settings, 'READINESS_SETTINGS', {}).get('cache_ttl', 2.0),
+    check_timeout=getattr(settings, 'READINESS_SETTINGS', {}).get('check_timeout', 0.5),
+)
+
+
+@receiver(post_migrate)
+def refresh_readiness_migrations(sender, **kwargs):
+    readiness_checker.refresh_migrations()
@@ -0,0 +1,20 @@
+"""
+Access to the raw Redis client behind the default cache.
+
+Some components need Redis primitives (pipelines, SETBIT, Lua scripts) that
+the Django cache API does not expose. They fall back to in-process
+structures when the service runs on the local memory cache.
+"""
+
+from django.conf import settings
+
+
+def get_redis_connection():
+    """Return the redis client used by the default cache, or None."""
+    if getattr(settings, 'USE_MEMORY_CACHE', False):
+        return None
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    if not backend.startswith('django_redis'):
+        return None
+    from django_redis import get_redis_connection as django_redis_connection
+    return django_redis_connection('default')
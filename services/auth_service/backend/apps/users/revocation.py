@@ -0,0 +1,280 @@
+"""
+Token revocation store for logout and refresh rotation.
+
+Revoked refresh token jtis are kept with a TTL equal to the token's remaining
+lifetime, in Redis when the default cache is Redis and in an in-process
+structure otherwise (``USE_MEMORY_CACHE`` or no Redis available). The
+PostgreSQL blacklist tables are no longer consulted on the request path;
+they are written asynchronously by the token journal for auditing.
+
+A bloom filter answers the common "not revoked" case without a network hop.
+Filters are bucketed by token expiry so each one can be dropped once every
+token it describes has expired. In Redis mode each worker keeps a local copy
+of the shared filters and re-reads them when the shared revocation version
+changes, checked at most every ``sync_interval`` seconds. A token revoked on
+another worker can therefore still pass for up to ``sync_interval`` seconds.
+
+Tokens blacklisted before the store existed are only in the blacklist
+tables. ``manage.py backfill_revocations`` loads them and marks the shared
+store as backfilled; until that marker is seen, ``RevocableRefreshToken``
+also checks the tables. The in-process structure is not shared between
+workers, so without Redis ``RevocableRefreshToken`` uses the tables
+directly (``is_shared``).
+"""
+
+import hashlib
+import threading
+import time
+import logging
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings
+from .redis_client import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Fixed-size bloom filter using Redis bit ordering (SETBIT/GETBIT).
+    """
+
+    def __init__(self, num_bits, num_hashes):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bytearray((num_bits + 7) // 8)
+
+    def positions(self, item):
+        """Return the bit offsets for ``item`` (double hashing)."""
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, item):
+        for position in self.positions(item):
+            self.bits[position >> 3] |= 0x80 >> (position & 7)
+
+    def __contains__(self, item):
+        return all(
+            self.bits[position >> 3] & (0x80 >> (position & 7))
+            for position in self.positions(item)
+        )
+
+    def merge(self, data):
+        """OR a serialized bitmap (possibly shorter) into this filter."""
+        size = len(self.bits)
+        other = bytes(data[:size]).ljust(size, b'\x00')
+        merged = int.from_bytes(self.bits, 'big') | int.from_bytes(other, 'big')
+        self.bits[:] = merged.to_bytes(size, 'big')
+
+
+class RevocationStore:
+    """
+    Revoked-jti set with a bloom-filter fast path.
+    """
+
+    def __init__(self, key_prefix='revocation', bloom_filter=True, bloom_bits=2 ** 18,
+                 bloom_hashes=7, bucket_seconds=86400, sync_interval=1.0):
+        self.key_prefix = key_prefix
+        self.bloom_filter = bloom_filter
+        self.bloom_bits = bloom_bits
+        self.bloom_hashes = bloom_hashes
+        self.bucket_seconds = bucket_seconds
+        self.sync_interval = sync_interval
+        self._lock = threading.Lock()
+        self._revoked = {}
+        self._blooms = {}
+        self._synced_version = None
+        self._synced = False
+        self._next_sync = 0.0
+        self._backfilled = False
+        self._next_backfill_check = 0.0
+        self._stats = {'revoked': 0, 'checks': 0, 'fast_negatives': 0, 'hits': 0, 'syncs': 0}
+
+    def revoke(self, jti, expires_at):
+        """Mark ``jti`` revoked until ``expires_at`` (epoch seconds)."""
+        if self._revoke([(jti, expires_at)]):
+            logger.info(f"Token {jti} revoked")
+
+    def backfill(self, entries):
+        """
+        Revoke every ``(jti, expires_at)`` of ``entries`` and mark the store
+        as backfilled; return the number of unexpired tokens revoked.
+        """
+        count = self._revoke(entries)
+        redis_client = get_redis_connection()
+        if redis_client is not None:
+            redis_client.set(self._key('backfilled'), 1)
+        with self._lock:
+            self._backfilled = True
+        logger.info(f"Revocation store backfilled with {count} tokens")
+        return count
+
+    def is_shared(self):
+        """Return True if revocations are seen by every worker (Redis)."""
+        return get_redis_connection() is not None
+
+    def is_backfilled(self):
+        """Return True once ``backfill`` has loaded the blacklist tables into the shared store."""
+        redis_client = get_redis_connection()
+        if redis_client is None:
+            return self._backfilled
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_backfill_check:
+                return self._backfilled
+            self._next_backfill_check = now + self.sync_interval
+        try:
+            backfilled = bool(redis_client.exists(self._key('backfilled')))
+        except Exception as e:
+            logger.warning(f"Revocation backfill marker unavailable: {str(e)}")
+            backfilled = False
+        with self._lock:
+            self._backfilled = backfilled
+        return backfilled
+
+    def is_revoked(self, jti, expires_at):
+        """Return True if ``jti`` has been revoked."""
+        with self._lock:
+            self._stats['checks'] += 1
+        redis_client = get_redis_connection()
+        bucket = self._bucket(expires_at)
+
+        if self.bloom_filter and (redis_client is None or self._sync(redis_client)):
+            with self._lock:
+                if jti not in self._local_bloom(bucket):
+                    self._stats['fast_negatives'] += 1
+                    return False
+
+        if redis_client is not None:
+            revoked = bool(redis_client.exists(self._key(f'jti:{jti}')))
+        else:
+            with self._lock:
+                revoked = self._revoked.get(jti, 0) > time.time()
+        if revoked:
+            with self._lock:
+                self._stats['hits'] += 1
+        return revoked
+
+    def stats(self):
+        """Return revocation counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['local_entries'] = len(self._revoked)
+            stats['bloom_buckets'] = len(self._blooms)
+            stats['backfilled'] = self._backfilled
+        stats['backend'] = 'redis' if get_redis_connection() is not None else 'memory'
+        return stats
+
+    def clear(self):
+        """Forget all local state (revocations and bloom filters)."""
+        with self._lock:
+            self._revoked.clear()
+            self._blooms.clear()
+            self._synced_version = None
+            self._synced = False
+            self._next_sync = 0.0
+            self._backfilled = False
+            self._next_backfill_check = 0.0
+
+    def _revoke(self, entries):
+        """Revoke the unexpired ``(jti, expires_at)`` pairs; return how many."""
+        now = time.time()
+        entries = [(jti, expires_at) for jti, expires_at in entries if expires_at > now]
+        if not entries:
+            return 0
+        redis_client = get_redis_connection()
+        if redis_client is not None:
+            pipe = redis_client.pipeline()
+            for jti, expires_at in entries:
+                bucket = self._bucket(expires_at)
+                bloom_key = self._key(f'bloom:{bucket}')
+                pipe.set(self._key(f'jti:{jti}'), 1, ex=max(int(expires_at - now), 1))
+                for position in BloomFilter(self.bloom_bits, self.bloom_hashes).positions(jti):
+                    pipe.setbit(bloom_key, position, 1)
+                pipe.expireat(bloom_key, int(self._bucket_end(bucket)) + 60)
+            pipe.incr(self._key('version'))
+            pipe.execute()
+
+        with self._lock:
+            for jti, expires_at in entries:
+                if redis_client is None:
+                    self._revoked[jti] = expires_at
+                self._local_bloom(self._bucket(expires_at)).add(jti)
+                self._stats['revoked'] += 1
+                if self._stats['revoked'] % 1000 == 0:
+                    self._prune(now)
+        return len(entries)
+
+    def _sync(self, redis_client):
+        """
+        Refresh local bloom filters if the shared version changed.
+
+        Returns False when the local filters cannot be trusted (the last
+        sync failed), in which case callers must take the slow path.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_sync:
+                return self._synced
+            self._next_sync = now + self.sync_interval
+        try:
+            version = redis_client.get(self._key('version'))
+            if self._synced and version == self._synced_version:
+                return True
+            buckets = self._active_buckets()
+            bitmaps = redis_client.mget([self._key(f'bloom:{bucket}') for bucket in buckets])
+        except Exception as e:
+            logger.warning(f"Revocation filter sync failed: {str(e)}")
+            self._synced = False
+            return False
+
+        with self._lock:
+            active = set(buckets)
+            for bucket in list(self._blooms):
+                if bucket not in active:
+                    del self._blooms[bucket]
+            for bucket, data in zip(buckets, bitmaps):
+                if data:
+                    self._local_bloom(bucket).merge(data)
+            self._synced_version = version
+            self._synced = True
+            self._stats['syncs'] += 1
+        return True
+
+    def _local_bloom(self, bucket):
+        bloom = self._blooms.get(bucket)
+        if bloom is None:
+            bloom = self._blooms[bucket] = BloomFilter(self.bloom_bits, self.bloom_hashes)
+        return bloom
+
+    def _prune(self, now):
+        """Drop expired in-process revocations and bloom buckets."""
+        self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+        for bucket in list(self._blooms):
+            if self._bucket_end(bucket) <= now:
+                del self._blooms[bucket]
+
+    def _active_buckets(self):
+        now = time.time()
+        lifetime = api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()
+        return list(range(self._bucket(now), self._bucket(now + lifetime) + 1))
+
+    def _bucket(self, expires_at):
+        return int(expires_at // self.bucket_seconds)
+
+    def _bucket_end(self, bucket):
+        return (bucket + 1) * self.bucket_seconds
+
+    def _key(self, suffix):
+        return cache.make_key(f"{self.key_prefix}:{suffix}")
+
+
+revocation_store = RevocationStore(
+    bloom_filter=getattr(settings, 'TOKEN_REVOCATION_SETTINGS', {}).get('bloom_filter', True),
+    bloom_bits=getattr(settings, 'TOKEN_REVOCATION_SETTINGS', {}).get('bloom_bits', 2 ** 18),
+    bloom_hashes=getattr(settings, 'TOKEN_REVOCATION_SETTINGS', {}).get('bloom_hashes', 7),
+    bucket_seconds=getattr(settings, 'TOKEN_REVOCATION_SETTINGS', {}).get('bucket_seconds', 86400),
+    sync_interval=getattr(settings, 'TOKEN_REVOCATION_SETTINGS', {}).get('sync_interval', 1.0),
+)
@@ -10,11 +10,16 @@ from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 import logging
 
 from .models import HomePageInformation, Feedback, UserDetails, RoleMaster
+from .tokens import RevocableRefreshToken
+from .feedback_analytics import record_feedback
+from .hashing import password_hashing_pool
 
 logger = logging.getLogger(__name__)
 
@@ -526,9 +531,11 @@ class SignUpSerializer(serializers.Serializer):
 
     
     def create(self, validated_data):
+            """Create the user; raises HashingPoolSaturated when hashing capacity is exhausted."""
             validated_data.pop('confirm_password')
-            validated_data['password'] = make_password(validated_data['password'])
+            validated_data['password'] = password_hashing_pool.make_password(validated_data['password'])
             validated_data['status'] = '1'
+            validated_data['update_date'] = timezone.now()
             return UserDetails.objects.create(**validated_data)
 
     
@@ -602,8 +609,13 @@ class FeedbackSerializer(serializers.ModelSerializer):
         # Calculate average
         avg = round((q1 + q2 + q3 + q4) / 4, 2)
         validated_data['avg_feedback'] = str(avg)  # Save as string to match model
-        # Save feedback
-        return super().create(validated_data)
+        # Export watermark (and NOT NULL in the table)
+        validated_data.setdefault('modified_datetime', timezone.now())
+        # Save feedback and fold it into the analytics aggregates
+        with transaction.atomic():
+            feedback = super().create(validated_data)
+            record_feedback(feedback)
+        return feedback
 
 
 class RoleMasterSerializer(serializers.ModelSerializer):
@@ -618,4 +630,12 @@ class UserDetailsSerializer(serializers.ModelSerializer):
             "id", "role", "rank", "name", "userlogin", "personal_no",
             "designation", "ship_name", "employee_type", "establishment",
             "nudemail", "phone_no", "sso_user", "H", "L", "E", "X", "mobile_no", "status",
-        ]
\ No newline at end of file
+        ]
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Token refresh serializer that checks and records revocations in the
+    revocation store instead of the blacklist tables.
+    """
+    token_class = RevocableRefreshToken
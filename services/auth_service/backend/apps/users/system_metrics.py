@@ -0,0 +1,132 @@
+"""
+Background sampler for system and database statistics.
+
+``MetricsView`` used to call ``psutil.cpu_percent(interval=1)`` and query
+``pg_stat_activity`` on every scrape, blocking a worker for over a second.
+A daemon thread per worker process now samples CPU, memory, disk and the
+database connection count every ``interval`` seconds into a ring buffer of
+``window`` samples; scrapes only read the buffer.
+"""
+
+import os
+import threading
+import time
+import logging
+from collections import deque
+import psutil
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+logger = logging.getLogger(__name__)
+
+SAMPLED_FIELDS = (
+    'cpu_percent',
+    'memory_percent',
+    'memory_available_mb',
+    'disk_percent',
+    'disk_free_gb',
+    'db_connections',
+)
+
+
+class SystemSampler:
+    """
+    Ring buffer of periodic system samples filled by a daemon thread.
+    """
+
+    def __init__(self, interval=5, window=60, disk_path='/'):
+        self.interval = interval
+        self.window = window
+        self.disk_path = disk_path
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._thread_pid = None
+
+    def snapshot(self):
+        """Return the latest sample and min/avg/max over the buffer."""
+        self._ensure_thread()
+        with self._lock:
+            samples = list(self._samples)
+        if not samples:
+            # First scrape in this worker: cheap inline sample, no DB query
+            samples = [self.sample(include_database=False)]
+
+        summary = {}
+        for field in SAMPLED_FIELDS:
+            values = [sample[field] for sample in samples if sample[field] is not None]
+            if values:
+                summary[field] = {
+                    'min': min(values),
+                    'avg': round(sum(values) / len(values), 2),
+                    'max': max(values),
+                }
+        return {
+            'latest': samples[-1],
+            'window': summary,
+            'samples': len(samples),
+            'interval': self.interval,
+        }
+
+    def sample(self, include_database=True):
+        """Collect one sample (non-blocking CPU reading)."""
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(self.disk_path)
+        return {
+            'timestamp': time.time(),
+            # interval=None compares against the previous call instead of sleeping
+            'cpu_percent': psutil.cpu_percent(interval=None),
+            'memory_percent': memory.percent,
+            'memory_available_mb': memory.available // (1024 * 1024),
+            'disk_percent': disk.percent,
+            'disk_free_gb': disk.free // (1024 * 1024 * 1024),
+            'db_connections': self._db_connections() if include_database else None,
+        }
+
+    def _db_connections(self):
+        """Count connections to this database (PostgreSQL only)."""
+        if connection.vendor != 'postgresql':
+            return None
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("""
+                    SELECT count(*)
+                    FROM pg_stat_activity
+                    WHERE datname = current_database()
+                """)
+                return cursor.fetchone()[0]
+        except Exception as e:
+            logger.warning(f"Sampling database connections failed: {str(e)}")
+            return None
+
+    def _ensure_thread(self):
+        """Start the sampler thread in this process if it is not running."""
+        pid = os.getpid()
+        if self._thread is not None and self._thread_pid == pid and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread_pid == pid and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='system-sampler', daemon=True)
+            self._thread_pid = pid
+            self._thread.start()
+
+    def _run(self):
+        """Sampling loop executed by the background thread."""
+        while True:
+            try:
+                sample = self.sample()
+                with self._lock:
+                    self._samples.append(sample)
+            except Exception as e:
+                logger.error(f"System sampling failed: {str(e)}")
+            finally:
+                close_old_connections()
+            time.sleep(self.interval)
+
+
+system_sampler = SystemSampler(
+    interval=getattr(settings, 'SYSTEM_METRICS_SETTINGS', {}).get('interval', 5),
+    window=getattr(settings, 'SYSTEM_METRICS_SETTINGS', {}).get('window', 60),
+    disk_path=getattr(settings, 'SYSTEM_METRICS_SETTINGS', {}).get('disk_path', '/'),
+)
@@ -0,0 +1,100 @@
+"""
+Tests for the async read views routed when ASYNC_VIEWS is set.
+"""
+
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import path
+from common_auth.async_views import select_view
+from common_auth.principal_cache import principal_cache
+from common_metrics.request_metrics import RequestMetrics
+from apps.users.models import HomePageInformation, RoleMaster
+from apps.users.views import (AsyncHomePageView, AsyncRoleMasterView,
+                              AsyncUserProfileView, UserProfileAPIView)
+from .test_principal_cache import bearer_for, create_user
+
+urlpatterns = [
+    path('profile/', AsyncUserProfileView.as_view(), name='profile'),
+    path('home/', AsyncHomePageView.as_view(), name='home'),
+    path('roles/', AsyncRoleMasterView.as_view(), name='role'),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncViewTests(TestCase):
+    """Test the async views against their synchronous counterparts."""
+
+    def setUp(self):
+        cache.clear()
+        principal_cache.clear()
+        self.user = create_user('asyncuser')
+        self.auth = {'Authorization': bearer_for('asyncuser')}
+        self.metrics = RequestMetrics(prefix='auth_service')
+        patcher = mock.patch('common_metrics.middleware.request_metrics', self.metrics)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_profile(self):
+        """Test the profile is returned in the synchronous view's format."""
+        response = await self.async_client.get('/profile/', headers=self.auth)
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertTrue(body['success'])
+        self.assertEqual(body['data']['userlogin'], 'asyncuser')
+
+    async def test_unauthenticated(self):
+        """Test missing and invalid tokens are rejected like DRF does."""
+        response = await self.async_client.get('/profile/')
+        self.assertEqual(response.status_code, 403)
+
+        response = await self.async_client.get('/profile/', headers={'Authorization': 'Bearer invalid'})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json(), {'detail': 'Invalid token'})
+
+    async def test_other_methods_use_sync_view(self):
+        """Test non-GET requests are handled by the synchronous view."""
+        response = await self.async_client.put(
+            '/profile/', {'name': 'Renamed'}, content_type='application/json', headers=self.auth
+        )
+        self.assertEqual(response.status_code, 200)
+        await self.user.arefresh_from_db()
+        self.assertEqual(self.user.name, 'Renamed')
+
+    async def test_home_etag(self):
+        """Test tab content carries an ETag, and a matching one gets 304."""
+        await HomePageInformation.objects.acreate(
+            header_name='DOWNLOADS', section_name='Manuals', level_name='L1'
+        )
+        response = await self.async_client.get('/home/', {'header_name': 'DOWNLOADS'}, headers=self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['section_name'], 'Manuals')
+        self.assertEqual(response['Cache-Control'], 'private, max-age=60')
+        self.assertIn('Authorization', response['Vary'])
+
+        cached = await self.async_client.get(
+            '/home/', {'header_name': 'DOWNLOADS'},
+            headers={**self.auth, 'If-None-Match': response['ETag']}
+        )
+        self.assertEqual(cached.status_code, 304)
+
+        response = await self.async_client.get('/home/', {'header_name': 'NEWS'}, headers=self.auth)
+        self.assertEqual(response.status_code, 400)
+
+    async def test_roles_and_query_metrics(self):
+        """Test active roles are listed and their queries are counted."""
+        await RoleMaster.objects.acreate(name='Admin', level='1')
+        await RoleMaster.objects.acreate(name='Retired', level='2', status=0)
+
+        response = await self.async_client.get('/roles/', headers=self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([role['name'] for role in response.json()], ['Admin'])
+        self.assertRegex(response['Server-Timing'], r'desc="[1-9]\d* queries"')
+        self.assertEqual(self.metrics.summary()['endpoints']['GET role']['count'], 1)
+
+    def test_select_view(self):
+        """Test ASYNC_VIEWS chooses between the async and synchronous view."""
+        with self.settings(ASYNC_VIEWS=True):
+            self.assertIs(select_view(AsyncUserProfileView).view_class, AsyncUserProfileView)
+        with self.settings(ASYNC_VIEWS=False):
+            self.assertIs(select_view(AsyncUserProfileView).view_class, UserProfileAPIView)
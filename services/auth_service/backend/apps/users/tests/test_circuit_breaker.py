@@ -0,0 +1,99 @@
+"""
+Tests for the in-process circuit breaker.
+"""
+
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase
+from apps.users.circuit_breaker import CircuitBreaker, CircuitBreakerError
+
+
+def failing():
+    raise ValueError('boom')
+
+
+def succeeding():
+    return 'ok'
+
+
+class CircuitBreakerTests(TestCase):
+    """Test tripping, recovery and cross-worker sync."""
+
+    def setUp(self):
+        cache.clear()
+        self.breaker = CircuitBreaker('test', failure_threshold=3, recovery_timeout=10, sync_interval=0)
+
+    def fail(self, breaker, times):
+        for _ in range(times):
+            with self.assertRaises(ValueError):
+                breaker._call_with_circuit_breaker(failing)
+
+    def test_calls_do_not_touch_cache(self):
+        """Test the hot path never reads or writes the shared cache."""
+        with mock.patch('apps.users.circuit_breaker.cache') as shared:
+            self.breaker._call_with_circuit_breaker(succeeding)
+            self.fail(self.breaker, 3)
+        self.assertFalse(shared.method_calls)
+
+    def test_opens_after_threshold(self):
+        """Test the breaker opens and rejects once failures reach the threshold."""
+        self.fail(self.breaker, 3)
+        self.assertEqual(self.breaker.state, 'open')
+        with self.assertRaises(CircuitBreakerError):
+            self.breaker._call_with_circuit_breaker(succeeding)
+        self.assertEqual(self.breaker.stats()['rejected'], 1)
+
+    def test_error_rate_trip(self):
+        """Test the error rate threshold trips with few absolute failures."""
+        breaker = CircuitBreaker('rate', failure_threshold=100, error_rate_threshold=0.5,
+                                 minimum_calls=4, sync_interval=0)
+        breaker._call_with_circuit_breaker(succeeding)
+        self.fail(breaker, 2)
+        self.assertEqual(breaker.state, 'closed')
+        self.fail(breaker, 1)
+        self.assertEqual(breaker.state, 'open')
+
+    def test_failures_expire_from_window(self):
+        """Test failures older than the window no longer count."""
+        with mock.patch('apps.users.circuit_breaker.time.time', return_value=1000.0):
+            self.fail(self.breaker, 2)
+        with mock.patch('apps.users.circuit_breaker.time.time', return_value=1070.0):
+            self.fail(self.breaker, 1)
+        self.assertEqual(self.breaker.state, 'closed')
+
+    def test_half_open_probe_limit(self):
+        """Test only half_open_max_calls probes run after the recovery timeout."""
+        self.fail(self.breaker, 3)
+        self.breaker._opened_at -= 10
+
+        def probe():
+            # A second call while the probe is in flight is rejected
+            with self.assertRaises(CircuitBreakerError):
+                self.breaker._call_with_circuit_breaker(succeeding)
+            return 'ok'
+
+        self.assertEqual(self.breaker._call_with_circuit_breaker(probe), 'ok')
+        self.assertEqual(self.breaker.state, 'closed')
+
+    def test_failed_probe_reopens(self):
+        """Test a failed half-open probe opens the breaker again."""
+        self.fail(self.breaker, 3)
+        self.breaker._opened_at -= 10
+        self.fail(self.breaker, 1)
+        self.assertEqual(self.breaker.state, 'open')
+
+    def test_trip_propagates_through_sync(self):
+        """Test a trip in one worker is adopted by another on sync."""
+        other = CircuitBreaker('test', failure_threshold=3, recovery_timeout=10, sync_interval=0)
+        self.fail(self.breaker, 3)
+
+        self.breaker.sync()
+        other.sync()
+        self.assertEqual(other.state, 'open')
+        with self.assertRaises(CircuitBreakerError):
+            other._call_with_circuit_breaker(succeeding)
+
+    def test_decorator(self):
+        """Test the decorator form still wraps functions."""
+        wrapped = self.breaker(succeeding)
+        self.assertEqual(wrapped(), 'ok')
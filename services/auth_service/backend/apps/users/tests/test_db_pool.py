@@ -0,0 +1,70 @@
+"""
+Tests for connection pool statistics in the metrics endpoint.
+"""
+
+from unittest import mock
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from common_metrics import db_pool
+
+POOL_STATS = {
+    'pool_min': 2, 'pool_max': 10, 'pool_size': 4, 'pool_available': 1,
+    'requests_num': 120, 'requests_queued': 7, 'requests_wait_ms': 35,
+}
+
+
+def pooled_default():
+    """Patch the default alias to look like a pooled PostgreSQL connection."""
+    pool = mock.Mock()
+    pool.get_stats.return_value = POOL_STATS
+    return mock.patch.multiple(
+        db_pool,
+        is_pooled=mock.Mock(side_effect=lambda alias: alias == 'default'),
+        connections={'default': mock.Mock(pool=pool)},
+    )
+
+
+class PoolStatsTests(SimpleTestCase):
+    """Test pool statistics collection and rendering."""
+
+    def test_no_pool_configured(self):
+        """Test aliases without a pool are skipped."""
+        self.assertEqual(db_pool.pool_stats(), {})
+        self.assertEqual(db_pool.render_prometheus('auth_service'), '')
+
+    def test_stats_renamed_with_defaults(self):
+        """Test psycopg_pool counters are renamed and missing ones are 0."""
+        with pooled_default():
+            stats = db_pool.pool_stats()['default']
+        self.assertEqual(stats['size'], 4)
+        self.assertEqual(stats['requests_queued'], 7)
+        self.assertEqual(stats['connections_lost'], 0)
+
+    def test_prometheus(self):
+        """Test gauges and counters are labelled with the alias."""
+        with pooled_default():
+            body = db_pool.render_prometheus('master_svc')
+        self.assertIn('# TYPE master_svc_db_pool_available gauge', body)
+        self.assertIn('master_svc_db_pool_available{database="default"} 1', body)
+        self.assertIn('master_svc_db_pool_requests_total{database="default"} 120', body)
+
+    def test_release_keeps_persistent_connection(self):
+        """Test only pooled connections are closed by release_connection."""
+        with mock.patch.object(connection, 'close') as close:
+            db_pool.release_connection(connection)
+            close.assert_not_called()
+            with mock.patch.object(db_pool, 'is_pooled', return_value=True):
+                db_pool.release_connection(connection)
+            close.assert_called_once()
+
+
+class PoolMetricsEndpointTests(TestCase):
+    """Test pool statistics in /metrics/."""
+
+    def test_metrics_include_pool(self):
+        """Test the metrics endpoint exports the pool of each alias."""
+        with pooled_default():
+            response = self.client.get('/metrics/', {'format': 'json'})
+            self.assertEqual(response.json()['database']['pool']['default']['waiting'], 0)
+            body = self.client.get('/metrics/').content.decode()
+        self.assertIn('auth_service_database_pool_default_size 4', body)
@@ -0,0 +1,123 @@
+"""
+Tests for streaming NDJSON/CSV exports.
+"""
+
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timedelta
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from common_auth.principal_cache import principal_cache
+from apps.users.models import Feedback, UserDetails
+from apps.users.tests.test_principal_cache import bearer_for, create_user
+
+
+def read_stream(response):
+    body = b''.join(response.streaming_content)
+    if response.get('Content-Encoding') == 'gzip':
+        body = gzip.decompress(body)
+    return body.decode()
+
+
+class ExportTests(APITestCase):
+    """Test streaming exports on the user and feedback listings."""
+
+    users_url = '/api/v1/auth/users/manage/'
+    feedback_url = '/api/v1/auth/feedback/'
+
+    def setUp(self):
+        cache.clear()
+        principal_cache.clear()
+        create_user('admin')
+        for i in range(3):
+            create_user(f'user{i}')
+        self.client.credentials(HTTP_AUTHORIZATION=bearer_for('admin'))
+
+    def test_ndjson_export(self):
+        """Test users are streamed one JSON object per line."""
+        response = self.client.get(self.users_url, {'export': 'ndjson'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        rows = [json.loads(line) for line in read_stream(response).splitlines()]
+        self.assertEqual([row['user_login'] for row in rows], ['admin', 'user0', 'user1', 'user2'])
+        self.assertNotIn('password', rows[0])
+
+    def test_csv_export_with_gzip(self):
+        """Test CSV exports are compressed when the client accepts gzip."""
+        response = self.client.get(self.users_url, {'export': 'csv'}, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+        rows = list(csv.DictReader(io.StringIO(read_stream(response))))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[1]['ship'], 'INS Test')
+
+    def test_since_watermark(self):
+        """Test since returns only rows changed after the watermark."""
+        watermark = timezone.now()
+        UserDetails.objects.filter(userlogin='user1').update(update_date=watermark + timedelta(seconds=1))
+        UserDetails.objects.filter(userlogin='user2').update(update_date=watermark - timedelta(days=1))
+
+        response = self.client.get(self.users_url, {'export': 'ndjson', 'since': watermark.isoformat()})
+        rows = [json.loads(line) for line in read_stream(response).splitlines()]
+        self.assertEqual([row['user_login'] for row in rows], ['user1'])
+        self.assertIn('X-Export-Watermark', response)
+
+    def test_since_includes_updates_and_deletes(self):
+        """Test profile edits, admin edits and soft deletes reach the next incremental pull."""
+        UserDetails.objects.update(update_date=timezone.now() - timedelta(days=1))
+        watermark = timezone.now().isoformat()
+        user0 = UserDetails.objects.get(userlogin='user0')
+        user1 = UserDetails.objects.get(userlogin='user1')
+        self.client.put(self.users_url, {'id': user0.id, 'rank': 'Cdr'}, format='json')
+        self.client.delete(self.users_url, {'id': user1.id}, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION=bearer_for('user2'))
+        self.client.put('/api/v1/auth/profile/', {'name': 'Renamed'}, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION=bearer_for('admin'))
+
+        response = self.client.get(self.users_url, {'export': 'ndjson', 'since': watermark})
+        rows = [json.loads(line) for line in read_stream(response).splitlines()]
+        self.assertEqual(
+            [(row['user_login'], row['status']) for row in rows],
+            [('user0', '1'), ('user1', '0'), ('user2', '1')]
+        )
+        response = self.client.get(self.users_url, {'export': 'ndjson'})
+        self.assertNotIn('user1', read_stream(response))
+
+    def test_watermark_covers_late_commits(self):
+        """Test a row stamped before the export but committed after it reaches the next pull."""
+        UserDetails.objects.update(update_date=timezone.now() - timedelta(days=1))
+        started = timezone.now()
+        response = self.client.get(self.users_url, {'export': 'ndjson', 'since': started.isoformat()})
+        watermark = response['X-Export-Watermark']
+        self.assertLess(datetime.fromisoformat(watermark), started - timedelta(seconds=299))
+
+        # Stamped by its transaction before the export, committed after it
+        UserDetails.objects.filter(userlogin='user0').update(update_date=started - timedelta(seconds=1))
+        response = self.client.get(self.users_url, {'export': 'ndjson', 'since': watermark})
+        rows = [json.loads(line) for line in read_stream(response).splitlines()]
+        self.assertEqual([row['user_login'] for row in rows], ['user0'])
+
+    def test_feedback_export(self):
+        """Test feedback rows can be pulled incrementally."""
+        Feedback.objects.create(module='home', username='a', modified_datetime=timezone.now() - timedelta(days=2))
+        new = Feedback.objects.create(module='home', username='b', modified_datetime=timezone.now())
+
+        response = self.client.get(self.feedback_url, {
+            'export': 'ndjson', 'since': (timezone.now() - timedelta(days=1)).isoformat()
+        })
+        rows = [json.loads(line) for line in read_stream(response).splitlines()]
+        self.assertEqual([row['id'] for row in rows], [new.id])
+
+    def test_invalid_export_request(self):
+        """Test unknown formats and bad watermarks are rejected."""
+        response = self.client.get(self.users_url, {'export': 'xml'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(self.users_url, {'export': 'csv', 'since': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors']['code'], 'invalid_export')
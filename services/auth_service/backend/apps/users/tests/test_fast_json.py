@@ -0,0 +1,119 @@
+"""
+Tests for the orjson renderer/parser and values-based list serialization (common_api).
+"""
+
+import io
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from common_api.parsers import ORJSONParser
+from common_api.renderers import ORJSONRenderer
+from common_api.serializers import list_data, values_serializer
+from apps.users.models import Feedback
+from apps.users.serializers import FeedbackSerializer
+from .test_principal_cache import bearer_for, create_user
+
+FAST_REST_FRAMEWORK = {
+    **settings.REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': ['common_api.renderers.ORJSONRenderer'],
+    'DEFAULT_PARSER_CLASSES': ['common_api.parsers.ORJSONParser'],
+}
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    """Test ORJSONRenderer produces JSONRenderer's output."""
+
+    def test_same_bytes_as_json_renderer(self):
+        """Test types handled by DRF's encoder render identically."""
+        data = {
+            'when': datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+            'day': datetime(2025, 1, 2).date(),
+            'amount': Decimal('12.50'),
+            'uuid': uuid.UUID(int=1),
+            'label': gettext_lazy('Users'),
+            'text': 'Ünïcode\u2028line',
+            'rows': [{'id': 1, 'flag': True, 'none': None}],
+            1: 'int key',
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indent_uses_json_renderer(self):
+        """Test an indented response is rendered by JSONRenderer."""
+        rendered = ORJSONRenderer().render({'a': [1]}, 'application/json; indent=2')
+        self.assertEqual(rendered, b'{\n  "a": [\n    1\n  ]\n}')
+
+    def test_none_renders_empty(self):
+        """Test None renders an empty body."""
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+
+class ORJSONParserTests(SimpleTestCase):
+    """Test ORJSONParser."""
+
+    def test_parse(self):
+        """Test UTF-8 and other declared encodings are parsed."""
+        parser = ORJSONParser()
+        self.assertEqual(parser.parse(io.BytesIO('{"name": "Ünïcode"}'.encode())), {'name': 'Ünïcode'})
+        stream = io.BytesIO('{"name": "Ünïcode"}'.encode('latin-1'))
+        self.assertEqual(parser.parse(stream, parser_context={'encoding': 'latin-1'}), {'name': 'Ünïcode'})
+
+    def test_invalid_json(self):
+        """Test invalid bodies raise ParseError like JSONParser."""
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"name": '))
+
+
+class ValuesSerializerTests(APITestCase):
+    """Test list_data builds the rows of the ModelSerializer from values_list()."""
+
+    def setUp(self):
+        for index in range(3):
+            Feedback.objects.create(
+                module='Training', username=f'user{index}', personal_no=f'P{index}',
+                question1='4', question2='5', question3=None, question4='3', avg_feedback='4.0',
+                modified_datetime=datetime(2025, 1, index + 1, tzinfo=timezone.utc),
+            )
+
+    def test_rows_match_serializer(self):
+        """Test values rows equal the serializer's rows."""
+        queryset = Feedback.objects.order_by('id')
+        with override_settings(FAST_JSON=True):
+            rows = list_data(FeedbackSerializer, queryset)
+        self.assertEqual(rows, FeedbackSerializer(queryset, many=True).data)
+
+    def test_computed_fields_fall_back(self):
+        """Test serializers with non-column fields use the serializer."""
+        class ComputedSerializer(FeedbackSerializer):
+            score = serializers.SerializerMethodField()
+
+            class Meta(FeedbackSerializer.Meta):
+                fields = FeedbackSerializer.Meta.fields + ['score']
+
+            def get_score(self, feedback):
+                return feedback.avg_feedback
+
+        self.assertIsNone(values_serializer(ComputedSerializer))
+        with override_settings(FAST_JSON=True):
+            rows = list_data(ComputedSerializer, Feedback.objects.order_by('id'))
+        self.assertEqual(rows[0]['score'], '4.0')
+
+    def test_feedback_endpoint_unchanged(self):
+        """Test GET /feedback/ returns the same body on the fast path."""
+        create_user('reader')
+        self.client.credentials(HTTP_AUTHORIZATION=bearer_for('reader'))
+        expected = self.client.get('/api/v1/auth/feedback/')
+        with override_settings(FAST_JSON=True, REST_FRAMEWORK=FAST_REST_FRAMEWORK):
+            response = self.client.get('/api/v1/auth/feedback/')
+            posted = self.client.post('/api/v1/auth/feedback/', {
+                'module': 'Training', 'username': 'reader', 'question1': '5',
+            }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(posted.status_code, 201)
@@ -0,0 +1,149 @@
+"""
+Tests for the admission-controlled password hashing pool.
+"""
+
+import threading
+from unittest import mock
+from django.contrib.auth.hashers import check_password, make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from apps.users.hashing import HashingPoolSaturated, PasswordHashingPool
+from apps.users.models import UserDetails
+from apps.users.serializers import SignUpSerializer
+from apps.users.tests.test_principal_cache import bearer_for, create_user
+
+
+class PasswordHashingPoolTests(SimpleTestCase):
+    """Test hashing executors and admission control."""
+
+    def test_process_pool_hashes(self):
+        """Test hashes produced in worker processes verify normally."""
+        pool = PasswordHashingPool(executor='process', max_workers=1)
+        encoded = pool.make_password('secret')
+
+        self.assertTrue(check_password('secret', encoded))
+        self.assertTrue(pool.check_password('secret', encoded))
+        self.assertFalse(pool.check_password('wrong', encoded))
+        self.assertEqual(pool.stats()['submitted'], 3)
+
+    def test_rejects_when_saturated(self):
+        """Test requests beyond the in-flight limit are rejected."""
+        pool = PasswordHashingPool(executor='thread', max_workers=1, max_queue=0, retry_after=7)
+        started, release = threading.Event(), threading.Event()
+
+        def slow_hash(password):
+            started.set()
+            release.wait(5)
+            return password
+
+        worker = threading.Thread(target=pool._submit, args=(slow_hash, 'x'))
+        worker.start()
+        started.wait(5)
+        try:
+            with self.assertRaises(HashingPoolSaturated) as ctx:
+                pool.make_password('secret')
+            self.assertEqual(ctx.exception.retry_after, 7)
+        finally:
+            release.set()
+            worker.join()
+
+        self.assertEqual(pool.stats()['rejected'], 1)
+        self.assertTrue(pool.check_password('secret', make_password('secret')))
+
+    def test_timed_out_hash_keeps_slot(self):
+        """Test a timed out hash frees its slot only once it finishes."""
+        pool = PasswordHashingPool(executor='thread', max_workers=1, max_queue=0, timeout=0.05)
+        release, finished = threading.Event(), threading.Event()
+
+        def slow_hash(password):
+            release.wait(5)
+            return password
+
+        with self.assertRaises(HashingPoolSaturated):
+            pool._submit(slow_hash, 'x')
+        with self.assertRaises(HashingPoolSaturated):
+            pool.make_password('secret')
+        self.assertEqual((pool.stats()['timed_out'], pool.stats()['rejected']), (1, 1))
+
+        pool._get_executor().submit(finished.set)
+        release.set()
+        finished.wait(5)
+        self.assertEqual(pool.stats()['in_flight'], 0)
+        pool.timeout = 10
+        self.assertTrue(check_password('secret', pool.make_password('secret')))
+
+
+class SignUpSerializerHashingTests(APITestCase):
+    """Test SignUpSerializer hashes passwords in the pool."""
+
+    def test_create_uses_pool(self):
+        """Test the password is hashed by the pool and saturation propagates."""
+        data = {
+            'name': 'New User', 'designation_email': 'new@example.com', 'password': 'secret',
+            'confirm_password': 'secret', 'userlogin': 'newuser',
+        }
+        with mock.patch(
+            'apps.users.serializers.password_hashing_pool.make_password', return_value='hashed'
+        ) as hash_password:
+            user = SignUpSerializer().create(dict(data))
+        hash_password.assert_called_once_with('secret')
+        self.assertEqual(user.password, 'hashed')
+
+        with mock.patch(
+            'apps.users.serializers.password_hashing_pool.make_password',
+            side_effect=HashingPoolSaturated(2),
+        ):
+            with self.assertRaises(HashingPoolSaturated):
+                SignUpSerializer().create(dict(data, userlogin='other'))
+
+
+class UserManagementHashingTests(APITestCase):
+    """Test admin user creation hashes the password once, in the pool."""
+
+    def setUp(self):
+        cache.clear()
+        create_user('admin')
+        self.client.credentials(HTTP_AUTHORIZATION=bearer_for('admin'))
+
+    def test_create_user(self):
+        """Test POST /users/manage/ returns 201 and stores the pooled hash."""
+        data = {
+            'role': 'user', 'rank': 'Lt', 'name': 'New User', 'personal_no': 'P900',
+            'designation': 'Engineer', 'ship_name': 'INS Test', 'password': 'secret',
+            'confirm_password': 'secret', 'employee_type': 'Permanent', 'establishment': 'HQ',
+            'nudemail': 'new@example.com', 'phone_no': '1234567890', 'sso_user': 'N',
+            'H': 'Y', 'L': 'N', 'E': 'N', 'X': 'N',
+        }
+        with mock.patch(
+            'apps.users.views.password_hashing_pool.make_password', wraps=make_password
+        ) as hash_password:
+            response = self.client.post('/api/v1/auth/users/manage/', data, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        hash_password.assert_called_once_with('secret')
+        profile = UserDetails.objects.get(userlogin='P900')
+        self.assertTrue(check_password('secret', profile.password))
+        self.assertEqual(User.objects.get(username='P900').password, profile.password)
+
+
+class LoginHashingTests(APITestCase):
+    """Test login answers 503 when hashing capacity is exhausted."""
+
+    def setUp(self):
+        cache.clear()
+        create_user('hashuser', password=make_password('secret'))
+
+    def test_login_returns_retry_after(self):
+        """Test a saturated pool maps to 503 with Retry-After."""
+        with mock.patch(
+            'apps.users.views.password_hashing_pool.check_password',
+            side_effect=HashingPoolSaturated(3),
+        ):
+            response = self.client.post('/api/v1/auth/login/', {
+                'userlogin': 'hashuser', 'password': 'secret'
+            }, format='json')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '3')
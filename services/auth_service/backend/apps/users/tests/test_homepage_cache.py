@@ -0,0 +1,110 @@
+"""
+Tests for the versioned HomePageView response cache.
+"""
+
+from unittest import mock
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+from common_auth.principal_cache import principal_cache
+from apps.users.homepage_cache import HomePageCache, homepage_cache
+from apps.users.models import HomePageInformation
+from apps.users.tests.test_principal_cache import bearer_for, create_user
+
+
+class HomePageCacheTests(APITestCase):
+    """Test cached tab content, ETags and invalidation."""
+
+    url = '/api/v1/auth/home/'
+
+    def setUp(self):
+        cache.clear()
+        principal_cache.clear()
+        create_user('homeuser')
+        # Resolve the principal up front so query counts only cover the view
+        principal_cache.get('homeuser')
+        self.client.credentials(HTTP_AUTHORIZATION=bearer_for('homeuser'))
+        self.row = HomePageInformation.objects.create(
+            header_name='DOWNLOADS', section_name='Manuals', level_name='L1'
+        )
+
+    def test_repeat_requests_skip_database(self):
+        """Test the second request is served from the cache."""
+        response = self.client.post(self.url, {'header_name': 'DOWNLOADS'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['section_name'], 'Manuals')
+
+        with self.assertNumQueries(0):
+            cached = self.client.post(self.url, {'header_name': 'DOWNLOADS'}, format='json')
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(cached['ETag'], response['ETag'])
+
+    def test_if_none_match_returns_304(self):
+        """Test a matching ETag is answered with 304 and no body."""
+        etag = self.client.post(self.url, {'header_name': 'DOWNLOADS'}, format='json')['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.post(
+                self.url, {'header_name': 'DOWNLOADS'}, format='json', HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_save_invalidates(self):
+        """Test saving a row changes the content and the ETag."""
+        first = self.client.get(self.url, {'header_name': 'DOWNLOADS'})
+        self.row.section_name = 'Drawings'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.row.save()
+
+        response = self.client.get(self.url, {'header_name': 'DOWNLOADS'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['section_name'], 'Drawings')
+        self.assertNotEqual(response['ETag'], first['ETag'])
+        self.assertGreaterEqual(homepage_cache.stats()['invalidations'], 1)
+
+    def test_invalidated_after_commit(self):
+        """Test the version is only bumped once the saving transaction commits."""
+        version = homepage_cache.version()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.row.save()
+        self.assertEqual(homepage_cache.version(), version)
+        callbacks[0]()
+        self.assertEqual(homepage_cache.version(), version + 1)
+
+    def test_cache_errors_fall_back_to_database(self):
+        """Test a cache outage neither fails the home page nor the admin save."""
+        self.client.get(self.url, {'header_name': 'DOWNLOADS'})
+        stats = homepage_cache.stats()
+        down = ConnectionError('down')
+        with mock.patch('apps.users.homepage_cache.cache', **{
+                f'{method}.side_effect': down for method in ('get', 'add', 'set', 'incr')}):
+            self.row.section_name = 'Drawings'
+            with self.captureOnCommitCallbacks(execute=True):
+                self.row.save()
+            response = self.client.get(self.url, {'header_name': 'DOWNLOADS'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['section_name'], 'Drawings')
+        self.assertEqual(homepage_cache.stats()['invalidation_errors'], stats['invalidation_errors'] + 2)
+
+        # The next read retries the bump, so the old entry is not served
+        response = self.client.get(self.url, {'header_name': 'DOWNLOADS'})
+        self.assertEqual(response.json()[0]['section_name'], 'Drawings')
+
+    def test_local_memory_ttl_is_capped(self):
+        """Test per-process caches keep entries only for local_ttl."""
+        self.assertEqual(HomePageCache(ttl=86400, local_ttl=30).ttl, 30)
+
+    def test_get_is_cacheable(self):
+        """Test the GET variant carries private Cache-Control and varies on Authorization."""
+        response = self.client.get(self.url, {'header_name': 'DOWNLOADS'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'private, max-age=60')
+        self.assertIn('Authorization', response['Vary'])
+
+    def test_invalid_tab(self):
+        """Test unknown and missing tabs are rejected."""
+        response = self.client.post(self.url, {'header_name': 'NEWS'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn('Cache-Control', response)
@@ -45,7 +45,7 @@ class HealthCheckTests(TestCase):
     
     def test_metrics_endpoint(self):
         """Test metrics endpoint."""
-        response = self.client.get('/metrics/')
+        response = self.client.get('/metrics/', {'format': 'json'})
         self.assertEqual(response.status_code, 200)
         data = response.json()
         self.assertIn('system', data)
@@ -350,7 +350,7 @@ class IntegrationTests(APITestCase):
     
     def test_microservice_health_endpoints(self):
         """Test all microservice health endpoints."""
-        endpoints = ['/health/', '/ready/', '/live/', '/metrics/']
+        endpoints = ['/health/', '/ready/', '/live/', '/metrics/?format=json']
         
         for endpoint in endpoints:
             response = self.client.get(endpoint)
@@ -0,0 +1,149 @@
+"""
+Tests for the JWT principal cache used by CustomJWTAuthentication.
+"""
+
+import jwt
+from unittest import mock
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APITestCase
+from apps.users.models import UserDetails
+from common_auth.principal_cache import PrincipalCache, principal_cache
+
+
+def create_user(userlogin='cacheuser', **overrides):
+    fields = {
+        'role': 'user',
+        'rank': 'Lt',
+        'name': 'Cache User',
+        'userlogin': userlogin,
+        'password': 'hashed',
+        'confirm_password': 'hashed',
+        'personal_no': userlogin,
+        'designation': 'Engineer',
+        'designation_email': f'{userlogin}@example.com',
+        'ship_name': 'INS Test',
+        'employee_type': 'Permanent',
+        'establishment': 'HQ',
+        'nudemail': f'{userlogin}@example.com',
+        'phone_no': '1234567890',
+        'mobile_no': '1234567890',
+    }
+    fields.update(overrides)
+    return UserDetails.objects.create(**fields)
+
+
+def bearer_for(userlogin):
+    token = jwt.encode({'userlogin': userlogin}, settings.SECRET_KEY, algorithm='HS256')
+    return f'Bearer {token}'
+
+
+class PrincipalCacheTests(TestCase):
+    """Test the two-level principal cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.principals = PrincipalCache(max_entries=2, ttl=60)
+        self.user = create_user()
+
+    def test_second_lookup_skips_database(self):
+        """Test repeated lookups are served from the local LRU."""
+        with self.assertNumQueries(1):
+            self.principals.get('cacheuser')
+        with self.assertNumQueries(0):
+            user = self.principals.get('cacheuser')
+
+        self.assertIsInstance(user, UserDetails)
+        self.assertEqual(user.pk, self.user.pk)
+        stats = self.principals.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['local_hits'], 1)
+
+    def test_shared_cache_backs_local_misses(self):
+        """Test a cold worker is filled from the shared cache."""
+        self.principals.get('cacheuser')
+        self.principals.clear()
+
+        with self.assertNumQueries(0):
+            self.principals.get('cacheuser')
+        self.assertEqual(self.principals.stats()['shared_hits'], 1)
+
+    def test_password_is_not_cached(self):
+        """Test secret fields stay deferred on cached instances."""
+        user = self.principals.get('cacheuser')
+        self.assertEqual(user.get_deferred_fields(), {'password', 'confirm_password'})
+        generation, snapshot = cache.get('principal:cacheuser')
+        self.assertNotIn('password', snapshot)
+
+    def test_lru_eviction(self):
+        """Test the local cache is bounded by max_entries."""
+        create_user('second')
+        create_user('third')
+        for userlogin in ('cacheuser', 'second', 'third'):
+            self.principals.get(userlogin)
+
+        stats = self.principals.stats()
+        self.assertEqual(stats['size'], 2)
+        self.assertEqual(stats['evictions'], 1)
+
+    def test_inactive_user_not_resolved(self):
+        """Test inactive users are rejected and not cached."""
+        create_user('inactive', status='0')
+        self.assertIsNone(self.principals.get('inactive'))
+        self.assertIsNone(cache.get('principal:inactive'))
+
+    def test_invalidate(self):
+        """Test invalidation drops local and shared entries."""
+        self.principals.get('cacheuser')
+        self.principals.invalidate('cacheuser')
+
+        self.assertIsNone(cache.get('principal:cacheuser'))
+        with self.assertNumQueries(1):
+            self.principals.get('cacheuser')
+
+    def test_lookup_racing_invalidate_is_not_served(self):
+        """Test a snapshot read before a save cannot be stored over the invalidation."""
+        original_set = cache.set
+
+        def deactivate_then_set(key, value, *args, **kwargs):
+            # The row changes and is invalidated between the read and the store
+            UserDetails.objects.filter(userlogin='cacheuser').update(status='0')
+            self.principals.invalidate('cacheuser')
+            return original_set(key, value, *args, **kwargs)
+
+        with mock.patch('common_auth.principal_cache.cache.set', side_effect=deactivate_then_set):
+            self.assertIsNotNone(self.principals.get('cacheuser'))
+        self.principals.clear()
+        self.assertIsNone(self.principals.get('cacheuser'))
+
+
+class PrincipalCacheInvalidationTests(APITestCase):
+    """Test views that change users invalidate the principal cache."""
+
+    def setUp(self):
+        cache.clear()
+        principal_cache.clear()
+        self.admin = create_user('admin')
+        self.user = create_user()
+        self.client.credentials(HTTP_AUTHORIZATION=bearer_for('admin'))
+
+    def test_deleted_user_is_rejected(self):
+        """Test a deleted user can no longer authenticate."""
+        principal_cache.get('cacheuser')
+        response = self.client.delete('/api/v1/auth/users/manage/', {'id': self.user.id}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        self.client.credentials(HTTP_AUTHORIZATION=bearer_for('cacheuser'))
+        response = self.client.get('/api/v1/auth/profile/')
+        self.assertIn(response.status_code, [401, 403])
+
+    def test_profile_update_refreshes_principal(self):
+        """Test profile updates are visible on the next request."""
+        self.client.get('/api/v1/auth/profile/')
+        response = self.client.put('/api/v1/auth/profile/', {'rank': 'Cdr'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get('/api/v1/auth/profile/')
+        self.assertEqual(response.json()['data']['rank'], 'Cdr')
+        self.assertEqual(UserDetails.objects.get(pk=self.admin.pk).password, 'hashed')
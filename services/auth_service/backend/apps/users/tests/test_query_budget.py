@@ -0,0 +1,120 @@
+"""
+Tests for query recording, N+1 detection and per-endpoint query budgets.
+"""
+
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APITestCase
+from common_auth.principal_cache import principal_cache
+from common_metrics.queries import query_shape, record_queries
+from common_metrics.request_metrics import RequestMetrics
+from common_metrics.testing import QueryBudgetMixin, query_budget
+from apps.users.models import UserDetails
+from .test_principal_cache import bearer_for, create_user
+
+
+class QueryRecorderTests(TestCase):
+    """Test query shapes and repeated-shape detection."""
+
+    def test_query_shape_normalizes_literals(self):
+        """Test literals and placeholder lists collapse to one shape."""
+        self.assertEqual(
+            query_shape("SELECT * FROM t WHERE id = 42 AND name = 'it''s'"),
+            'SELECT * FROM t WHERE id = ? AND name = ?'
+        )
+        self.assertEqual(
+            query_shape('SELECT * FROM t WHERE id IN (%s, %s, %s)'),
+            query_shape('SELECT * FROM t WHERE id IN (%s, %s)')
+        )
+
+    def test_repeated_shapes_detected(self):
+        """Test a lookup per row is reported as one repeated shape."""
+        users = [create_user(f'row{i}') for i in range(4)]
+        with record_queries() as recorder:
+            for user in users:
+                UserDetails.objects.get(id=user.id)
+            UserDetails.objects.count()
+
+        self.assertEqual(recorder.count, 5)
+        self.assertGreater(recorder.duration, 0)
+        repeated = recorder.repeated(3)
+        self.assertEqual(len(repeated), 1)
+        self.assertEqual(list(repeated.values()), [4])
+
+    def test_budget_exceeded_fails(self):
+        """Test query_budget lists the executed queries when over budget."""
+        with self.assertRaisesMessage(AssertionError, '2 queries executed, budget is 1'):
+            with query_budget(1):
+                UserDetails.objects.count()
+                UserDetails.objects.exists()
+
+    def test_repeat_budget_fails(self):
+        """Test max_repeats catches N+1 even within the total budget."""
+        with self.assertRaisesMessage(AssertionError, 'repeated more than 1 times'):
+            with query_budget(10, max_repeats=1):
+                for _ in range(3):
+                    UserDetails.objects.filter(status='1').count()
+
+
+class QueryMetricsMiddlewareTests(QueryBudgetMixin, APITestCase):
+    """Test per-request query metrics and endpoint budgets."""
+
+    def setUp(self):
+        cache.clear()
+        principal_cache.clear()
+        self.metrics = RequestMetrics(prefix='auth_service')
+        patcher = mock.patch('common_metrics.middleware.request_metrics', self.metrics)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = create_user('budgetuser', role='admin')
+        self.client.credentials(HTTP_AUTHORIZATION=bearer_for('budgetuser'))
+
+    def test_server_timing_header(self):
+        """Test query count and DB time are sent in Server-Timing."""
+        response = self.client.get('/api/v1/auth/profile/')
+        self.assertRegex(response['Server-Timing'], r'^db;dur=\d+\.\d;desc="\d+ queries"$')
+
+    def test_queries_recorded_per_endpoint(self):
+        """Test the metrics summary reports queries per request."""
+        self.client.get('/api/v1/auth/profile/')
+        endpoint = self.metrics.summary()['endpoints']['GET users:profile']
+        self.assertGreaterEqual(endpoint['avg_queries'], 1)
+        self.assertEqual(endpoint['repeated_query_requests'], 0)
+
+    def test_repeated_queries_flagged(self):
+        """Test a request repeating a query shape is logged and counted."""
+        original = UserDetails.objects.filter
+
+        def filter_repeatedly(*args, **kwargs):
+            for _ in range(4):
+                list(original(*args, **kwargs))
+            return original(*args, **kwargs)
+
+        with self.settings(QUERY_METRICS_SETTINGS={'repeat_threshold': 3}), \
+                mock.patch.object(UserDetails.objects, 'filter', side_effect=filter_repeatedly), \
+                self.assertLogs('common_metrics.middleware', level='WARNING') as logs:
+            self.client.get('/api/v1/auth/users/manage/')
+
+        self.assertIn('possible N+1', logs.output[0])
+        endpoint = self.metrics.summary()['endpoints']['GET users:user-management']
+        self.assertEqual(endpoint['repeated_query_requests'], 1)
+
+    def test_profile_query_budget(self):
+        """Test the profile endpoint stays within its query budget."""
+        with self.assertQueryBudget(2, max_repeats=1):
+            response = self.client.get('/api/v1/auth/profile/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_user_update_query_budget(self):
+        """Test updating a user with a new password saves it once."""
+        with self.assertQueryBudget(3, max_repeats=1):
+            response = self.client.put('/api/v1/auth/users/manage/', {
+                'id': self.user.id,
+                'name': 'Renamed',
+                'password': 'New-pass-123',
+                'confirm_password': 'New-pass-123',
+            }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.name, 'Renamed')
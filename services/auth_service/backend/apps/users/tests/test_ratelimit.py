@@ -0,0 +1,101 @@
+"""
+Tests for the sliding-window rate limiter.
+"""
+
+from unittest import mock
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APITestCase
+from apps.users.ratelimit import RateLimiter, load_policies
+from apps.users.token_journal import TokenJournal
+from apps.users.tests.test_principal_cache import create_user
+
+
+def make_limiter(limit=3, window=60, refund_success=False):
+    return RateLimiter(load_policies({
+        'login': {'path': '/api/v1/auth/login/', 'limit': limit, 'window': window,
+                  'refund_success': refund_success},
+    }))
+
+
+class RateLimiterTests(TestCase):
+    """Test the in-process sliding window counter."""
+
+    def setUp(self):
+        self.limiter = make_limiter()
+        self.policy = self.limiter.policies[0]
+
+    def test_limit_is_enforced(self):
+        """Test requests beyond the limit are rejected and counted."""
+        results = [self.limiter.hit(self.policy, '10.0.0.1') for _ in range(4)]
+
+        self.assertEqual([result.allowed for result in results], [True, True, True, False])
+        self.assertEqual([result.remaining for result in results[:3]], [2, 1, 0])
+        self.assertGreaterEqual(results[-1].retry_after, 1)
+        self.assertEqual(self.limiter.stats()['login'], {'allowed': 3, 'rejected': 1, 'refunded': 0})
+
+    def test_clients_are_independent(self):
+        """Test each identity has its own window."""
+        for _ in range(3):
+            self.limiter.hit(self.policy, '10.0.0.1')
+        self.assertTrue(self.limiter.hit(self.policy, '10.0.0.2').allowed)
+
+    def test_previous_window_is_weighted(self):
+        """Test the previous window still counts early in the next one."""
+        with mock.patch('apps.users.ratelimit.time.time', return_value=59.0):
+            for _ in range(3):
+                self.limiter.hit(self.policy, '10.0.0.1')
+        with mock.patch('apps.users.ratelimit.time.time', return_value=61.0):
+            self.assertFalse(self.limiter.hit(self.policy, '10.0.0.1').allowed)
+        with mock.patch('apps.users.ratelimit.time.time', return_value=100.0):
+            self.assertTrue(self.limiter.hit(self.policy, '10.0.0.1').allowed)
+
+    def test_refund(self):
+        """Test a refunded request frees its slot."""
+        results = [self.limiter.hit(self.policy, '10.0.0.1') for _ in range(3)]
+        self.limiter.refund(results[0])
+        self.assertTrue(self.limiter.hit(self.policy, '10.0.0.1').allowed)
+
+    def test_match(self):
+        """Test policies match on path prefix and method."""
+        self.assertEqual(self.limiter.match('/api/v1/auth/login/', 'POST'), self.policy)
+        self.assertIsNone(self.limiter.match('/api/v1/auth/login/', 'GET'))
+        self.assertIsNone(self.limiter.match('/api/v1/auth/profile/', 'POST'))
+
+
+class RateLimitMiddlewareTests(APITestCase):
+    """Test RateLimitMiddleware on the login endpoint."""
+
+    def setUp(self):
+        cache.clear()
+        create_user('limited', password=make_password('secret'))
+        self.limiter = make_limiter(limit=5, window=900, refund_success=True)
+        # Keep issued tokens out of the process-wide journal
+        journal = TokenJournal(mode='async', flush_interval=3600)
+        for target, replacement in (('apps.users.middleware.rate_limiter', self.limiter),
+                                    ('apps.users.views.token_journal', journal)):
+            patcher = mock.patch(target, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def login(self, password):
+        return self.client.post('/api/v1/auth/login/', {
+            'userlogin': 'limited', 'password': password
+        }, format='json')
+
+    def test_failed_logins_are_limited(self):
+        """Test the sixth failed login is rejected with 429."""
+        for _ in range(5):
+            self.assertNotEqual(self.login('wrong').status_code, 429)
+
+        response = self.login('wrong')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(response['X-RateLimit-Remaining'], '0')
+
+    def test_successful_logins_are_not_counted(self):
+        """Test successful logins give their slot back."""
+        for _ in range(6):
+            self.assertEqual(self.login('secret').status_code, 200)
+        self.assertEqual(self.limiter.stats()['login']['refunded'], 6)
@@ -0,0 +1,86 @@
+"""
+Tests for the cached readiness checks.
+"""
+
+import threading
+import time
+from unittest import mock
+from django.test import TestCase
+from rest_framework.test import APITestCase
+from apps.users.readiness import ReadinessChecker, refresh_readiness_migrations
+
+
+class ReadinessCheckerTests(TestCase):
+    """Test caching, timeouts and migration status."""
+
+    def test_result_cached_for_ttl(self):
+        """Test probes within cache_ttl reuse the last result."""
+        checker = ReadinessChecker(cache_ttl=60)
+        with mock.patch.object(checker, '_check_database', return_value=True) as database:
+            self.assertEqual(checker.check(), {'database': True, 'cache': True, 'migrations': True})
+            checker.check()
+        self.assertEqual(database.call_count, 1)
+        self.assertEqual(checker.stats()['cached'], 1)
+
+    def test_hung_check_times_out(self):
+        """Test a hung dependency fails the probe within check_timeout."""
+        checker = ReadinessChecker(cache_ttl=0, check_timeout=0.05)
+        release = threading.Event()
+        self.addCleanup(release.set)
+        with mock.patch.object(checker, '_check_database', side_effect=release.wait) as database:
+            start = time.monotonic()
+            self.assertFalse(checker.check()['database'])
+            self.assertFalse(checker.check()['database'])
+            self.assertLess(time.monotonic() - start, 1)
+        # The second probe waited on the same hung check instead of a new one
+        self.assertEqual(database.call_count, 1)
+        self.assertEqual(checker.stats()['timeouts'], 2)
+
+    def test_failed_check_not_ready(self):
+        """Test an exception in a check reports it as failed."""
+        checker = ReadinessChecker(cache_ttl=0)
+        with mock.patch.object(checker, '_check_cache', side_effect=ConnectionError('down')):
+            self.assertFalse(checker.check()['cache'])
+
+    def test_migrations_computed_once(self):
+        """Test the migration graph is loaded once and again after post_migrate."""
+        checker = ReadinessChecker(cache_ttl=0)
+        with mock.patch('apps.users.readiness.readiness_checker', checker), \
+                mock.patch('apps.users.readiness.MigrationExecutor') as executor:
+            executor.return_value.migration_plan.return_value = []
+            checker.check()
+            checker.check()
+            self.assertEqual(executor.call_count, 1)
+
+            refresh_readiness_migrations(sender=None)
+            checker.check()
+            self.assertEqual(executor.call_count, 2)
+
+    def test_pending_migrations_rechecked(self):
+        """Test unapplied migrations are re-evaluated on the next check."""
+        checker = ReadinessChecker(cache_ttl=0)
+        with mock.patch('apps.users.readiness.MigrationExecutor') as executor:
+            executor.return_value.migration_plan.return_value = [('users', False)]
+            self.assertFalse(checker.check()['migrations'])
+            executor.return_value.migration_plan.return_value = []
+            self.assertTrue(checker.check()['migrations'])
+        self.assertEqual(executor.call_count, 2)
+
+
+class ReadinessEndpointTests(APITestCase):
+    """Test the readiness endpoint."""
+
+    def test_ready(self):
+        """Test all checks pass in a migrated test database."""
+        with mock.patch('apps.users.health.readiness_checker', ReadinessChecker()):
+            response = self.client.get('/ready/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'ready')
+
+    def test_not_ready(self):
+        """Test a failing dependency answers 503."""
+        checks = {'database': False, 'cache': True, 'migrations': True}
+        with mock.patch('apps.users.health.readiness_checker.check', return_value=checks):
+            response = self.client.get('/ready/')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['checks'], checks)
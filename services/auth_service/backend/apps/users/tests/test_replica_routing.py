@@ -0,0 +1,124 @@
+"""
+Tests for read-replica routing, stickiness and failover (common_db).
+
+The ``replica`` alias of the test settings is a test mirror of the default
+SQLite database, so it serves the same rows while its queries are counted
+separately.
+"""
+
+from unittest import mock
+from django.core.cache import cache
+from django.db import OperationalError, connections
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITransactionTestCase
+from common_auth.principal_cache import principal_cache
+from common_db import routers
+from common_db.routers import ReplicaHealth, ReplicaRouter, reads_from_replica, replica_reads
+from apps.users.models import UserDetails
+from .test_principal_cache import bearer_for, create_user
+
+REPLICA_SETTINGS = {'aliases': ['replica'], 'sticky_seconds': 5}
+
+
+@override_settings(REPLICA_SETTINGS=REPLICA_SETTINGS)
+class ReplicaRoutingTests(APITransactionTestCase):
+    """Test which database annotated and unannotated views read from."""
+
+    databases = {'default', 'replica'}
+    url = '/api/v1/auth/users/manage/'
+
+    def setUp(self):
+        cache.clear()
+        principal_cache.clear()
+        self.health = ReplicaHealth(check_interval=60, max_lag=10)
+        patcher = mock.patch.object(routers, 'replica_health', self.health)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        create_user('admin', role='admin')
+        create_user('other', role='admin')
+        self.client.credentials(HTTP_AUTHORIZATION=bearer_for('admin'))
+
+    def get_counting_replica(self, url):
+        with CaptureQueriesContext(connections['replica']) as replica_queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, len(replica_queries)
+
+    def test_annotated_view_reads_from_replica(self):
+        """Test an annotated GET reads from the replica."""
+        response, replica_queries = self.get_counting_replica(self.url)
+        self.assertEqual(len(response.json()['data']), 2)
+        self.assertGreater(replica_queries, 0)
+        self.assertTrue(self.health.stats()['replicas']['replica']['healthy'])
+
+    def test_unannotated_view_reads_from_primary(self):
+        """Test views without the annotation keep reading from the primary."""
+        _, replica_queries = self.get_counting_replica('/api/v1/auth/feedback/analytics/')
+        self.assertEqual(replica_queries, 0)
+
+    def test_writer_sticks_to_primary(self):
+        """Test a user's reads stay on the primary after their own write."""
+        response = self.client.put('/api/v1/auth/profile/', {'name': 'Renamed'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        response, replica_queries = self.get_counting_replica(self.url)
+        self.assertEqual(replica_queries, 0)
+        self.assertIn('Renamed', [row['name'] for row in response.json()['data']])
+
+        self.client.credentials(HTTP_AUTHORIZATION=bearer_for('other'))
+        _, replica_queries = self.get_counting_replica(self.url)
+        self.assertGreater(replica_queries, 0)
+
+    def test_unavailable_replica_falls_back_to_primary(self):
+        """Test a replica failing its check is taken out of rotation."""
+        with mock.patch.object(ReplicaHealth, '_replication_lag', side_effect=OperationalError('down')):
+            _, replica_queries = self.get_counting_replica(self.url)
+        self.assertEqual(replica_queries, 0)
+        self.assertEqual(self.health.stats()['failed_checks'], 1)
+
+    def test_lagging_replica_falls_back_to_primary(self):
+        """Test a replica further behind than max_lag is not used."""
+        with mock.patch.object(ReplicaHealth, '_replication_lag', return_value=60.0):
+            _, replica_queries = self.get_counting_replica(self.url)
+        self.assertEqual(replica_queries, 0)
+        self.assertEqual(self.health.stats()['replicas']['replica']['lag_seconds'], 60.0)
+
+    def test_failed_read_is_retried_on_primary(self):
+        """Test a view failing on the replica is rerun on the primary."""
+        calls = []
+
+        @replica_reads
+        def view_method(view, request):
+            calls.append(reads_from_replica())
+            if reads_from_replica():
+                raise OperationalError('connection lost')
+            return 'primary'
+
+        request = mock.Mock(user=UserDetails.objects.get(userlogin='admin'))
+        with mock.patch.object(ReplicaHealth, 'check', return_value=False) as check:
+            self.health._state['replica'] = {'healthy': True, 'lag': 0.0, 'checked_at': 1e12}
+            self.assertEqual(view_method(None, request), 'primary')
+        self.assertEqual(calls, [True, False])
+        check.assert_called_once_with('replica')
+        self.assertEqual(self.health.stats()['failovers'], 1)
+
+
+class ReplicaRouterTests(SimpleTestCase):
+    """Test the router's decisions within a request."""
+
+    def test_reads_after_write_in_request_use_primary(self):
+        """Test a request reads its own writes from the primary."""
+        router = ReplicaRouter()
+        state_token = routers._request_state.set({'wrote': False})
+        alias_token = routers._read_alias.set('replica')
+        try:
+            self.assertEqual(router.db_for_read(UserDetails), 'replica')
+            self.assertEqual(router.db_for_write(UserDetails), 'default')
+            self.assertEqual(router.db_for_read(UserDetails), 'default')
+            with routers.primary_reads():
+                self.assertIsNone(router.db_for_read(UserDetails))
+        finally:
+            routers._read_alias.reset(alias_token)
+            routers._request_state.reset(state_token)
+        self.assertIsNone(router.db_for_read(UserDetails))
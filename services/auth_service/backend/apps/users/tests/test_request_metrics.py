@@ -0,0 +1,114 @@
+"""
+Tests for per-endpoint request metrics and their middleware.
+"""
+
+import os
+import tempfile
+from unittest import mock
+from django.test import TestCase
+from rest_framework.test import APITestCase
+from common_metrics import request_metrics as request_metrics_module
+from common_metrics.request_metrics import BUCKET_BOUNDS, RequestMetrics, bucket_index, quantile
+from .test_principal_cache import bearer_for, create_user
+
+
+class HistogramTests(TestCase):
+    """Test bucket placement and quantile estimates."""
+
+    def test_bucket_index(self):
+        """Test durations land in the first bucket whose bound covers them."""
+        self.assertEqual(bucket_index(0.00001), 0)
+        self.assertEqual(BUCKET_BOUNDS[bucket_index(0.011)], 0.0125)
+        self.assertEqual(BUCKET_BOUNDS[bucket_index(0.25)], 0.25)
+        self.assertEqual(bucket_index(1000), len(BUCKET_BOUNDS))
+
+    def test_quantiles(self):
+        """Test p50/p99 are read from the cumulative bucket counts."""
+        metrics = RequestMetrics(prefix='test')
+        for _ in range(98):
+            metrics.finish('users:login', 'POST', 200, 0.02, in_flight=False)
+        metrics.finish('users:login', 'POST', 200, 0.9, in_flight=False)
+        metrics.finish('users:login', 'POST', 200, 500, in_flight=False)
+        buckets = metrics._histograms[('users:login', 'POST')]['buckets']
+
+        self.assertEqual(quantile(buckets, 0.50), 0.02)
+        self.assertEqual(quantile(buckets, 0.99), 1.0)
+        self.assertEqual(quantile(buckets, 1.0), 100.0)
+        self.assertIsNone(quantile([0] * len(buckets), 0.5))
+
+
+class MultiprocessTests(TestCase):
+    """Test merging of per-worker metric files."""
+
+    def test_collect_merges_worker_files(self):
+        """Test the scraping worker reports totals of every worker."""
+        with tempfile.TemporaryDirectory() as directory:
+            worker = RequestMetrics(prefix='test', multiprocess_dir=directory)
+            worker._started -= 1
+            worker.finish('users:login', 'POST', 200, 0.05, in_flight=False)
+            worker.start('users:profile')
+            worker.flush()
+            self.assertEqual(len(os.listdir(directory)), 1)
+
+            scraper = RequestMetrics(prefix='test', multiprocess_dir=directory)
+            scraper.finish('users:login', 'POST', 401, 0.01, in_flight=False)
+            summary = scraper.summary()
+
+        login = summary['endpoints']['POST users:login']
+        self.assertEqual(login['count'], 2)
+        self.assertEqual(login['statuses'], {'200': 1, '401': 1})
+        self.assertEqual(summary['in_flight'], {'users:profile': 1})
+
+    def test_dead_worker_in_flight_dropped(self):
+        """Test in-flight gauges of exited workers are ignored."""
+        with tempfile.TemporaryDirectory() as directory:
+            worker = RequestMetrics(prefix='test', multiprocess_dir=directory)
+            worker._started -= 1
+            worker.start('users:profile')
+            worker.flush()
+
+            scraper = RequestMetrics(prefix='test', multiprocess_dir=directory)
+            with mock.patch.object(request_metrics_module, '_pid_alive', return_value=False):
+                summary = scraper.summary()
+        self.assertEqual(summary['in_flight'], {})
+
+
+class RequestMetricsMiddlewareTests(APITestCase):
+    """Test requests are recorded per resolved URL name."""
+
+    def setUp(self):
+        self.metrics = RequestMetrics(prefix='auth_service')
+        patcher = mock.patch('common_metrics.middleware.request_metrics', self.metrics)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_requests_labelled_by_view_name(self):
+        """Test statuses and latency are recorded per endpoint."""
+        create_user('metricsuser')
+        self.client.credentials(HTTP_AUTHORIZATION=bearer_for('metricsuser'))
+        self.client.get('/api/v1/auth/profile/')
+        self.client.credentials()
+        self.client.get('/api/v1/auth/profile/')
+
+        summary = self.metrics.summary()
+        profile = summary['endpoints']['GET users:profile']
+        self.assertEqual(profile['count'], 2)
+        self.assertEqual(sum(profile['statuses'].values()), 2)
+        self.assertIn('200', profile['statuses'])
+        self.assertEqual(summary['in_flight'], {'users:profile': 0})
+
+    def test_unresolved_paths_share_one_label(self):
+        """Test unknown URLs do not create a series per path."""
+        self.client.get('/no/such/path/')
+        self.client.get('/another/missing/path/')
+        summary = self.metrics.summary()
+        self.assertEqual(summary['endpoints']['GET <unresolved>']['statuses'], {'404': 2})
+
+    def test_prometheus_histogram(self):
+        """Test the metrics endpoint exports the request histogram."""
+        self.client.get('/health/')
+        with mock.patch('apps.users.health.request_metrics', self.metrics):
+            body = self.client.get('/metrics/').content.decode()
+        self.assertIn('# TYPE auth_service_request_duration_seconds histogram', body)
+        self.assertIn('auth_service_request_duration_seconds_bucket{view="health",method="GET",le="+Inf"} 1', body)
+        self.assertIn('auth_service_requests_total{view="health",method="GET",status="200"} 1', body)
@@ -0,0 +1,198 @@
+"""
+Tests for the refresh token revocation store.
+"""
+
+import io
+import time
+from unittest import mock
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+from apps.users.revocation import BloomFilter, RevocationStore, revocation_store
+from apps.users.token_journal import TokenJournal
+from apps.users.tests.test_principal_cache import create_user
+
+
+class BloomFilterTests(TestCase):
+    """Test the bloom filter used for revocation fast negatives."""
+
+    def test_membership(self):
+        """Test added items are always reported as members."""
+        bloom = BloomFilter(num_bits=4096, num_hashes=5)
+        for i in range(50):
+            bloom.add(f'jti-{i}')
+
+        self.assertTrue(all(f'jti-{i}' in bloom for i in range(50)))
+        false_positives = sum(f'other-{i}' in bloom for i in range(1000))
+        self.assertLess(false_positives, 50)
+
+    def test_merge(self):
+        """Test merging a serialized bitmap unions the filters."""
+        first = BloomFilter(num_bits=1024, num_hashes=3)
+        second = BloomFilter(num_bits=1024, num_hashes=3)
+        first.add('a')
+        second.add('b')
+
+        first.merge(bytes(second.bits))
+        self.assertIn('a', first)
+        self.assertIn('b', first)
+
+
+class RevocationStoreTests(TestCase):
+    """Test the in-process revocation store."""
+
+    def setUp(self):
+        self.store = RevocationStore(bloom_bits=4096, bloom_hashes=5)
+        self.expires_at = time.time() + 3600
+
+    def test_unrevoked_token_is_fast_negative(self):
+        """Test unknown tokens are rejected by the bloom filter alone."""
+        self.assertFalse(self.store.is_revoked('unknown', self.expires_at))
+        self.assertEqual(self.store.stats()['fast_negatives'], 1)
+
+    def test_revoked_token(self):
+        """Test revoked tokens are reported until they expire."""
+        self.store.revoke('revoked', self.expires_at)
+
+        self.assertTrue(self.store.is_revoked('revoked', self.expires_at))
+        self.assertEqual(self.store.stats()['hits'], 1)
+
+    def test_expired_token_is_not_stored(self):
+        """Test revoking an already expired token is a no-op."""
+        self.store.revoke('expired', time.time() - 1)
+        self.assertEqual(self.store.stats()['local_entries'], 0)
+
+    def test_backfill(self):
+        """Test backfill revokes unexpired tokens and marks the store."""
+        self.assertFalse(self.store.is_backfilled())
+        count = self.store.backfill([('old', self.expires_at), ('expired', time.time() - 1)])
+
+        self.assertEqual(count, 1)
+        self.assertTrue(self.store.is_revoked('old', self.expires_at))
+        self.assertTrue(self.store.is_backfilled())
+
+
+class RevocationEndpointTests(APITestCase):
+    """Test logout and refresh against the revocation store."""
+
+    # The in-process store standing in for Redis
+    shared = True
+
+    def setUp(self):
+        cache.clear()
+        revocation_store.clear()
+        patcher = mock.patch.object(RevocationStore, 'is_shared', return_value=self.shared)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        if self.shared:
+            revocation_store.backfill([])
+        create_user('revokeuser', password=make_password('secret'))
+        self.journal = TokenJournal(mode='async', flush_interval=3600)
+        for target in ('apps.users.views.token_journal', 'apps.users.tokens.token_journal'):
+            patcher = mock.patch(target, self.journal)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def login(self):
+        response = self.client.post('/api/v1/auth/login/', {
+            'userlogin': 'revokeuser', 'password': 'secret'
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['data']['tokens']['refresh']
+
+    def test_refresh_after_logout_is_rejected(self):
+        """Test a logged out refresh token can no longer be used."""
+        refresh = self.login()
+        response = self.client.post('/api/v1/auth/logout/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.post('/api/v1/auth/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_second_logout_is_rejected(self):
+        """Test logging out twice with the same token fails."""
+        refresh = self.login()
+        self.client.post('/api/v1/auth/logout/', {'refresh': refresh}, format='json')
+
+        response = self.client.post('/api/v1/auth/logout/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors']['code'], 'invalid_token')
+
+    def test_rotation_revokes_previous_token(self):
+        """Test refresh rotation revokes the old token and journals the new one."""
+        refresh = self.login()
+        response = self.client.post('/api/v1/auth/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 200)
+        rotated = response.json()['refresh']
+
+        response = self.client.post('/api/v1/auth/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 401)
+        response = self.client.post('/api/v1/auth/token/refresh/', {'refresh': rotated}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(0):
+            self.client.post('/api/v1/auth/token/refresh/', {'refresh': response.json()['refresh']}, format='json')
+
+    def test_blacklist_audit_is_written_on_flush(self):
+        """Test revocations reach the blacklist tables via the journal."""
+        refresh = self.login()
+        self.client.post('/api/v1/auth/logout/', {'refresh': refresh}, format='json')
+        self.assertEqual(BlacklistedToken.objects.count(), 0)
+
+        self.journal.flush()
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+
+
+class BlacklistTableFallbackTests(RevocationEndpointTests):
+    """Test the blacklist tables are checked where the store cannot answer alone."""
+
+    shared = False
+
+    def blacklist_in_tables(self, refresh):
+        """Blacklist ``refresh`` the way SimpleJWT did before the revocation store."""
+        token = RefreshToken(refresh)
+        outstanding = OutstandingToken.objects.create(
+            jti=token['jti'], token=refresh, expires_at=datetime_from_epoch(token['exp'])
+        )
+        BlacklistedToken.objects.create(token=outstanding)
+
+    def test_rotation_revokes_previous_token(self):
+        """Test rotation without Redis is seen through the tables."""
+        refresh = self.login()
+        response = self.client.post('/api/v1/auth/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+
+        response = self.client.post('/api/v1/auth/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_blacklist_audit_is_written_on_flush(self):
+        """Test logout without Redis writes the blacklist before responding."""
+        refresh = self.login()
+        self.client.post('/api/v1/auth/logout/', {'refresh': refresh}, format='json')
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+
+        # Not in this process's store, as another worker would see it
+        revocation_store.clear()
+        response = self.client.post('/api/v1/auth/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_token_blacklisted_before_backfill(self):
+        """Test tokens only in the tables are rejected until and after backfill."""
+        refresh = self.login()
+        self.blacklist_in_tables(refresh)
+        with mock.patch.object(RevocationStore, 'is_shared', return_value=True):
+            response = self.client.post('/api/v1/auth/token/refresh/', {'refresh': refresh}, format='json')
+            self.assertEqual(response.status_code, 401)
+
+            call_command('backfill_revocations', stdout=io.StringIO())
+            token = RefreshToken(refresh, verify=False)
+            self.assertTrue(revocation_store.is_revoked(token['jti'], token['exp']))
+            with self.assertNumQueries(0):
+                response = self.client.post('/api/v1/auth/token/refresh/', {'refresh': refresh}, format='json')
+            self.assertEqual(response.status_code, 401)
@@ -0,0 +1,69 @@
+"""
+Tests for the background system sampler and the metrics endpoint.
+"""
+
+from unittest import mock
+from django.test import TestCase
+from rest_framework.test import APITestCase
+from apps.users import prometheus
+from apps.users.system_metrics import SystemSampler
+
+
+class SystemSamplerTests(TestCase):
+    """Test sampling and window summaries."""
+
+    def test_snapshot_summarizes_window(self):
+        """Test min/avg/max are computed over the buffered samples."""
+        sampler = SystemSampler(interval=60, window=3)
+        with mock.patch.object(sampler, '_ensure_thread'):
+            for cpu in (10.0, 20.0, 30.0, 40.0):
+                sample = sampler.sample(include_database=False)
+                sample['cpu_percent'] = cpu
+                sampler._samples.append(sample)
+            snapshot = sampler.snapshot()
+
+        self.assertEqual(snapshot['samples'], 3)
+        self.assertEqual(snapshot['latest']['cpu_percent'], 40.0)
+        self.assertEqual(snapshot['window']['cpu_percent'], {'min': 20.0, 'avg': 30.0, 'max': 40.0})
+
+    def test_cpu_sampling_does_not_block(self):
+        """Test samples use the non-blocking psutil CPU reading."""
+        sampler = SystemSampler()
+        with mock.patch('apps.users.system_metrics.psutil.cpu_percent', return_value=5.0) as cpu:
+            sampler.sample(include_database=False)
+        cpu.assert_called_once_with(interval=None)
+
+    def test_first_snapshot_without_samples(self):
+        """Test a scrape before the first background sample still answers."""
+        sampler = SystemSampler()
+        with mock.patch.object(sampler, '_ensure_thread'):
+            snapshot = sampler.snapshot()
+        self.assertEqual(snapshot['samples'], 1)
+        self.assertIsNone(snapshot['latest']['db_connections'])
+
+
+class MetricsEndpointTests(APITestCase):
+    """Test the metrics endpoint formats."""
+
+    def test_prometheus_text_by_default(self):
+        """Test the default response is Prometheus text."""
+        response = self.client.get('/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], prometheus.CONTENT_TYPE)
+        body = response.content.decode()
+        self.assertIn('auth_service_system_latest_cpu_percent ', body)
+        self.assertIn('auth_service_circuit_breakers_database_state_info{value="closed"} 1', body)
+
+    def test_json_format(self):
+        """Test ?format=json returns the structured metrics."""
+        response = self.client.get('/metrics/', {'format': 'json'})
+        data = response.json()
+        self.assertIn('window', data['system'])
+        self.assertIn('principal_cache', data)
+
+    def test_render(self):
+        """Test nested values are flattened into gauges."""
+        text = prometheus.render({'a': {'b': 1.5, 'ok': True, 'skip': None}}, prefix='svc')
+        self.assertIn('svc_a_b 1.5', text)
+        self.assertIn('svc_a_ok 1', text)
+        self.assertNotIn('skip', text)
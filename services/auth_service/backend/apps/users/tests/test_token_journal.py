@@ -0,0 +1,155 @@
+"""
+Tests for the write-behind refresh token journal.
+"""
+
+from unittest import mock
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.users.revocation import RevocationStore, revocation_store
+from apps.users.token_journal import TokenJournal
+from apps.users.tests.test_principal_cache import create_user
+
+
+class TokenJournalTests(TestCase):
+    """Test batching and flush behaviour of the token journal."""
+
+    def test_async_mode_defers_insert(self):
+        """Test tokens are queued until flushed."""
+        journal = TokenJournal(mode='async', flush_interval=3600)
+        token = RefreshToken()
+        journal.record(token)
+
+        self.assertTrue(journal.is_pending(token['jti']))
+        self.assertFalse(OutstandingToken.objects.filter(jti=token['jti']).exists())
+
+        with self.assertNumQueries(1):
+            self.assertEqual(journal.flush(), 1)
+        self.assertFalse(journal.is_pending(token['jti']))
+        self.assertTrue(OutstandingToken.objects.filter(jti=token['jti']).exists())
+
+    def test_batch_is_single_insert(self):
+        """Test pending tokens are written with one bulk insert."""
+        journal = TokenJournal(mode='async', batch_size=50, flush_interval=3600)
+        for _ in range(10):
+            journal.record(RefreshToken())
+
+        with self.assertNumQueries(1):
+            journal.flush()
+        self.assertEqual(OutstandingToken.objects.count(), 10)
+        self.assertEqual(journal.stats()['batches'], 1)
+
+    def test_durable_mode_writes_before_return(self):
+        """Test durable mode persists the token inside record()."""
+        journal = TokenJournal(mode='durable')
+        token = RefreshToken()
+        journal.record(token)
+
+        self.assertFalse(journal.is_pending(token['jti']))
+        self.assertTrue(OutstandingToken.objects.filter(jti=token['jti']).exists())
+
+    def test_durable_flush_error_keeps_token_queued(self):
+        """Test a failed durable write is logged and left for the worker."""
+        journal = TokenJournal(mode='durable', flush_interval=3600)
+        token = RefreshToken()
+        with mock.patch.object(journal, '_ensure_worker') as ensure_worker, mock.patch.object(
+                OutstandingToken.objects, 'bulk_create', side_effect=RuntimeError('db down')):
+            journal.record(token)
+
+        ensure_worker.assert_called_once_with()
+        self.assertTrue(journal.is_pending(token['jti']))
+        self.assertEqual(journal.stats()['errors'], 1)
+        journal.flush()
+        self.assertTrue(OutstandingToken.objects.filter(jti=token['jti']).exists())
+
+    def test_failed_flush_backs_off_and_caps_queue(self):
+        """Test an outage stops inline flushes and bounds the queue."""
+        journal = TokenJournal(mode='durable', max_pending=2, max_queue=3, retry_backoff=3600)
+        with mock.patch.object(journal, '_ensure_worker'), mock.patch.object(
+                OutstandingToken.objects, 'bulk_create', side_effect=RuntimeError('db down')) as bulk_create:
+            for _ in range(5):
+                journal.record(RefreshToken())
+
+        self.assertEqual(bulk_create.call_count, 1)
+        stats = journal.stats()
+        self.assertEqual((stats['pending'], stats['dropped'], stats['errors']), (3, 2, 1))
+        journal.flush()
+        self.assertEqual(OutstandingToken.objects.count(), 3)
+        with mock.patch.object(journal, '_ensure_worker') as ensure_worker:
+            journal.record(RefreshToken())
+        ensure_worker.assert_not_called()
+        self.assertEqual(journal.stats()['pending'], 0)
+
+    def test_max_pending_flushes_inline(self):
+        """Test the queue never grows past max_pending."""
+        journal = TokenJournal(mode='async', max_pending=3, flush_interval=3600)
+        for _ in range(3):
+            journal.record(RefreshToken())
+
+        self.assertEqual(journal.stats()['pending'], 0)
+        self.assertEqual(OutstandingToken.objects.count(), 3)
+
+
+class LoginJournalTests(APITestCase):
+    """Test login and logout against a queued token."""
+
+    def setUp(self):
+        cache.clear()
+        revocation_store.clear()
+        revocation_store.backfill([])
+        # Revocations go to the (shared) store; the tables are audit only
+        patcher = mock.patch.object(RevocationStore, 'is_shared', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        create_user('journaluser', password=make_password('secret'))
+        self.journal = TokenJournal(mode='async', flush_interval=3600)
+        for target in ('apps.users.views.token_journal', 'apps.users.tokens.token_journal'):
+            patcher = mock.patch(target, self.journal)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_logout_blacklists_unflushed_token(self):
+        """Test logout of a still-queued token is journaled for audit."""
+        response = self.client.post('/api/v1/auth/login/', {
+            'userlogin': 'journaluser', 'password': 'secret'
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        refresh = response.json()['data']['tokens']['refresh']
+        self.assertEqual(self.journal.stats()['pending'], 1)
+
+        response = self.client.post('/api/v1/auth/logout/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.journal.stats()['pending_revocations'], 1)
+
+        self.journal.flush()
+        self.assertEqual(OutstandingToken.objects.count(), 1)
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+
+    def test_durable_login_survives_flush_error(self):
+        """Test login succeeds when the durable journal write fails."""
+        self.journal.mode = 'durable'
+        with mock.patch.object(self.journal, '_ensure_worker'), mock.patch.object(
+                OutstandingToken.objects, 'bulk_create', side_effect=RuntimeError('db down')):
+            response = self.client.post('/api/v1/auth/login/', {
+                'userlogin': 'journaluser', 'password': 'secret'
+            }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.journal.stats()['pending'], 1)
+
+    def test_logout_on_other_worker(self):
+        """Test a per-process logout is written without the login worker's queue."""
+        response = self.client.post('/api/v1/auth/login/', {
+            'userlogin': 'journaluser', 'password': 'secret'
+        }, format='json')
+        refresh = response.json()['data']['tokens']['refresh']
+
+        other_worker = TokenJournal(mode='async', flush_interval=3600)
+        with mock.patch('apps.users.tokens.token_journal', other_worker), mock.patch.object(
+                RevocationStore, 'is_shared', return_value=False):
+            response = self.client.post('/api/v1/auth/logout/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+        self.assertTrue(self.journal.is_pending(RefreshToken(refresh, verify=False)['jti']))
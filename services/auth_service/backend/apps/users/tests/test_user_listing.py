@@ -0,0 +1,83 @@
+"""
+Tests for the keyset-paginated user management listing.
+"""
+
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+from common_auth.principal_cache import principal_cache
+from apps.users.pagination import InvalidCursor, decode_cursor, encode_cursor
+from apps.users.tests.test_principal_cache import bearer_for, create_user
+
+
+class UserListingTests(APITestCase):
+    """Test cursor pagination and filtering on UserManagementAPIView.get."""
+
+    url = '/api/v1/auth/users/manage/'
+
+    def setUp(self):
+        cache.clear()
+        principal_cache.clear()
+        create_user('admin', role='admin')
+        for i in range(5):
+            create_user(f'user{i}', ship_name='INS Alpha' if i % 2 else 'INS Beta')
+        create_user('retired', status='0')
+        self.client.credentials(HTTP_AUTHORIZATION=bearer_for('admin'))
+
+    def test_unpaginated_listing_is_unchanged(self):
+        """Test the full list is returned without pagination parameters."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertNotIn('pagination', body)
+        self.assertEqual(len(body['data']), 6)
+        self.assertEqual(body['data'][0]['user_login'], 'admin')
+        self.assertEqual(body['data'][0]['ship'], 'INS Test')
+        self.assertNotIn('password', body['data'][0])
+
+    def test_cursor_walks_all_pages(self):
+        """Test following next_cursor visits every active user once."""
+        seen = []
+        response = self.client.get(self.url, {'page_size': 4})
+        while True:
+            body = response.json()
+            seen.extend(row['user_login'] for row in body['data'])
+            if not body['pagination']['has_more']:
+                break
+            response = self.client.get(self.url, {'page_size': 4, 'cursor': body['pagination']['next_cursor']})
+
+        self.assertEqual(seen, ['admin', 'user0', 'user1', 'user2', 'user3', 'user4'])
+        self.assertIsNone(body['pagination']['next_cursor'])
+        self.assertEqual(body['pagination']['total_estimate'], 6)
+
+    def test_page_size_is_capped(self):
+        """Test page_size cannot exceed the configured maximum."""
+        with self.settings(USER_LIST_SETTINGS={'max_page_size': 2}):
+            response = self.client.get(self.url, {'page_size': 1000})
+        self.assertEqual(response.json()['pagination']['page_size'], 2)
+        self.assertEqual(len(response.json()['data']), 2)
+
+    def test_filters(self):
+        """Test server-side filtering by ship_name."""
+        response = self.client.get(self.url, {'page_size': 10, 'ship_name': 'INS Alpha'})
+        body = response.json()
+        self.assertEqual([row['user_login'] for row in body['data']], ['user1', 'user3'])
+        self.assertEqual(body['pagination']['total_estimate'], 2)
+
+    def test_total_estimate_is_cached(self):
+        """Test the total is not recounted on every page."""
+        self.client.get(self.url, {'page_size': 2})
+        create_user('late')
+
+        response = self.client.get(self.url, {'page_size': 2})
+        self.assertEqual(response.json()['pagination']['total_estimate'], 6)
+
+    def test_invalid_cursor(self):
+        """Test malformed cursors are rejected with 400."""
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_round_trip(self):
+        """Test cursors encode and decode the last id."""
+        self.assertEqual(decode_cursor(encode_cursor(42)), 42)
+        with self.assertRaises(InvalidCursor):
+            decode_cursor('eDox')
@@ -0,0 +1,232 @@
+"""
+Write-behind journal for issued refresh tokens.
+
+Login used to insert one ``OutstandingToken`` row per successful request,
+which serializes login storms on the outstanding token table. Issued tokens
+are now queued in process and written with ``bulk_create`` by a background
+worker once ``batch_size`` tokens are pending or ``flush_interval`` seconds
+have passed. Revocations (logout, refresh rotation) are journaled the same
+way into ``BlacklistedToken``, which now serves as an audit trail; request
+paths check ``apps.users.revocation`` instead.
+
+Modes:
+    durable: the caller's token (and anything else pending) is written
+        before ``record`` returns. If the write fails, the error is logged
+        and the rows stay queued for the background worker, so a database
+        hiccup never fails a login.
+
+After a failed flush, requests stop flushing inline for ``retry_backoff``
+seconds and leave the retries to the worker. During a longer outage the
+queue stops at ``max_queue`` tokens; further issued tokens are not
+journaled and are counted as ``dropped``.
+    async: ``record`` only enqueues. Rows still pending when a worker is
+        killed are lost from the audit tables.
+
+The queue is per process: ``is_pending`` and ``flush`` only see tokens
+journaled by this worker. Nothing may depend on another worker's queue, so
+a revocation journals its own outstanding row (the insert ignores
+conflicts) and a logout that must reach the tables flushes its own queue.
+"""
+
+import atexit
+import os
+import threading
+import time
+import logging
+from collections import OrderedDict
+from django.conf import settings
+from django.db import close_old_connections
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+logger = logging.getLogger(__name__)
+
+DURABLE = 'durable'
+ASYNC = 'async'
+
+
+class TokenJournal:
+    """
+    In-process queue of OutstandingToken/BlacklistedToken rows flushed in batches.
+    """
+
+    def __init__(self, mode=ASYNC, batch_size=100, flush_interval=0.5, max_pending=5000,
+                 max_queue=20000, retry_backoff=5):
+        if mode not in (DURABLE, ASYNC):
+            raise ValueError(f"Unknown token journal mode: {mode}")
+        self.mode = mode
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_queue = max(max_queue, max_pending)
+        self.retry_backoff = retry_backoff
+        # Monotonic time before which neither requests nor the worker retry a failed flush
+        self._retry_at = 0.0
+        self._pending = OrderedDict()
+        self._revocations = OrderedDict()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._worker = None
+        self._worker_pid = None
+        self._stats = {
+            'recorded': 0, 'revocations': 0, 'flushed': 0, 'batches': 0, 'errors': 0, 'dropped': 0,
+        }
+        atexit.register(self._flush_at_exit)
+
+    def record(self, token):
+        """Journal an issued refresh token, unless the queue is full."""
+        with self._lock:
+            if len(self._pending) >= self.max_queue:
+                self._stats['dropped'] += 1
+                dropped = self._stats['dropped']
+            else:
+                self._pending[token['jti']] = self._outstanding_entry(token)
+                self._stats['recorded'] += 1
+                dropped = 0
+            pending = len(self._pending)
+        if dropped:
+            if dropped % 1000 == 1:
+                logger.error(f"Token journal queue full ({self.max_queue}), {dropped} tokens not journaled")
+            self._ensure_worker()
+            return
+        self._after_enqueue(pending)
+
+    def record_revocation(self, token):
+        """Journal a revoked refresh token for the blacklist audit tables."""
+        jti = token['jti']
+        with self._lock:
+            # The blacklist row needs an outstanding row; the insert is a
+            # no-op when the token was journaled at login.
+            if jti not in self._pending:
+                self._pending[jti] = self._outstanding_entry(token)
+            self._revocations[jti] = None
+            self._stats['revocations'] += 1
+            pending = len(self._pending)
+        self._after_enqueue(pending)
+
+    def _outstanding_entry(self, token):
+        return OutstandingToken(
+            user=None,
+            jti=token['jti'],
+            token=str(token),
+            created_at=token.current_time,
+            expires_at=datetime_from_epoch(token['exp']),
+        )
+
+    def _after_enqueue(self, pending):
+        """Flush inline or wake the worker depending on mode and queue depth."""
+        if self.mode == DURABLE or pending >= self.max_pending:
+            # Flush on the request thread rather than growing without bound,
+            # unless a recent flush failed and the worker is retrying.
+            if time.monotonic() >= self._retry_at:
+                try:
+                    self.flush()
+                    return
+                except Exception as e:
+                    logger.error(f"Token journal flush failed, retrying in the background: {str(e)}")
+            self._ensure_worker()
+            return
+
+        self._ensure_worker()
+        if pending >= self.batch_size:
+            self._wakeup.set()
+
+    def is_pending(self, jti):
+        """Return True if ``jti`` is queued in this process but not yet written."""
+        with self._lock:
+            return jti in self._pending
+
+    def flush(self):
+        """Write every pending token; return the number of rows flushed."""
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._pending.values())
+                revoked = list(self._revocations)
+            if not batch and not revoked:
+                return 0
+
+            try:
+                OutstandingToken.objects.bulk_create(
+                    batch, batch_size=self.batch_size, ignore_conflicts=True
+                )
+                if revoked:
+                    token_ids = OutstandingToken.objects.filter(
+                        jti__in=revoked
+                    ).values_list('id', flat=True)
+                    BlacklistedToken.objects.bulk_create(
+                        [BlacklistedToken(token_id=token_id) for token_id in token_ids],
+                        batch_size=self.batch_size, ignore_conflicts=True,
+                    )
+            except Exception:
+                with self._lock:
+                    self._stats['errors'] += 1
+                    self._retry_at = time.monotonic() + self.retry_backoff
+                raise
+
+            with self._lock:
+                for entry in batch:
+                    if self._pending.get(entry.jti) is entry:
+                        del self._pending[entry.jti]
+                for jti in revoked:
+                    self._revocations.pop(jti, None)
+                self._stats['flushed'] += len(batch) + len(revoked)
+                self._stats['batches'] += 1
+                self._retry_at = 0.0
+        logger.debug(
+            f"Token journal flushed {len(batch)} outstanding and {len(revoked)} blacklisted tokens"
+        )
+        return len(batch) + len(revoked)
+
+    def stats(self):
+        """Return journal counters and the current queue depth."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._pending)
+            stats['pending_revocations'] = len(self._revocations)
+        stats['mode'] = self.mode
+        return stats
+
+    def _ensure_worker(self):
+        """Start the flush thread in this process if it is not running."""
+        pid = os.getpid()
+        if self._worker is not None and self._worker_pid == pid and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is not None and self._worker_pid == pid and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(
+                target=self._run, name='token-journal', daemon=True
+            )
+            self._worker_pid = pid
+            self._worker.start()
+
+    def _run(self):
+        """Flush loop executed by the background thread."""
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if time.monotonic() < self._retry_at:
+                continue
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Token journal flush failed, will retry: {str(e)}")
+            finally:
+                close_old_connections()
+
+    def _flush_at_exit(self):
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Token journal flush at exit failed: {str(e)}")
+
+
+token_journal = TokenJournal(
+    mode=getattr(settings, 'TOKEN_JOURNAL_SETTINGS', {}).get('mode', ASYNC),
+    batch_size=getattr(settings, 'TOKEN_JOURNAL_SETTINGS', {}).get('batch_size', 100),
+    flush_interval=getattr(settings, 'TOKEN_JOURNAL_SETTINGS', {}).get('flush_interval', 0.5),
+    max_pending=getattr(settings, 'TOKEN_JOURNAL_SETTINGS', {}).get('max_pending', 5000),
+    max_queue=getattr(settings, 'TOKEN_JOURNAL_SETTINGS', {}).get('max_queue', 20000),
+    retry_backoff=getattr(settings, 'TOKEN_JOURNAL_SETTINGS', {}).get('retry_backoff', 5),
+)
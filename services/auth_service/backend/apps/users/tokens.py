@@ -0,0 +1,49 @@
+"""
+Refresh token class backed by the revocation store.
+
+SimpleJWT's blacklist mixin queries the PostgreSQL blacklist tables on every
+refresh and writes them on every rotation. This token checks and records
+revocations in ``apps.users.revocation`` and leaves the tables to the token
+journal as an audit trail. The tables stay authoritative where the store
+cannot answer alone: for tokens blacklisted before the store was backfilled,
+and when the store is per-process (no Redis).
+"""
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from .revocation import revocation_store
+from .token_journal import token_journal
+
+
+class RevocableRefreshToken(RefreshToken):
+    """
+    RefreshToken whose blacklist lives in the revocation store.
+    """
+
+    def check_blacklist(self):
+        """Raise TokenError if this token has been revoked."""
+        if not revocation_store.is_shared():
+            # Revocations held in this process are not seen by the other workers
+            return super().check_blacklist()
+        jti = self.payload[api_settings.JTI_CLAIM]
+        if revocation_store.is_revoked(jti, self.payload['exp']):
+            raise TokenError(_("Token is blacklisted"))
+        if not revocation_store.is_backfilled():
+            # Tokens blacklisted before the rollout are only in the tables
+            super().check_blacklist()
+
+    def blacklist(self):
+        """Revoke this token and journal the blacklist audit record."""
+        if not revocation_store.is_shared():
+            # The tables are the revocation store; write them before responding
+            token_journal.record_revocation(self)
+            token_journal.flush()
+            return
+        revocation_store.revoke(self.payload[api_settings.JTI_CLAIM], self.payload['exp'])
+        token_journal.record_revocation(self)
+
+    def outstand(self):
+        """Journal this (rotated) token as outstanding."""
+        token_journal.record(self)
@@ -6,6 +6,7 @@ This module defines URL patterns for user authentication endpoints.
 
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
+from common_auth.async_views import select_view
 
 from .views import (LoginAPIView, 
                     LogoutAPIView, 
@@ -13,10 +14,14 @@ from .views import (LoginAPIView,
                     SignUpAPIView, 
                     HomePageView, 
                     FeedbackAPIView,
+                    FeedbackAnalyticsAPIView,
                     RoleMasterAPIView,
                     EditRoleAPIView,
                     DeleteRoleAPIView,
-                    UserManagementAPIView)
+                    UserManagementAPIView,
+                    AsyncUserProfileView,
+                    AsyncHomePageView,
+                    AsyncRoleMasterView)
 
 app_name = 'users'
 
@@ -25,10 +30,11 @@ urlpatterns = [
     path('login/', LoginAPIView.as_view(), name='login'),
     path('logout/', LogoutAPIView.as_view(), name='logout'),
     path('signup/', SignUpAPIView.as_view(), name='signup'),
-    path('profile/', UserProfileAPIView.as_view(), name='profile'),
-    path('home/', HomePageView.as_view(), name='home'),
+    path('profile/', select_view(AsyncUserProfileView), name='profile'),
+    path('home/', select_view(AsyncHomePageView), name='home'),
     path('feedback/', FeedbackAPIView.as_view(), name='feedback'),
-    path('roles/', RoleMasterAPIView.as_view(), name='role'),
+    path('feedback/analytics/', FeedbackAnalyticsAPIView.as_view(), name='feedback-analytics'),
+    path('roles/', select_view(AsyncRoleMasterView), name='role'),
     path('roles/edit/', EditRoleAPIView.as_view(), name='edit-role'),
     path('roles/delete/', DeleteRoleAPIView.as_view(), name='delete-role'),
 
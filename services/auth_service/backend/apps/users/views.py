@@ -6,7 +6,6 @@ with PostgreSQL backend. Optimized for Angular 18+ frontend consumption.
 """
 
 from django.contrib.auth.models import User
-from django.contrib.auth.hashers import check_password, make_password
 from django.contrib.auth import authenticate
 from django.db import IntegrityError
 from django.utils import timezone
@@ -19,7 +18,11 @@ from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
 from rest_framework_simplejwt.settings import api_settings
+from common_api.serializers import list_data
+from common_auth.async_views import AsyncAPIView
 from common_auth.authentication import CustomJWTAuthentication
+from common_auth.principal_cache import principal_cache
+from common_db.routers import replica_reads
 from datetime import datetime, timedelta
 import logging
 
@@ -33,11 +36,51 @@ from .serializers import (LoginSerializer,
                           RoleMasterSerializer)
 
 from .models import (HomePageInformation, Feedback, UserDetails, RoleMaster)
+from .token_journal import token_journal
+from .tokens import RevocableRefreshToken
+from .hashing import HashingPoolSaturated, password_hashing_pool
+from .export import InvalidExportRequest, stream_export, wants_export
+from .feedback_analytics import summarize
+from .homepage_cache import TAB_SERIALIZERS, homepage_cache
+from .pagination import InvalidCursor, decode_cursor, encode_cursor, estimate_count, parse_page_size
+from django.conf import settings
 from django.db import transaction
+from django.db.models import F
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
 
 logger = logging.getLogger(__name__)
 
 
+def hashing_unavailable_response(exc):
+    """Build the 503 response returned when the hashing pool is saturated."""
+    return Response({
+        "success": False,
+        "message": "Service busy, please retry",
+        "errors": {"detail": "Password hashing capacity exceeded", "code": "hashing_busy"}
+    }, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={'Retry-After': str(exc.retry_after)})
+
+
+# Feedback columns included in streaming exports
+FEEDBACK_EXPORT_FIELDS = (
+    "id", "module", "username", "personal_no", "question1", "question2", "question3",
+    "question4", "avg_feedback", "remarks", "is_active", "insert_datetime", "modified_datetime",
+)
+
+
+def export_response(request, queryset, fields, filename, watermark_field, renamed=None):
+    """Stream ``queryset`` as NDJSON/CSV, or 400 for a bad export request."""
+    try:
+        return stream_export(request, queryset, fields, filename, watermark_field, renamed=renamed)
+    except InvalidExportRequest as e:
+        return Response({
+            "success": False,
+            "message": "Invalid export request",
+            "errors": {"detail": str(e), "code": "invalid_export"}
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+
 class LoginAPIView(APIView):
     """
     API View for user authentication using username and password.
@@ -139,7 +182,7 @@ class LoginAPIView(APIView):
         
         try:
             user = UserDetails.objects.get(userlogin=userlogin, status='1')
-            if check_password(password, user.password):
+            if password_hashing_pool.check_password(password, user.password):
                 class CustomUser:
                     def __init__(self, userlogin, role):
                         self.userlogin = userlogin
@@ -157,13 +200,8 @@ class LoginAPIView(APIView):
                 refresh['role'] = custom_user.role
                 #refresh['user_id'] = user.id
                 
-                OutstandingToken.objects.create(
-                    user=None,  # You can leave this as None or link to a dummy Django User if needed
-                    jti=refresh['jti'],
-                    token=str(refresh),
-                    created_at=datetime.utcnow(),
-                    expires_at=datetime.utcnow() + api_settings.REFRESH_TOKEN_LIFETIME
-                )
+                # Written to OutstandingToken in batches by the token journal
+                token_journal.record(refresh)
 
 
                 access_token = refresh.access_token
@@ -197,6 +235,8 @@ class LoginAPIView(APIView):
                 "message": "Invalid credentials",
                 "errors": {"detail": "User not found"}
             }, status=status.HTTP_401_UNAUTHORIZED)
+        except HashingPoolSaturated as e:
+            return hashing_unavailable_response(e)
 
 
 
@@ -223,8 +263,10 @@ class LogoutAPIView(APIView):
     """
     API View for user logout with JWT token blacklisting.
     
-    This view handles user logout by blacklisting the refresh token in PostgreSQL
-    to prevent further use, following SimpleJWT specification.
+    This view handles user logout by revoking the refresh token in the revocation
+    store to prevent further use. The PostgreSQL blacklist tables are written
+    asynchronously by the token journal as an audit trail, or before the
+    response when the store is per-process (no Redis).
     
     Frontend Integration (Angular 18+):
     ```typescript
@@ -242,7 +284,7 @@ class LogoutAPIView(APIView):
     permission_classes = [AllowAny]  
     def post(self, request, *args, **kwargs):
         """
-        Logout user by blacklisting refresh token in PostgreSQL.
+        Logout user by revoking the refresh token.
         
         Args:
             request: HTTP request containing refresh token
@@ -285,30 +327,25 @@ class LogoutAPIView(APIView):
                     }
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Blacklist token in PostgreSQL using SimpleJWT
-            token = RefreshToken(refresh_token)
-
-            
-            outstanding = OutstandingToken.objects.filter(jti=token["jti"]).first()
-            if outstanding:
-                BlacklistedToken.objects.get_or_create(token=outstanding)
-                logger.info(f"Token {token['jti']} blacklisted successfully")
-                return Response({
-                    "success": True,
-                    "message": "Logout successful"
-                }, status=status.HTTP_200_OK)
-            else:
-                logger.warning("Token not found in OutstandingToken table")
-                return Response({
-                    "success": False,
-                    "message": "Token not found",
-                    "errors": {
-                        "detail": "Token not registered",
-                        "code": "token_not_found"
-                    }
-                }, status=status.HTTP_400_BAD_REQUEST)
+            # Signature, expiry and revocation are checked on construction
+            token = RevocableRefreshToken(refresh_token)
+            token.blacklist()
+            logger.info(f"Token {token['jti']} blacklisted successfully")
+            return Response({
+                "success": True,
+                "message": "Logout successful"
+            }, status=status.HTTP_200_OK)
 
-            
+        except TokenError as e:
+            logger.warning(f"Logout with invalid token: {str(e)}")
+            return Response({
+                'success': False,
+                'message': 'Invalid token',
+                'errors': {
+                    'detail': 'Token is invalid or expired',
+                    'code': 'invalid_token'
+                }
+            }, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.error(f"Unexpected error during logout: {str(e)}")
             return Response({
@@ -384,6 +421,7 @@ class UserProfileAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
     
+    @replica_reads
     def get(self, request, *args, **kwargs):
         """
         Retrieve authenticated user's profile from PostgreSQL.
@@ -501,6 +539,8 @@ class UserProfileAPIView(APIView):
         """
         
         try:
+            previous_userlogin = request.user.userlogin
+
             # Use enhanced UserDetailsSerializer for validation and updates
             serializer = UserDetailsSerializer(
                 request.user, 
@@ -510,7 +550,8 @@ class UserProfileAPIView(APIView):
             
             if serializer.is_valid():
                 # Save updated user data to PostgreSQL
-                updated_user = serializer.save()
+                updated_user = serializer.save(update_date=timezone.now())
+                principal_cache.invalidate(previous_userlogin, updated_user.userlogin)
                 
                 # Log successful profile update
                 logger.info(
@@ -699,6 +740,7 @@ class SignUpAPIView(APIView):
         try:
             with transaction.atomic():
                 profile = UserDetails.objects.create(
+                    update_date=timezone.now(),
                     role=data["role"],
                     rank=data["rank"],
                     name=data["name"],
@@ -754,35 +796,62 @@ class SignUpAPIView(APIView):
         return ip
 
 class HomePageView(APIView):
+    """
+    Home page tab content, served from the versioned homepage cache.
+
+    POST takes ``header_name`` in the body; GET takes it as a query
+    parameter and adds Cache-Control (private by default, the endpoint
+    requires a JWT) and ``Vary: Authorization``. Both
+    return an ETag and answer a matching If-None-Match with 304.
+    """
     authentication_classes = [CustomJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
+    @replica_reads
+    def get(self, request):
+        response = self.tab_response(request, request.query_params.get('header_name'))
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['Cache-Control'] = getattr(settings, 'HOMEPAGE_CACHE_SETTINGS', {}).get(
+                'cache_control', 'private, max-age=60'
+            )
+            patch_vary_headers(response, ('Authorization',))
+        return response
+
+    @replica_reads
     def post(self, request):
-        tab_type = request.data.get('header_name')
+        return self.tab_response(request, request.data.get('header_name'))
+
+    def tab_response(self, request, tab_type):
         if not tab_type:
             return Response({"error": "tab_type is required"}, status=status.HTTP_400_BAD_REQUEST)
-        queryset = HomePageInformation.objects.filter(header_name=tab_type)
-        
-        if tab_type == 'INSTRUCTIONS':
-            serializer = InstructionsSerializer(queryset, many=True)
-        elif tab_type == 'CMMS OFFLINE':
-            serializer = OfflineSerializer(queryset, many=True)
-        elif tab_type == 'DOWNLOADS':
-            serializer = DownloadsSerializer(queryset, many=True)
-        elif tab_type == 'PUBLICATIONS':
-            serializer = PublicationsSerializer(queryset, many=True)
-        else:
+        if tab_type not in TAB_SERIALIZERS:
             return Response({"error": "Invalid tab_type"}, status=status.HTTP_400_BAD_REQUEST)
-        return Response(serializer.data)
-    
+
+        return etag_response(request, *homepage_cache.get(tab_type))
+
+
+def etag_response(request, etag, body):
+    """Return ``body``, or 304 when the client's If-None-Match has ``etag``."""
+    if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    return response
+
+
 class FeedbackAPIView(APIView):
     authentication_classes = [CustomJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
+    @replica_reads
     def get(self, request):
-        feedbacks = Feedback.objects.all()
-        serializer = FeedbackSerializer(feedbacks, many=True)
-        return Response(serializer.data)
+        if wants_export(request):
+            return export_response(
+                request, Feedback.objects.all(), FEEDBACK_EXPORT_FIELDS,
+                'feedback', 'modified_datetime',
+            )
+        return Response(list_data(FeedbackSerializer, Feedback.objects.all()))
 
     def post(self, request):
         serializer = FeedbackSerializer(data=request.data)
@@ -791,6 +860,37 @@ class FeedbackAPIView(APIView):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class FeedbackAnalyticsAPIView(APIView):
+    """
+    Per-module feedback aggregates served from FeedbackAggregate.
+
+    Query parameters:
+        module: restrict to one module
+        days: length of the daily trend (default 30, max 365)
+
+    Module-level ``count``/``mean``/``histogram`` cover every answered
+    question; ``questions`` breaks them down per question.
+    """
+    authentication_classes = [CustomJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            days = min(max(int(request.query_params.get('days', 30)), 1), 365)
+        except ValueError:
+            return Response({
+                "success": False,
+                "message": "Invalid days",
+                "errors": {"days": ["A whole number is required."]}
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "success": True,
+            "message": "Feedback analytics fetched successfully",
+            "data": summarize(module=request.query_params.get('module'), days=days)
+        }, status=status.HTTP_200_OK)
+
+
 class RoleMasterAPIView(APIView):
     authentication_classes = [CustomJWTAuthentication]
     permission_classes = [IsAuthenticated]
@@ -807,6 +907,56 @@ class RoleMasterAPIView(APIView):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+
+# --- Async read endpoints (routed instead of the views above when ASYNC_VIEWS is set) ---
+
+class AsyncUserProfileView(AsyncAPIView):
+    """GET of UserProfileAPIView served on the event loop."""
+    sync_view = UserProfileAPIView
+
+    @replica_reads
+    async def get(self, request):
+        if not isinstance(request.user, UserDetails):
+            return self.render({
+                "success": False,
+                "message": "Invalid user type",
+                "errors": {"detail": "Authenticated user is not valid"}
+            }, status=status.HTTP_401_UNAUTHORIZED)
+        return self.render({
+            "success": True,
+            "message": "Profile retrieved successfully",
+            "data": UserDetailsSerializer(request.user).data
+        })
+
+
+class AsyncHomePageView(AsyncAPIView):
+    """GET of HomePageView served on the event loop."""
+    sync_view = HomePageView
+
+    @replica_reads
+    async def get(self, request):
+        tab_type = request.GET.get('header_name')
+        if not tab_type:
+            return self.render({"error": "tab_type is required"}, status=status.HTTP_400_BAD_REQUEST)
+        if tab_type not in TAB_SERIALIZERS:
+            return self.render({"error": "Invalid tab_type"}, status=status.HTTP_400_BAD_REQUEST)
+        response = etag_response(request, *await homepage_cache.aget(tab_type))
+        response['Cache-Control'] = getattr(settings, 'HOMEPAGE_CACHE_SETTINGS', {}).get(
+            'cache_control', 'private, max-age=60'
+        )
+        patch_vary_headers(response, ('Authorization',))
+        return response
+
+
+class AsyncRoleMasterView(AsyncAPIView):
+    """GET of RoleMasterAPIView served on the event loop."""
+    sync_view = RoleMasterAPIView
+
+    async def get(self, request):
+        roles = [role async for role in RoleMaster.objects.filter(status=1)]
+        return self.render(RoleMasterSerializer(roles, many=True).data)
+
+
 class EditRoleAPIView(APIView):
     authentication_classes = [CustomJWTAuthentication]
     permission_classes = [IsAuthenticated]
@@ -867,36 +1017,88 @@ class UserManagementAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
 
+    # Columns returned per user, fetched with .values()
+    LIST_FIELDS = (
+        "id", "role", "rank", "name", "personal_no", "designation", "employee_type",
+        "establishment", "nudemail", "phone_no", "sso_user", "H", "L", "E", "X", "status",
+    )
+    # Response keys that differ from the model field names
+    LIST_RENAMED_FIELDS = {"user_login": F("userlogin"), "ship": F("ship_name")}
+    # Query parameters accepted as exact-match filters (backed by composite indexes)
+    LIST_FILTERS = ("role", "rank", "ship_name", "establishment")
+
+    @replica_reads
     def get(self, request, *args, **kwargs):
+        """
+        List active users.
+
+        Without ``cursor``/``page_size`` the full list is returned as before;
+        ``export=ndjson|csv`` streams it instead (see ``apps.users.export``).
+        An incremental export (``since``) also includes deactivated users,
+        with ``status`` "0", so consumers can drop them.
+        With either parameter the response is one keyset page plus a
+        ``pagination`` block; pass ``next_cursor`` back as ``cursor`` for the
+        following page.
+        """
         try:
-            # details = UserDetails.objects.all()
-            details = UserDetails.objects.filter(status=1)
-            data = []
-            for detail in details:
-                data.append({
-                    "id": detail.id,
-                    "user_login": detail.userlogin,
-                    "role": detail.role,
-                    "rank": detail.rank,
-                    "name": detail.name,
-                    "personal_no": detail.personal_no,
-                    "designation": detail.designation,
-                    "ship": detail.ship_name,
-                    "employee_type": detail.employee_type,
-                    "establishment": detail.establishment,
-                    "nudemail": detail.nudemail,
-                    "phone_no": detail.phone_no,
-                    "sso_user": detail.sso_user,
-                    "H": detail.H,
-                    "L": detail.L,
-                    "E": detail.E,
-                    "X": detail.X,
-                    "status": detail.status
-                })
+            filters = {
+                field: request.query_params[field]
+                for field in self.LIST_FILTERS
+                if request.query_params.get(field)
+            }
+            details = UserDetails.objects.filter(status=1, **filters)
+            if wants_export(request):
+                if request.query_params.get("since"):
+                    # Deletes only set status = 0, so emit them as tombstones
+                    details = UserDetails.objects.filter(**filters)
+                return export_response(
+                    request, details, self.LIST_FIELDS + ("update_date",),
+                    'users', 'update_date', renamed=self.LIST_RENAMED_FIELDS,
+                )
+            rows = details.order_by("id").values(*self.LIST_FIELDS, **self.LIST_RENAMED_FIELDS)
+
+            paginated = "cursor" in request.query_params or "page_size" in request.query_params
+            if not paginated:
+                return Response({
+                    "success": True,
+                    "message": "Users fetched successfully",
+                    "data": list(rows)
+                }, status=status.HTTP_200_OK)
+
+            list_settings = getattr(settings, 'USER_LIST_SETTINGS', {})
+            page_size = parse_page_size(
+                request.query_params.get("page_size"),
+                list_settings.get('default_page_size', 50),
+                list_settings.get('max_page_size', 200),
+            )
+            cursor = request.query_params.get("cursor")
+            if cursor:
+                try:
+                    rows = rows.filter(id__gt=decode_cursor(cursor))
+                except InvalidCursor:
+                    return Response({
+                        "success": False,
+                        "message": "Invalid cursor",
+                        "errors": {"cursor": ["Invalid cursor."]}
+                    }, status=status.HTTP_400_BAD_REQUEST)
+
+            # Fetch one extra row to learn whether another page exists
+            data = list(rows[:page_size + 1])
+            has_more = len(data) > page_size
+            data = data[:page_size]
             return Response({
                 "success": True,
                 "message": "Users fetched successfully",
-                "data": data
+                "data": data,
+                "pagination": {
+                    "page_size": page_size,
+                    "has_more": has_more,
+                    "next_cursor": encode_cursor(data[-1]["id"]) if has_more else None,
+                    "total_estimate": estimate_count(
+                        details, 'user_list_count', filters,
+                        list_settings.get('count_cache_ttl', 60),
+                    ),
+                }
             }, status=status.HTTP_200_OK)
         except Exception as e:
             logger.error(f"Error fetching users: {str(e)}")
@@ -926,19 +1128,23 @@ class UserManagementAPIView(APIView):
                 "message": "Passwords do not match",
                 "errors": {"password": ["Passwords do not match."], "confirm_password": ["Passwords do not match."]}
             }, status=status.HTTP_400_BAD_REQUEST)
+        # password and confirm_password are equal here, so one hash serves both
+        try:
+            password_hash = password_hashing_pool.make_password(data["password"])
+        except HashingPoolSaturated as e:
+            return hashing_unavailable_response(e)
         try:
             with transaction.atomic():
-                user = User.objects.create_user(
-                    name=data["name"],
-                    password=data["password"]
-                )
+                # Store the pooled hash rather than hashing again on the request thread
+                User.objects.create(username=data["personal_no"], password=password_hash)
                 profile = UserDetails.objects.create(
+                    update_date=timezone.now(),
                     role=data["role"],
                     rank=data["rank"],
                     name=data["name"],
                     userlogin=data["personal_no"],
-                    password=make_password(data["password"]),
-                    confirm_password=make_password(data["confirm_password"]),
+                    password=password_hash,
+                    confirm_password=password_hash,
                     personal_no=data["personal_no"],
                     designation=data["designation"],
                     ship_name=data["ship_name"],
@@ -1003,6 +1209,7 @@ class UserManagementAPIView(APIView):
                 "errors": {"id": ["User does not exist."]}
             }, status=status.HTTP_404_NOT_FOUND)
         data = request.data
+        previous_userlogin = profile.userlogin
         
         # Update password if provided and matches confirm_password
         if "password" in data and "confirm_password" in data:
@@ -1012,17 +1219,21 @@ class UserManagementAPIView(APIView):
                     "message": "Passwords do not match",
                     "errors": {"password": ["Passwords do not match."], "confirm_password": ["Passwords do not match."]}
                 }, status=status.HTTP_400_BAD_REQUEST)
-            profile.password = make_password(data["password"])
-            profile.confirm_password = make_password(data["confirm_password"])
-            profile.update_date = timezone.now()
-            profile.save()
+            try:
+                password_hash = password_hashing_pool.make_password(data["password"])
+            except HashingPoolSaturated as e:
+                return hashing_unavailable_response(e)
+            profile.password = password_hash
+            profile.confirm_password = password_hash
         for field in [
                 "role", "rank", "name", "userlogin", "personal_no", "designation", "ship_name",
                 "employee_type", "establishment", "nudemail", "phone_no", "mobile_no", "status","sso_user", "H", "L", "E", "X"
         ]:
                 if field in data:
                     setattr(profile, field, data[field])
+        profile.update_date = timezone.now()
         profile.save()
+        principal_cache.invalidate(previous_userlogin, profile.userlogin)
         return Response({
             "success": True,
             "message": "User updated successfully",
@@ -1063,6 +1274,7 @@ class UserManagementAPIView(APIView):
             profile.status = 0
             profile.update_date = timezone.now()
             profile.save()
+            principal_cache.invalidate(profile.userlogin)
             return Response({
                 "success": True,
                 "message": "User deleted successfully"
@@ -6,7 +6,7 @@ Production-ready settings with JWT authentication support.
 
 import os
 from datetime import timedelta
-from decouple import config
+from decouple import Csv, config
 
 import sys
 import os
@@ -52,6 +52,9 @@ LOCAL_APPS = [
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    'common_metrics.middleware.RequestMetricsMiddleware',
+    'common_metrics.middleware.QueryMetricsMiddleware',
+    'common_db.middleware.ReplicaStickinessMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'apps.users.middleware.SecurityHeadersMiddleware',
@@ -84,6 +87,11 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
+
+# Route the hot read endpoints to their async views (common_auth.async_views).
+# Enable only when served by config.asgi (uvicorn workers).
+ASYNC_VIEWS = config('ASYNC_VIEWS', default=False, cast=bool)
 
 # Database Configuration
 # PostgreSQL 18 configuration for production-ready authentication service
@@ -103,6 +111,37 @@ DATABASES = {
     }
 }
 
+# Server-side connection pool (psycopg 3 with psycopg_pool). Each worker
+# process shares at most DATABASE_POOL_MAX_SIZE connections between its
+# threads; Django requires CONN_MAX_AGE = 0 with a pool.
+if config('DATABASE_POOL', default=False, cast=bool):
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': config('DATABASE_POOL_MIN_SIZE', default=2, cast=int),
+        'max_size': config('DATABASE_POOL_MAX_SIZE', default=10, cast=int),
+        'timeout': config('DATABASE_POOL_TIMEOUT', default=10, cast=float),
+        'max_idle': config('DATABASE_POOL_MAX_IDLE', default=300, cast=float),
+        'max_lifetime': config('DATABASE_POOL_MAX_LIFETIME', default=3600, cast=float),
+    }
+
+# Read replicas (common_db.routers): comma separated hosts of streaming
+# replicas of the default database. Views annotated with replica_reads read
+# from them; everything else, and every write, uses the primary.
+DATABASE_REPLICA_HOSTS = config('DATABASE_REPLICA_HOSTS', default='', cast=Csv())
+for index, host in enumerate(DATABASE_REPLICA_HOSTS, 1):
+    DATABASES[f'replica{index}'] = dict(
+        DATABASES['default'], HOST=host, OPTIONS=dict(DATABASES['default']['OPTIONS']),
+        TEST={'MIRROR': 'default'},
+    )
+DATABASE_ROUTERS = ['common_db.routers.ReplicaRouter']
+REPLICA_SETTINGS = {
+    'aliases': [f'replica{index}' for index in range(1, len(DATABASE_REPLICA_HOSTS) + 1)],
+    # Reads of a user who wrote stay on the primary this long
+    'sticky_seconds': config('REPLICA_STICKY_SECONDS', default=5, cast=float),
+    'check_interval': config('REPLICA_CHECK_INTERVAL', default=5, cast=float),
+    'max_lag': config('REPLICA_MAX_LAG', default=10, cast=float),
+}
+
 # Fallback to SQLite for development if PostgreSQL is not available
 # if config('USE_SQLITE_FALLBACK', default=False, cast=bool):
 #     DATABASES = {
@@ -174,6 +213,12 @@ REST_FRAMEWORK = {
     }
 }
 
+# orjson renderer/parser, and list endpoints built from .values() rows (common_api)
+FAST_JSON = config('FAST_JSON', default=False, cast=bool)
+if FAST_JSON:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = ['common_api.renderers.ORJSONRenderer']
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'][0] = 'common_api.parsers.ORJSONParser'
+
 # Simple JWT Configuration
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=config('ACCESS_TOKEN_LIFETIME_MINUTES', default=60, cast=int)),
@@ -203,6 +248,9 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_EXP_CLAIM': 'refresh_exp',
     'SLIDING_TOKEN_LIFETIME': timedelta(minutes=5),
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
+
+    # Refresh checks the revocation store (apps.users.revocation), not the blacklist tables
+    'TOKEN_REFRESH_SERIALIZER': 'apps.users.serializers.RevocableTokenRefreshSerializer',
 }
 
 # ====================================================================
@@ -270,7 +318,8 @@ except (ImportError, redis.ConnectionError, redis.TimeoutError, Exception):
     print("⚠️  Redis not available, using memory cache backend")
 
 # Manual override for memory cache if needed
-if config('USE_MEMORY_CACHE', default=False, cast=bool):
+USE_MEMORY_CACHE = config('USE_MEMORY_CACHE', default=False, cast=bool)
+if USE_MEMORY_CACHE:
     CACHES = {
         'default': {
             'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
@@ -365,7 +414,133 @@ HEALTH_CHECK_ENDPOINTS = {
 CIRCUIT_BREAKER_SETTINGS = {
     'failure_threshold': 5,
     'recovery_timeout': 30,
-    'expected_exception': Exception
+    'expected_exception': Exception,
+    # Rolling window (seconds) for failure counts and the optional error rate trip
+    'window': config('CIRCUIT_BREAKER_WINDOW', default=60, cast=int),
+    'error_rate_threshold': config('CIRCUIT_BREAKER_ERROR_RATE', default=None, cast=lambda v: float(v) if v else None),
+    'minimum_calls': config('CIRCUIT_BREAKER_MINIMUM_CALLS', default=10, cast=int),
+    'half_open_max_calls': config('CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS', default=1, cast=int),
+    # Trips reach other workers within two sync intervals
+    'sync_interval': config('CIRCUIT_BREAKER_SYNC_INTERVAL', default=1.0, cast=float),
+}
+
+# Principal cache for CustomJWTAuthentication (common_auth.principal_cache)
+# ttl bounds how long another worker may keep serving a changed user
+PRINCIPAL_CACHE_SETTINGS = {
+    'max_entries': config('PRINCIPAL_CACHE_MAX_ENTRIES', default=1024, cast=int),
+    'ttl': config('PRINCIPAL_CACHE_TTL', default=30, cast=int),
+    'shared_ttl': config('PRINCIPAL_CACHE_SHARED_TTL', default=300, cast=int),
+}
+
+# Write-behind journal for issued refresh tokens (apps.users.token_journal)
+# 'durable' writes before the login response, 'async' flushes in the background
+# Queues are per worker process; a failed durable write is retried in the background
+TOKEN_JOURNAL_SETTINGS = {
+    'mode': config('TOKEN_JOURNAL_MODE', default='async'),
+    'batch_size': config('TOKEN_JOURNAL_BATCH_SIZE', default=100, cast=int),
+    'flush_interval': config('TOKEN_JOURNAL_FLUSH_INTERVAL', default=0.5, cast=float),
+    'max_pending': config('TOKEN_JOURNAL_MAX_PENDING', default=5000, cast=int),
+    # While the database fails: hard queue limit (extra tokens are dropped from
+    # the audit tables) and seconds between flush retries
+    'max_queue': config('TOKEN_JOURNAL_MAX_QUEUE', default=20000, cast=int),
+    'retry_backoff': config('TOKEN_JOURNAL_RETRY_BACKOFF', default=5, cast=float),
+}
+
+# Password hashing pool (apps.users.hashing), limits are per gunicorn worker
+# Requests beyond max_workers + max_queue in-flight hashes get 503 + Retry-After
+# Only sheds load with gthread/ASGI workers; a sync worker never fills its queue
+PASSWORD_HASHING_SETTINGS = {
+    'executor': config('PASSWORD_HASHING_EXECUTOR', default='process'),
+    'max_workers': config('PASSWORD_HASHING_MAX_WORKERS', default=2, cast=int),
+    'max_queue': config('PASSWORD_HASHING_MAX_QUEUE', default=8, cast=int),
+    'timeout': config('PASSWORD_HASHING_TIMEOUT', default=10, cast=int),
+    'retry_after': config('PASSWORD_HASHING_RETRY_AFTER', default=1, cast=int),
+}
+
+# Token revocation store (apps.users.revocation)
+# A token revoked on one worker may pass on others for up to sync_interval seconds
+TOKEN_REVOCATION_SETTINGS = {
+    'bloom_filter': config('TOKEN_REVOCATION_BLOOM_FILTER', default=True, cast=bool),
+    'bloom_bits': config('TOKEN_REVOCATION_BLOOM_BITS', default=2 ** 18, cast=int),
+    'bloom_hashes': config('TOKEN_REVOCATION_BLOOM_HASHES', default=7, cast=int),
+    'bucket_seconds': config('TOKEN_REVOCATION_BUCKET_SECONDS', default=86400, cast=int),
+    'sync_interval': config('TOKEN_REVOCATION_SYNC_INTERVAL', default=1.0, cast=float),
+}
+
+# Keyset pagination for the user management listing (?cursor= / ?page_size=)
+# total_estimate is cached per filter combination for count_cache_ttl seconds
+USER_LIST_SETTINGS = {
+    'default_page_size': config('USER_LIST_DEFAULT_PAGE_SIZE', default=50, cast=int),
+    'max_page_size': config('USER_LIST_MAX_PAGE_SIZE', default=200, cast=int),
+    'count_cache_ttl': config('USER_LIST_COUNT_CACHE_TTL', default=60, cast=int),
+}
+
+# Streaming NDJSON/CSV exports (?export=ndjson|csv on list endpoints)
+# chunk_size rows are fetched per server-side cursor round trip
+EXPORT_SETTINGS = {
+    'chunk_size': config('EXPORT_CHUNK_SIZE', default=2000, cast=int),
+    'buffer_size': config('EXPORT_BUFFER_SIZE', default=65536, cast=int),
+    'compression_level': config('EXPORT_COMPRESSION_LEVEL', default=6, cast=int),
+    # X-Export-Watermark lags the export start by this many seconds, so rows of
+    # write transactions still open during the export reach the next pull
+    'watermark_margin': config('EXPORT_WATERMARK_MARGIN', default=300, cast=int),
+}
+
+# Versioned cache of rendered HomePageView tabs (apps.users.homepage_cache)
+# The GET variant requires a JWT, so it is only cached by the browser by default;
+# use "public" only behind a gateway that authenticates before serving its cache
+HOMEPAGE_CACHE_SETTINGS = {
+    'ttl': config('HOMEPAGE_CACHE_TTL', default=86400, cast=int),
+    'cache_control': config('HOMEPAGE_CACHE_CONTROL', default='private, max-age=60'),
+    # TTL cap on the per-process fallback cache, which other workers cannot invalidate
+    'local_ttl': config('HOMEPAGE_CACHE_LOCAL_TTL', default=60, cast=int),
+}
+
+# Sliding-window rate limits enforced by RateLimitMiddleware (apps.users.ratelimit)
+# refund_success: successful responses do not count against the limit
+RATE_LIMIT_SETTINGS = {
+    'policies': {
+        'login': {
+            'path': '/api/v1/auth/login/',
+            'limit': config('RATE_LIMIT_LOGIN', default=5, cast=int),
+            'window': config('RATE_LIMIT_LOGIN_WINDOW', default=900, cast=int),
+            'refund_success': True,
+        },
+        'signup': {
+            'path': '/api/v1/auth/signup/',
+            'limit': config('RATE_LIMIT_SIGNUP', default=3, cast=int),
+            'window': config('RATE_LIMIT_SIGNUP_WINDOW', default=3600, cast=int),
+        },
+    },
+}
+
+# Background system sampler for /metrics/ (apps.users.system_metrics)
+# window is the number of samples kept for min/avg/max
+SYSTEM_METRICS_SETTINGS = {
+    'interval': config('SYSTEM_METRICS_INTERVAL', default=5, cast=int),
+    'window': config('SYSTEM_METRICS_WINDOW', default=60, cast=int),
+}
+
+# Per-endpoint latency histograms and counters (common_metrics.request_metrics)
+# Set METRICS_MULTIPROC_DIR to merge all gunicorn workers; empty it on startup
+REQUEST_METRICS_SETTINGS = {
+    'prefix': 'auth_service',
+    'multiprocess_dir': config('METRICS_MULTIPROC_DIR', default=''),
+    'flush_interval': config('METRICS_FLUSH_INTERVAL', default=5, cast=int),
+}
+
+# Per-request query counting (common_metrics.middleware.QueryMetricsMiddleware)
+# A query shape repeated repeat_threshold times in one request is logged as N+1
+QUERY_METRICS_SETTINGS = {
+    'repeat_threshold': config('QUERY_REPEAT_THRESHOLD', default=5, cast=int),
+    'server_timing': config('QUERY_SERVER_TIMING', default=True, cast=bool),
+}
+
+# Readiness probe (apps.users.readiness)
+# Dependency checks run concurrently and their result is reused for cache_ttl seconds
+READINESS_SETTINGS = {
+    'cache_ttl': config('READINESS_CACHE_TTL', default=2.0, cast=float),
+    'check_timeout': config('READINESS_CHECK_TIMEOUT', default=0.5, cast=float),
 }
 
 # Request Timeout Settings
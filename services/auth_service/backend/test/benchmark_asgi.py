@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""
+Throughput and tail latency of an endpoint under concurrent clients.
+
+Run it once against the service under WSGI (gunicorn sync workers) and
+once under ASGI (gunicorn with uvicorn workers and ASYNC_VIEWS=True), with
+the same worker count, and compare req/s and p99:
+
+    python test/benchmark_asgi.py --url http://localhost:8000/api/v1/auth/profile/ \\
+        --token "$ACCESS_TOKEN" --concurrency 200 --duration 30
+
+Every client keeps one HTTP/1.1 keep-alive connection open and sends its
+next request as soon as the previous response is read. Only the standard
+library is used, so the script runs from any host with Python 3.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+async def open_connection(url):
+    port = url.port or (443 if url.scheme == 'https' else 80)
+    return await asyncio.open_connection(url.hostname, port, ssl=url.scheme == 'https' or None)
+
+
+async def read_response(reader):
+    """Read one response and return its status code."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('Connection closed by server')
+    status = int(status_line.split()[1])
+    length, chunked, close = 0, False, False
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'transfer-encoding' and 'chunked' in value:
+            chunked = True
+        elif name == 'connection' and value == 'close':
+            close = True
+    if chunked:
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif length:
+        await reader.readexactly(length)
+    return status, close
+
+
+async def client(url, request, deadline, latencies, statuses, errors):
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await open_connection(url)
+            start_time = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status, close = await read_response(reader)
+            latencies.append(time.perf_counter() - start_time)
+            statuses[status] = statuses.get(status, 0) + 1
+            if close:
+                writer.close()
+                writer = None
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+            errors.append(1)
+            if writer is not None:
+                writer.close()
+            writer = None
+            await asyncio.sleep(0.01)
+    if writer is not None:
+        writer.close()
+
+
+def percentile(values, fraction):
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+async def run(args):
+    url = urlsplit(args.url)
+    target = url.path or '/'
+    if url.query:
+        target += f'?{url.query}'
+    headers = [f'GET {target} HTTP/1.1', f'Host: {url.netloc}', 'Connection: keep-alive',
+               'Accept: application/json']
+    if args.token:
+        headers.append(f'Authorization: Bearer {args.token}')
+    request = ('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1')
+
+    latencies, statuses, errors = [], {}, []
+    start_time = time.perf_counter()
+    deadline = start_time + args.duration
+    await asyncio.gather(*[
+        client(url, request, deadline, latencies, statuses, errors)
+        for _ in range(args.concurrency)
+    ])
+    elapsed = time.perf_counter() - start_time
+    return latencies, statuses, len(errors), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--url', required=True, help='Endpoint to request with GET')
+    parser.add_argument('--token', help='Bearer access token')
+    parser.add_argument('--concurrency', type=int, default=200, help='Concurrent clients (default 200)')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds to run (default 30)')
+    args = parser.parse_args()
+
+    latencies, statuses, errors, elapsed = asyncio.run(run(args))
+    print(f"{args.url} - {args.concurrency} clients, {elapsed:.1f}s")
+    if not latencies:
+        print(f"No responses ({errors} connection errors)")
+        return
+    latencies.sort()
+    print(f"  requests:   {len(latencies)} ({errors} connection errors)")
+    print(f"  statuses:   {', '.join(f'{code}: {count}' for code, count in sorted(statuses.items()))}")
+    print(f"  throughput: {len(latencies) / elapsed:.1f} req/s")
+    print(f"  latency:    mean {statistics.mean(latencies) * 1000:.1f} ms, "
+          f"p50 {percentile(latencies, 0.50) * 1000:.1f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
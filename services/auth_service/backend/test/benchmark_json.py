@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Rows per second of list serialization and JSON rendering, before and after FAST_JSON.
+
+Creates a test database with ``--rows`` feedback entries and users, then
+times building the body of ``GET /feedback/``: the serializer with DRF's
+``JSONRenderer`` (before), the same rows with ``ORJSONRenderer``, and
+``list_data`` rows from ``values_list()`` with ``ORJSONRenderer`` (after,
+what ``FAST_JSON=True`` serves). ``GET /users/manage/`` already builds its
+rows with ``.values()``, so only its renderer changes:
+
+    python test/benchmark_json.py --rows 5000 --repeat 5
+
+The query is included in every timing. Uses the test settings (SQLite)
+unless DJANGO_SETTINGS_MODULE is set.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'test_settings')
+
+import django
+
+django.setup()
+
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from common_api.renderers import ORJSONRenderer
+from common_api.serializers import list_data
+from apps.users.models import Feedback, UserDetails
+from apps.users.serializers import FeedbackSerializer
+from apps.users.views import UserManagementAPIView
+
+
+def create_rows(count):
+    now = timezone.now()
+    Feedback.objects.bulk_create([
+        Feedback(
+            module=f'Module {index % 12}', username=f'user{index}', personal_no=f'P{index:06d}',
+            question1='4', question2='5', question3='3', question4='4', avg_feedback='4.0',
+            remarks='Useful session, more hands-on exercises next time', modified_datetime=now,
+        )
+        for index in range(count)
+    ], batch_size=1000)
+    UserDetails.objects.bulk_create([
+        UserDetails(
+            role='user', rank='Lt', name=f'User {index}', userlogin=f'user{index}',
+            password='hashed', confirm_password='hashed', personal_no=f'P{index:06d}',
+            designation='Engineer', designation_email=f'user{index}@example.com',
+            ship_name=f'INS Ship {index % 40}', employee_type='Permanent', establishment='HQ',
+            nudemail=f'user{index}@example.com', phone_no='1234567890', mobile_no='1234567890',
+        )
+        for index in range(count)
+    ], batch_size=1000)
+
+
+def user_rows():
+    view = UserManagementAPIView
+    return list(
+        UserDetails.objects.filter(status=1).order_by('id')
+        .values(*view.LIST_FIELDS, **view.LIST_RENAMED_FIELDS)
+    )
+
+
+def feedback_serializer_rows():
+    return FeedbackSerializer(Feedback.objects.all(), many=True).data
+
+
+def feedback_values_rows():
+    with override_settings(FAST_JSON=True):
+        return list_data(FeedbackSerializer, Feedback.objects.all())
+
+
+def measure(build_rows, renderer, repeat):
+    best = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        rows = build_rows()
+        renderer.render({'data': rows})
+        elapsed = time.perf_counter() - start_time
+        best = elapsed if best is None else min(best, elapsed)
+    return len(rows) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=5000, help='Rows per table (default 5000)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per case, best is reported (default 5)')
+    args = parser.parse_args()
+
+    test_database = connection.creation.create_test_db(verbosity=0)
+    try:
+        create_rows(args.rows)
+        cases = [
+            ('feedback', 'ModelSerializer + JSONRenderer', feedback_serializer_rows, JSONRenderer()),
+            ('feedback', 'ModelSerializer + ORJSONRenderer', feedback_serializer_rows, ORJSONRenderer()),
+            ('feedback', 'list_data + ORJSONRenderer', feedback_values_rows, ORJSONRenderer()),
+            ('users', '.values() + JSONRenderer', user_rows, JSONRenderer()),
+            ('users', '.values() + ORJSONRenderer', user_rows, ORJSONRenderer()),
+        ]
+        print(f"{'endpoint':<10} {'serialization':<34} {'rows/s':>10}")
+        for endpoint, label, build_rows, renderer in cases:
+            rate = measure(build_rows, renderer, args.repeat)
+            print(f"{endpoint:<10} {label:<34} {rate:>10.0f}")
+    finally:
+        connection.creation.destroy_test_db(test_database, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Server connection count under load, with and without the connection pool.
+
+Starts 1, 2, 4 and 8 worker processes (like gunicorn workers), each running
+``--threads`` threads that execute a short query per simulated request and
+then release the connection the way Django does at the end of a request.
+The peak number of this service's connections in ``pg_stat_activity`` is
+sampled throughout. Run it against a PostgreSQL database:
+
+    DATABASE_POOL=False python test/load_db_pool.py --threads 16
+    DATABASE_POOL=True DATABASE_POOL_MAX_SIZE=4 python test/load_db_pool.py --threads 16
+
+With persistent connections the peak grows with workers x threads; with the
+pool it stays at or below workers x DATABASE_POOL_MAX_SIZE.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django
+
+django.setup()
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+
+def run_thread(args, deadline, counts, index):
+    while time.monotonic() < deadline:
+        with connection.cursor() as cursor:
+            cursor.execute(args.query)
+            cursor.fetchall()
+        counts[index] += 1
+        # What request_finished does after every request
+        close_old_connections()
+    connection.close()
+
+
+def run_worker(args, deadline, total):
+    counts = [0] * args.threads
+    threads = [
+        threading.Thread(target=run_thread, args=(args, deadline, counts, index))
+        for index in range(args.threads)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with total.get_lock():
+        total.value += sum(counts)
+
+
+def count_connections(application_name):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM pg_stat_activity "
+            "WHERE application_name = %s AND pid <> pg_backend_pid()",
+            [application_name],
+        )
+        return cursor.fetchone()[0]
+
+
+def run(args, workers, application_name):
+    context = multiprocessing.get_context('spawn')
+    total = context.Value('l', 0)
+    deadline = time.monotonic() + args.duration
+    processes = [
+        context.Process(target=run_worker, args=(args, deadline, total)) for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    peak = 0
+    while any(process.is_alive() for process in processes):
+        peak = max(peak, count_connections(application_name))
+        time.sleep(args.sample_interval)
+    for process in processes:
+        process.join()
+    return peak, total.value / args.duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', default='1,2,4,8', help='Comma separated worker counts')
+    parser.add_argument('--threads', type=int, default=16, help='Threads per worker (default 16)')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per run (default 10)')
+    parser.add_argument('--query', default='SELECT pg_sleep(0.005)', help='Query per request')
+    parser.add_argument('--sample-interval', type=float, default=0.1)
+    args = parser.parse_args()
+
+    database = settings.DATABASES['default']
+    if database['ENGINE'] != 'django.db.backends.postgresql':
+        parser.error('The load test needs the PostgreSQL backend')
+    application_name = database['OPTIONS'].get('application_name')
+    pool = database['OPTIONS'].get('pool')
+    if pool:
+        print(f"Connection pool: min_size {pool['min_size']}, max_size {pool['max_size']}")
+    else:
+        print(f"Persistent connections (CONN_MAX_AGE={database['CONN_MAX_AGE']})")
+    print(f"{'workers':>8} {'threads':>8} {'peak conns':>11} {'bound':>6} {'queries/s':>10}")
+
+    for workers in [int(value) for value in args.workers.split(',')]:
+        peak, rate = run(args, workers, application_name)
+        bound = workers * (pool['max_size'] if pool else args.threads)
+        print(f"{workers:>8} {args.threads:>8} {peak:>11} {bound:>6} {rate:>10.0f}")
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
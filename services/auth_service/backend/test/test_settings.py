@@ -14,7 +14,14 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': ':memory:',
-    }
+    },
+    # Stand-in read replica for the routing tests; only used when a test
+    # lists it in REPLICA_SETTINGS
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+        'TEST': {'MIRROR': 'default'},
+    },
 }
 
 # Use local memory cache for testing
@@ -38,6 +45,9 @@ MIGRATION_MODULES = DisableMigrations()
 # Reduce password validation for testing
 AUTH_PASSWORD_VALIDATORS = []
 
+# Hash on the calling thread so tests do not fork worker processes
+PASSWORD_HASHING_SETTINGS = {'executor': 'inline'}
+
 # Disable logging during tests
 LOGGING = {
     'version': 1,
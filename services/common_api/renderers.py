@@ -0,0 +1,34 @@
+"""
+orjson-based replacement for DRF's ``JSONRenderer``.
+
+Installed as the default renderer when ``FAST_JSON`` is set. The output is
+the bytes ``JSONRenderer`` produces: compact, UTF-8, with datetimes,
+decimals, lazy strings and querysets converted by DRF's own encoder. A
+request asking for an ``indent`` is rendered by ``JSONRenderer``.
+"""
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Datetimes go through JSONEncoder, which trims microseconds to milliseconds
+OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+_encoder = JSONEncoder()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Render JSON with orjson, falling back to DRF's encoder for other types.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        ret = orjson.dumps(data, default=_encoder.default, option=OPTIONS)
+        # Escaped by JSONRenderer too, as they end a line in JavaScript
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,102 @@
+"""
+Read-only list serialization from ``values_list()`` rows.
+
+``ModelSerializer(queryset, many=True).data`` builds a model instance per
+row and calls ``to_representation`` on every field of it. For a read-only
+list of plain columns ``ValuesSerializer`` produces the same rows from
+``queryset.values_list()`` tuples instead: columns whose representation is
+the database value (text, integers, booleans, foreign keys) are copied as
+they are, and only the others (datetimes, decimals, ...) go through their
+serializer field.
+
+``list_data`` uses it when ``FAST_JSON`` is set and the serializer only has
+fields backed by a concrete model column; it falls back to the serializer
+otherwise.
+"""
+
+from functools import lru_cache
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+# Fields returning the column value unchanged
+PASSTHROUGH_FIELDS = (
+    serializers.CharField, serializers.EmailField, serializers.SlugField,
+    serializers.URLField, serializers.IntegerField, serializers.BooleanField,
+    serializers.ReadOnlyField,
+)
+
+
+class ValuesSerializer:
+    """
+    The output of a ModelSerializer, built from ``values_list()`` rows.
+    """
+
+    def __init__(self, serializer_class):
+        model = serializer_class.Meta.model
+        self.names, self.sources, self.converters = [], [], []
+        for field in serializer_class().fields.values():
+            if field.write_only:
+                continue
+            column = self.column(model, field)
+            if column is None:
+                raise ValueError(f'{serializer_class.__name__}.{field.field_name} is not a plain column')
+            if type(field) not in PASSTHROUGH_FIELDS and not self.is_primary_key(field):
+                self.converters.append((len(self.names), field.to_representation))
+            self.names.append(field.field_name)
+            self.sources.append(column)
+
+    @staticmethod
+    def column(model, field):
+        """Return the model field name behind ``field``, or None."""
+        if isinstance(field, (serializers.BaseSerializer, serializers.ManyRelatedField)):
+            return None
+        if field.source == '*' or '.' in field.source:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.many_to_many:
+            return None
+        return field.source
+
+    @staticmethod
+    def is_primary_key(field):
+        return type(field) is serializers.PrimaryKeyRelatedField and field.pk_field is None
+
+    def data(self, queryset):
+        """Return the serialized rows of ``queryset``."""
+        names, converters = self.names, self.converters
+        rows = queryset.values_list(*self.sources)
+        if not converters:
+            return [dict(zip(names, row)) for row in rows]
+        data = []
+        for row in rows:
+            row = list(row)
+            for index, convert in converters:
+                if row[index] is not None:
+                    row[index] = convert(row[index])
+            data.append(dict(zip(names, row)))
+        return data
+
+
+@lru_cache(maxsize=256)
+def values_serializer(serializer_class):
+    """Return the ``ValuesSerializer`` of ``serializer_class``, or None if it has computed fields."""
+    try:
+        return ValuesSerializer(serializer_class)
+    except ValueError:
+        return None
+
+
+def list_data(serializer_class, queryset):
+    """
+    Return ``serializer_class(queryset, many=True).data``, built from
+    ``values_list()`` rows when ``FAST_JSON`` is set.
+    """
+    if getattr(settings, 'FAST_JSON', False):
+        serializer = values_serializer(serializer_class)
+        if serializer is not None:
+            return serializer.data(queryset)
+    return serializer_class(queryset, many=True).data
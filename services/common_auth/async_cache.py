@@ -0,0 +1,87 @@
+"""
+Non-blocking access to the default cache for async views.
+
+Django's ``cache.aget``/``aset`` run the synchronous client in a thread.
+With the django-redis backend, the functions here talk to Redis
+through a ``redis.asyncio`` client instead (one per event loop), using the
+backend's own key function and serializer so entries are shared with
+synchronous code. Other backends (the local memory cache in development
+and tests) fall back to ``cache.aget``/``aset``.
+
+Clients live as long as their event loop, so this only pays off under an
+ASGI server; under WSGI every async view call gets a fresh loop.
+"""
+
+import asyncio
+import weakref
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+_clients = weakref.WeakKeyDictionary()
+
+
+def uses_redis():
+    """Return True if the default cache is django-redis."""
+    if getattr(settings, 'USE_MEMORY_CACHE', False):
+        return False
+    return settings.CACHES.get('default', {}).get('BACKEND', '').startswith('django_redis')
+
+
+def get_async_client():
+    """Return the ``redis.asyncio`` client of the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        import redis.asyncio as redis_asyncio
+        location = settings.CACHES['default']['LOCATION']
+        if isinstance(location, (list, tuple)):
+            location = location[0]
+        client = _clients[loop] = redis_asyncio.from_url(location)
+    return client
+
+
+async def aget(key, default=None):
+    """Return the cached value of ``key`` or ``default``."""
+    if not uses_redis():
+        return await cache.aget(key, default)
+    value = await get_async_client().get(cache.client.make_key(key))
+    return default if value is None else cache.client.decode(value)
+
+
+async def aget_many(keys):
+    """Return a dict of the cached values of ``keys`` like ``cache.get_many``."""
+    if not uses_redis():
+        return await cache.aget_many(keys)
+    values = await get_async_client().mget([cache.client.make_key(key) for key in keys])
+    return {
+        key: cache.client.decode(value)
+        for key, value in zip(keys, values) if value is not None
+    }
+
+
+async def aadd(key, value, timeout=DEFAULT_TIMEOUT):
+    """Store ``value`` under ``key`` unless it exists, like ``cache.add``."""
+    if not uses_redis():
+        return await cache.aadd(key, value, timeout)
+    if timeout is DEFAULT_TIMEOUT:
+        timeout = cache.default_timeout
+    return bool(await get_async_client().set(
+        cache.client.make_key(key), cache.client.encode(value), nx=True,
+        px=int(timeout * 1000) if timeout is not None else None,
+    ))
+
+
+async def aset(key, value, timeout=DEFAULT_TIMEOUT):
+    """Store ``value`` under ``key`` like ``cache.set``."""
+    if not uses_redis():
+        return await cache.aset(key, value, timeout)
+    if timeout is DEFAULT_TIMEOUT:
+        timeout = cache.default_timeout
+    nkey = cache.client.make_key(key)
+    if timeout is not None and timeout <= 0:
+        await get_async_client().delete(nkey)
+        return
+    await get_async_client().set(
+        nkey, cache.client.encode(value), px=int(timeout * 1000) if timeout is not None else None
+    )
@@ -0,0 +1,122 @@
+"""
+Async counterparts of DRF ``APIView`` for hot read endpoints.
+
+DRF views are synchronous, so under ASGI every request to one is handed to
+a worker thread. ``AsyncAPIView`` serves GET on the event loop instead,
+using the authentication, permission and throttle classes of its
+``sync_view``. Authentication classes with an ``aauthenticate`` coroutine
+resolve the user without blocking; others, and the throttles, run in a
+thread. Every other method is passed to ``sync_view`` unchanged, so a URL
+keeps its synchronous writes.
+
+Async views are only routed when ``ASYNC_VIEWS`` is set (see
+``select_view``); they pay off under ``config.asgi`` and cost an event loop
+per request under WSGI.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions
+from rest_framework.settings import api_settings
+
+
+class AsyncAPIView(View):
+    """
+    Async GET handler sharing the auth and throttling policy of ``sync_view``.
+    """
+
+    sync_view = None
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        # Token authenticated like the DRF views, so no CSRF check
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method != 'GET':
+            view = self.sync_view.as_view()
+            return await sync_to_async(view)(request, *args, **kwargs)
+        try:
+            await self.initial(request)
+            response = await self.get(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return self.exception_response(request, exc)
+        return self.finalize(response)
+
+    async def initial(self, request):
+        """Authenticate, then check permissions and throttles like ``APIView.initial``."""
+        request.user, request.auth = None, None
+        for authenticator in self.get_authenticators():
+            if hasattr(authenticator, 'aauthenticate'):
+                result = await authenticator.aauthenticate(request)
+            else:
+                result = await sync_to_async(authenticator.authenticate)(request)
+            if result is not None:
+                request.user, request.auth = result
+                break
+        else:
+            request.user = AnonymousUser()
+
+        for permission in [permission() for permission in self.sync_view.permission_classes]:
+            if not permission.has_permission(request, self):
+                if request.auth is None:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, 'message', None))
+
+        waits = await sync_to_async(self.check_throttles)(request)
+        if waits:
+            raise exceptions.Throttled(max(waits))
+
+    def check_throttles(self, request):
+        """Return the waits of the throttles refusing the request."""
+        waits = []
+        for throttle in [throttle() for throttle in self.sync_view.throttle_classes]:
+            if not throttle.allow_request(request, self):
+                waits.append(throttle.wait() or 0)
+        return waits
+
+    def renderer(self):
+        # JSONRenderer, or ORJSONRenderer when FAST_JSON is set
+        return api_settings.DEFAULT_RENDERER_CLASSES[0]()
+
+    def get_authenticators(self):
+        return [authenticator() for authenticator in self.sync_view.authentication_classes]
+
+    def render(self, data, status=200):
+        """Return ``data`` rendered by the default renderer of the DRF views."""
+        return HttpResponse(self.renderer().render(data), content_type='application/json', status=status)
+
+    def finalize(self, response):
+        """Render a DRF ``Response`` returned by shared synchronous helpers."""
+        if hasattr(response, 'accepted_renderer') or not hasattr(response, 'data'):
+            return response
+        response.accepted_renderer = self.renderer()
+        response.accepted_media_type = response.accepted_renderer.media_type
+        response.renderer_context = {}
+        return response.render()
+
+    def exception_response(self, request, exc):
+        """Build the response DRF's exception handler would send for ``exc``."""
+        response = self.render({'detail': exc.detail}, status=exc.status_code)
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            authenticators = self.get_authenticators()
+            header = authenticators[0].authenticate_header(request) if authenticators else None
+            if header:
+                response['WWW-Authenticate'] = header
+            else:
+                response.status_code = exceptions.PermissionDenied.status_code
+        if isinstance(exc, exceptions.Throttled) and exc.wait is not None:
+            response['Retry-After'] = '%d' % exc.wait
+        return response
+
+
+def select_view(async_view):
+    """Return ``async_view`` when ASYNC_VIEWS is on, else its synchronous view."""
+    if getattr(settings, 'ASYNC_VIEWS', False):
+        return async_view.as_view()
+    return async_view.sync_view.as_view()
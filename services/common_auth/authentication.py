@@ -2,6 +2,7 @@ import jwt
 from rest_framework import authentication, exceptions
 from django.conf import settings
 from apps.users.models import UserDetails
+from common_auth.principal_cache import principal_cache
 
 
 # class CustomJWTAuthentication(JWTAuthentication):
@@ -19,6 +20,26 @@ from apps.users.models import UserDetails
 
 class CustomJWTAuthentication(authentication.BaseAuthentication):
     def authenticate(self, request):
+        payload = self.decode_token(request)
+        if payload is None:
+            return None
+        user = principal_cache.get(payload['userlogin'])
+        if user is None:
+            raise exceptions.AuthenticationFailed('User not found')
+        return (user, payload)
+
+    async def aauthenticate(self, request):
+        """``authenticate`` for async views, resolving the user without blocking."""
+        payload = self.decode_token(request)
+        if payload is None:
+            return None
+        user = await principal_cache.aget(payload['userlogin'])
+        if user is None:
+            raise exceptions.AuthenticationFailed('User not found')
+        return (user, payload)
+
+    def decode_token(self, request):
+        """Return the verified payload of the bearer token, or None without one."""
         auth_header = request.headers.get('Authorization')
         if not auth_header or not auth_header.startswith('Bearer '):
             return None
@@ -29,11 +50,6 @@ class CustomJWTAuthentication(authentication.BaseAuthentication):
             raise exceptions.AuthenticationFailed('Token expired')
         except jwt.InvalidTokenError:
             raise exceptions.AuthenticationFailed('Invalid token')
-        userlogin = payload.get('userlogin')
-        if not userlogin:
+        if not payload.get('userlogin'):
             raise exceptions.AuthenticationFailed('Token missing userlogin')
-        try:
-            user = UserDetails.objects.get(userlogin=userlogin, status='1')
-        except UserDetails.DoesNotExist:
-            raise exceptions.AuthenticationFailed('User not found')
-        return (user, payload)
\ No newline at end of file
+        return payload
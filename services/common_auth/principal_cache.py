@@ -0,0 +1,201 @@
+"""
+Principal resolution cache for JWT-authenticated requests.
+
+Resolving the ``userlogin`` claim of a verified token to a ``UserDetails``
+row is done on every authenticated request. This module keeps a snapshot of
+the active user's non-secret columns in a size-bounded in-process LRU with a
+short TTL, backed by the shared Django cache, so most requests never reach
+the auth database.
+
+Invalidation is explicit: views that change a user call
+``principal_cache.invalidate(userlogin)`` after saving, which drops the
+entry locally and bumps the user's generation counter in the shared cache.
+Shared entries carry the generation read before their database lookup and
+are ignored once it changes, so a lookup racing with a save can never put
+the old row back for ``shared_ttl``. Other workers keep their local copy
+for at most ``ttl`` seconds, so keep that value short.
+"""
+
+import threading
+import time
+import logging
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from apps.users.models import UserDetails
+from common_auth import async_cache
+
+logger = logging.getLogger(__name__)
+
+# Password hashes are never copied into the cache; they stay deferred on the
+# rebuilt instance and are loaded from the database only if accessed.
+SECRET_FIELDS = ('password', 'confirm_password')
+PRINCIPAL_FIELDS = tuple(
+    field.attname for field in UserDetails._meta.concrete_fields
+    if field.attname not in SECRET_FIELDS
+)
+
+
+class PrincipalCache:
+    """
+    Two-level (process LRU + shared cache) store of active user snapshots.
+    """
+
+    def __init__(self, max_entries=1024, ttl=30, shared_ttl=300, key_prefix='principal'):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.shared_ttl = shared_ttl
+        self.key_prefix = key_prefix
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            'local_hits': 0,
+            'shared_hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'invalidations': 0,
+        }
+
+    def get(self, userlogin):
+        """Return an active ``UserDetails`` for ``userlogin`` or None."""
+        snapshot = self._get_local(userlogin)
+        if snapshot is None:
+            shared_key, generation_key = self._shared_key(userlogin), self._generation_key(userlogin)
+            values = cache.get_many([shared_key, generation_key])
+            generation = values.get(generation_key)
+            if generation is None:
+                cache.add(generation_key, int(time.time()), None)
+                generation = cache.get(generation_key)
+            snapshot = self._shared_snapshot(values.get(shared_key), generation)
+            if snapshot is not None:
+                self._count('shared_hits')
+            else:
+                self._count('misses')
+                snapshot = (
+                    UserDetails.objects
+                    .filter(userlogin=userlogin, status='1')
+                    .values(*PRINCIPAL_FIELDS)
+                    .first()
+                )
+                if snapshot is None:
+                    return None
+                cache.set(shared_key, (generation, snapshot), timeout=self.shared_ttl)
+            self._set_local(userlogin, snapshot)
+
+        return self._build_instance(snapshot)
+
+    async def aget(self, userlogin):
+        """``get`` for async views; cache and database lookups do not block the loop."""
+        snapshot = self._get_local(userlogin)
+        if snapshot is None:
+            shared_key, generation_key = self._shared_key(userlogin), self._generation_key(userlogin)
+            values = await async_cache.aget_many([shared_key, generation_key])
+            generation = values.get(generation_key)
+            if generation is None:
+                await async_cache.aadd(generation_key, int(time.time()), None)
+                generation = await async_cache.aget(generation_key)
+            snapshot = self._shared_snapshot(values.get(shared_key), generation)
+            if snapshot is not None:
+                self._count('shared_hits')
+            else:
+                self._count('misses')
+                snapshot = await (
+                    UserDetails.objects
+                    .filter(userlogin=userlogin, status='1')
+                    .values(*PRINCIPAL_FIELDS)
+                    .afirst()
+                )
+                if snapshot is None:
+                    return None
+                await async_cache.aset(shared_key, (generation, snapshot), timeout=self.shared_ttl)
+            self._set_local(userlogin, snapshot)
+
+        return self._build_instance(snapshot)
+
+    def invalidate(self, *userlogins):
+        """Drop cached snapshots for the given userlogins; call it after the change is saved."""
+        userlogins = [u for u in userlogins if u]
+        if not userlogins:
+            return
+        with self._lock:
+            for userlogin in userlogins:
+                self._entries.pop(userlogin, None)
+            self._stats['invalidations'] += len(userlogins)
+        for userlogin in userlogins:
+            # Snapshots read before the save are stored under the old generation
+            try:
+                cache.incr(self._generation_key(userlogin))
+            except ValueError:
+                cache.set(self._generation_key(userlogin), int(time.time()), None)
+        cache.delete_many([self._shared_key(u) for u in userlogins])
+        logger.debug(f"Principal cache invalidated for: {', '.join(userlogins)}")
+
+    def clear(self):
+        """Drop every locally cached snapshot."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+        lookups = stats['local_hits'] + stats['shared_hits'] + stats['misses']
+        stats['hit_ratio'] = round((lookups - stats['misses']) / lookups, 4) if lookups else 0.0
+        return stats
+
+    def _get_local(self, userlogin):
+        """Return a fresh local snapshot, refreshing its LRU position."""
+        with self._lock:
+            entry = self._entries.get(userlogin)
+            if entry is None:
+                return None
+            expires_at, snapshot = entry
+            if expires_at < time.monotonic():
+                del self._entries[userlogin]
+                return None
+            self._entries.move_to_end(userlogin)
+            self._stats['local_hits'] += 1
+            return snapshot
+
+    def _set_local(self, userlogin, snapshot):
+        """Store a snapshot locally, evicting the least recently used entries."""
+        with self._lock:
+            self._entries[userlogin] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(userlogin)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _shared_key(self, userlogin):
+        return f"{self.key_prefix}:{userlogin}"
+
+    def _generation_key(self, userlogin):
+        return f"{self.key_prefix}:generation:{userlogin}"
+
+    @staticmethod
+    def _shared_snapshot(entry, generation):
+        """Return the snapshot of a shared ``(generation, snapshot)`` entry if it is current."""
+        if entry is None or entry[0] != generation:
+            return None
+        return entry[1]
+
+    def _build_instance(self, snapshot):
+        """Rebuild a per-request model instance with secret fields deferred."""
+        return UserDetails.from_db(
+            DEFAULT_DB_ALIAS,
+            list(PRINCIPAL_FIELDS),
+            [snapshot[name] for name in PRINCIPAL_FIELDS],
+        )
+
+
+principal_cache = PrincipalCache(
+    max_entries=getattr(settings, 'PRINCIPAL_CACHE_SETTINGS', {}).get('max_entries', 1024),
+    ttl=getattr(settings, 'PRINCIPAL_CACHE_SETTINGS', {}).get('ttl', 30),
+    shared_ttl=getattr(settings, 'PRINCIPAL_CACHE_SETTINGS', {}).get('shared_ttl', 300),
+)
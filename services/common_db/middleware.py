@@ -0,0 +1,65 @@
+"""
+Middleware tracking writes for read-replica stickiness (see ``routers``).
+"""
+
+import logging
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from .routers import _request_state, replica_aliases, sticky_key
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Note whether a request wrote to the primary and, if it did, keep the
+    user's reads on the primary for ``sticky_seconds`` so the next request
+    does not read from a replica that has not replayed the write yet.
+
+    The user is read after the view ran, so users authenticated by DRF
+    (JWT) are covered.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sticky_seconds = getattr(settings, 'REPLICA_SETTINGS', {}).get('sticky_seconds', 5)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        state = {'wrote': False}
+        token = _request_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+        if state['wrote'] and replica_aliases():
+            self.remember_write(request)
+        return response
+
+    async def __acall__(self, request):
+        state = {'wrote': False}
+        token = _request_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_state.reset(token)
+        if state['wrote'] and replica_aliases():
+            await sync_to_async(self.remember_write)(request)
+        return response
+
+    def remember_write(self, request):
+        key = sticky_key(getattr(request, 'user', None))
+        if key is None:
+            return
+        try:
+            cache.set(key, 1, self.sticky_seconds)
+        except Exception as e:
+            logger.warning(f"Could not record write for replica stickiness: {str(e)}")
@@ -0,0 +1,242 @@
+"""
+Read-replica routing for read-only views.
+
+Writes always go to the primary. Reads go to the primary too, unless the
+view method handling the request is annotated with ``replica_reads``; its
+reads then go to one replica from ``REPLICA_SETTINGS['aliases']``, picked
+once per request. Install ``ReplicaRouter`` in ``DATABASE_ROUTERS`` and
+``ReplicaStickinessMiddleware`` in ``MIDDLEWARE``.
+
+Replication lag is handled in three ways:
+    - A request that has written reads its own writes from the primary.
+    - A user who wrote reads from the primary for ``sticky_seconds``
+      afterwards; ``ReplicaStickinessMiddleware`` records the write in the
+      shared cache.
+    - ``ReplicaHealth`` checks each replica at most every
+      ``check_interval`` seconds (``SELECT 1``, plus the replay lag on
+      PostgreSQL) and takes replicas that fail or are more than ``max_lag``
+      seconds behind out of rotation until a later check passes.
+
+A view that fails with ``OperationalError`` while reading from a replica
+triggers a recheck of the replica and is run again on the primary.
+
+Content rendered into a shared cache outlives the request, so cache fills
+must not read from a lagging replica; run them inside ``primary_reads()``.
+"""
+
+import random
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+
+logger = logging.getLogger(__name__)
+
+# Replica chosen for the reads of the current request, if any
+_read_alias = ContextVar('replica_read_alias', default=None)
+# {'wrote': bool} of the current request, set by ReplicaStickinessMiddleware
+_request_state = ContextVar('replica_request_state', default=None)
+
+# Seconds the replica is behind; 0 when it has replayed everything it received
+REPLICATION_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+def replica_aliases():
+    """Return the configured replica aliases."""
+    return getattr(settings, 'REPLICA_SETTINGS', {}).get('aliases', [])
+
+
+def sticky_key(user):
+    """Return the cache key marking ``user``'s recent writes, or None if anonymous."""
+    identity = getattr(user, 'userlogin', None) or getattr(user, 'pk', None)
+    if identity is None or not getattr(user, 'is_authenticated', False):
+        return None
+    return f"replica:sticky:{identity}"
+
+
+class ReplicaRouter:
+    """
+    Database router sending annotated reads to the request's replica.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None:
+            return None
+        state = _request_state.get()
+        if state is not None and state['wrote']:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state['wrote'] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replica_aliases():
+            return False
+        return None
+
+
+class ReplicaHealth:
+    """
+    Periodic availability and lag checks of the replicas of this process.
+    """
+
+    def __init__(self, check_interval=5.0, max_lag=10.0):
+        self.check_interval = check_interval
+        self.max_lag = max_lag
+        self._lock = threading.Lock()
+        self._state = {}
+        self._stats = {'checks': 0, 'failed_checks': 0, 'failovers': 0}
+
+    def available(self, aliases):
+        """Return the healthy ones of ``aliases``, checking those that are due."""
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            for alias in aliases:
+                state = self._state.setdefault(alias, {'healthy': False, 'lag': None, 'checked_at': None})
+                if state['checked_at'] is None or now - state['checked_at'] >= self.check_interval:
+                    # Claim the check; other threads keep using the last result meanwhile
+                    state['checked_at'] = now
+                    due.append(alias)
+        for alias in due:
+            self.check(alias)
+        with self._lock:
+            return [alias for alias in aliases if self._state[alias]['healthy']]
+
+    def check(self, alias):
+        """Check ``alias`` now and return whether it can serve reads."""
+        healthy, lag = False, None
+        try:
+            lag = self._replication_lag(connections[alias])
+            healthy = lag <= self.max_lag
+            if not healthy:
+                logger.warning(f"Replica {alias} is {lag:.1f}s behind, reading from primary")
+        except Exception as e:
+            connections[alias].close()
+            logger.warning(f"Replica {alias} unavailable, reading from primary: {str(e)}")
+        with self._lock:
+            self._state[alias] = {'healthy': healthy, 'lag': lag, 'checked_at': time.monotonic()}
+            self._stats['checks'] += 1
+            if not healthy:
+                self._stats['failed_checks'] += 1
+        return healthy
+
+    def failed(self, alias, exc):
+        """Recheck ``alias`` after a view failed reading from it."""
+        logger.warning(f"Read from replica {alias} failed, retrying on primary: {str(exc)}")
+        with self._lock:
+            self._stats['failovers'] += 1
+        self.check(alias)
+
+    def stats(self):
+        """Return check counters and the last state of every replica."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['replicas'] = {
+                alias: {'healthy': state['healthy'], 'lag_seconds': state['lag']}
+                for alias, state in self._state.items()
+            }
+        return stats
+
+    def _replication_lag(self, connection):
+        with connection.cursor() as cursor:
+            if connection.vendor != 'postgresql':
+                cursor.execute("SELECT 1")
+                return 0.0
+            cursor.execute(REPLICATION_LAG_SQL)
+            return float(cursor.fetchone()[0])
+
+
+replica_health = ReplicaHealth(
+    check_interval=getattr(settings, 'REPLICA_SETTINGS', {}).get('check_interval', 5.0),
+    max_lag=getattr(settings, 'REPLICA_SETTINGS', {}).get('max_lag', 10.0),
+)
+
+
+def choose_replica(user=None):
+    """Return a healthy replica for ``user``'s reads, or None to use the primary."""
+    aliases = replica_aliases()
+    if not aliases:
+        return None
+    key = sticky_key(user)
+    try:
+        if key is not None and cache.get(key):
+            return None
+    except Exception as e:
+        logger.warning(f"Replica stickiness unavailable, reading from primary: {str(e)}")
+        return None
+    aliases = replica_health.available(aliases)
+    return random.choice(aliases) if aliases else None
+
+
+def reads_from_replica():
+    """Return True if reads in this context go to a replica."""
+    return _read_alias.get() is not None
+
+
+@contextmanager
+def primary_reads():
+    """Send the reads of this block to the primary."""
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def replica_reads(view_method):
+    """
+    Annotate a read-only view method: its reads go to a replica unless the
+    user wrote recently, and it is run again on the primary if the replica
+    fails.
+    """
+    if iscoroutinefunction(view_method):
+        @wraps(view_method)
+        async def async_wrapper(view, request, *args, **kwargs):
+            alias = await sync_to_async(choose_replica)(request.user)
+            if alias is not None:
+                token = _read_alias.set(alias)
+                try:
+                    return await view_method(view, request, *args, **kwargs)
+                except OperationalError as e:
+                    await sync_to_async(replica_health.failed)(alias, e)
+                finally:
+                    _read_alias.reset(token)
+            return await view_method(view, request, *args, **kwargs)
+        return async_wrapper
+
+    @wraps(view_method)
+    def wrapper(view, request, *args, **kwargs):
+        alias = choose_replica(request.user)
+        if alias is not None:
+            token = _read_alias.set(alias)
+            try:
+                return view_method(view, request, *args, **kwargs)
+            except OperationalError as e:
+                replica_health.failed(alias, e)
+            finally:
+                _read_alias.reset(token)
+        return view_method(view, request, *args, **kwargs)
+    return wrapper
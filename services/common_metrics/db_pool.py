@@ -0,0 +1,73 @@
+"""
+Statistics of the psycopg 3 connection pools of the database aliases.
+
+With ``DATABASE_POOL`` enabled a service's ``DATABASES`` entry carries
+``OPTIONS['pool']`` and Django hands out connections from a
+``psycopg_pool.ConnectionPool`` shared by all threads of the worker,
+instead of keeping one persistent connection per thread. The number of
+server connections is then bounded by ``max_size`` per worker process,
+whatever the thread count.
+
+Connections are returned to the pool when Django closes them: at the end
+of every request, and through ``release_connection`` for long-lived
+background threads that would otherwise hold one between checks.
+"""
+
+from django.db import connections
+
+# psycopg_pool counter -> exported name
+POOL_GAUGES = (
+    ('pool_min', 'min_size'),
+    ('pool_max', 'max_size'),
+    ('pool_size', 'size'),
+    ('pool_available', 'available'),
+    ('requests_waiting', 'waiting'),
+)
+POOL_COUNTERS = (
+    ('requests_num', 'requests'),
+    ('requests_queued', 'requests_queued'),
+    ('requests_wait_ms', 'requests_wait_ms'),
+    ('requests_errors', 'request_errors'),
+    ('connections_num', 'connections_opened'),
+    ('connections_errors', 'connection_errors'),
+    ('connections_lost', 'connections_lost'),
+    ('returns_bad', 'returns_bad'),
+)
+
+
+def is_pooled(alias):
+    """Return True if ``alias`` is configured with a connection pool."""
+    settings_dict = connections.settings[alias]
+    return bool(settings_dict.get('OPTIONS', {}).get('pool')) and 'postgresql' in settings_dict['ENGINE']
+
+
+def pool_stats():
+    """Return ``{alias: stats}`` for every pooled database alias of this worker."""
+    stats = {}
+    for alias in connections:
+        if not is_pooled(alias):
+            continue
+        counters = connections[alias].pool.get_stats()
+        stats[alias] = {name: counters.get(key, 0) for key, name in POOL_GAUGES + POOL_COUNTERS}
+    return stats
+
+
+def render_prometheus(prefix):
+    """Render ``pool_stats()`` as Prometheus text, one label per alias."""
+    stats = pool_stats()
+    if not stats:
+        return ''
+    lines = []
+    for counters, kind, suffix in ((POOL_GAUGES, 'gauge', ''), (POOL_COUNTERS, 'counter', '_total')):
+        for _, counter in counters:
+            name = f'{prefix}_db_pool_{counter}{suffix}'
+            lines.append(f'# TYPE {name} {kind}')
+            for alias, values in sorted(stats.items()):
+                lines.append(f'{name}{{database="{alias}"}} {values[counter]}')
+    return '\n'.join(lines) + '\n'
+
+
+def release_connection(connection):
+    """Return a background thread's pooled connection; persistent ones are kept."""
+    if is_pooled(connection.alias):
+        connection.close()
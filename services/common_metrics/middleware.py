@@ -0,0 +1,137 @@
+"""
+Middleware recording per-endpoint latency, status codes, in-flight requests
+and SQL queries into ``common_metrics.request_metrics``.
+
+Both middleware run natively in sync and async chains, so under ASGI they
+do not force async views back onto a thread.
+"""
+
+import time
+import logging
+from contextlib import ExitStack
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.urls import Resolver404, resolve
+from .queries import record_queries
+from .request_metrics import request_metrics
+
+logger = logging.getLogger(__name__)
+
+UNRESOLVED = '<unresolved>'
+
+
+class RequestMetricsMiddleware:
+    """
+    Time every request and label it with the resolved URL name.
+
+    Requests answered by earlier middleware (rate limiting, redirects)
+    never reach URL resolution; they are labelled by resolving the path
+    here instead. Streaming responses are timed until the response object
+    is returned, not until the body is sent.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start_time = time.perf_counter()
+        request._metrics_view = None
+        response = self.get_response(request)
+        self.finish(request, response, time.perf_counter() - start_time)
+        return response
+
+    async def __acall__(self, request):
+        start_time = time.perf_counter()
+        request._metrics_view = None
+        response = await self.get_response(request)
+        self.finish(request, response, time.perf_counter() - start_time)
+        return response
+
+    def finish(self, request, response, duration):
+        view_name = request._metrics_view
+        in_flight = view_name is not None
+        if view_name is None:
+            view_name = resolve_view_name(request)
+        request_metrics.finish(view_name, request.method, response.status_code, duration, in_flight)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        request._metrics_view = (match.view_name if match else None) or UNRESOLVED
+        request_metrics.start(request._metrics_view)
+        return None
+
+
+class QueryMetricsMiddleware:
+    """
+    Count the queries and DB time of every request and flag N+1 patterns.
+
+    A request running one query shape ``repeat_threshold`` times or more is
+    logged with the offending SQL shape and counted in the metrics. The
+    totals are sent back in a ``Server-Timing`` header, visible in the
+    browser's network panel. Queries run while a streaming response is
+    being consumed are not counted.
+
+    Database connections are per thread, and async views run their queries
+    through ``sync_to_async``, which under ASGI uses one thread per request.
+    In an async chain the recorder is therefore installed on that thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.repeat_threshold = getattr(settings, 'QUERY_METRICS_SETTINGS', {}).get('repeat_threshold', 5)
+        self.server_timing = getattr(settings, 'QUERY_METRICS_SETTINGS', {}).get('server_timing', True)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with record_queries() as recorder:
+            response = self.get_response(request)
+        return self.report(request, response, recorder)
+
+    async def __acall__(self, request):
+        stack = ExitStack()
+        recorder = await sync_to_async(stack.enter_context)(record_queries())
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.report(request, response, recorder)
+
+    def report(self, request, response, recorder):
+        view_name = getattr(request, '_metrics_view', None) or resolve_view_name(request)
+        repeated = recorder.repeated(self.repeat_threshold)
+        for shape, count in repeated.items():
+            logger.warning(f"Repeated query in {view_name} ({count}x, possible N+1): {shape[:300]}")
+        request_metrics.record_queries(
+            view_name, request.method, recorder.count, recorder.duration, repeated
+        )
+
+        if self.server_timing:
+            timing = f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries'
+            timing += f', {len(repeated)} repeated"' if repeated else '"'
+            if response.has_header('Server-Timing'):
+                timing = f"{response['Server-Timing']}, {timing}"
+            response['Server-Timing'] = timing
+        return response
+
+
+def resolve_view_name(request):
+    """Return the URL name for ``request.path_info``, or UNRESOLVED."""
+    try:
+        return resolve(request.path_info).view_name or UNRESOLVED
+    except Resolver404:
+        return UNRESOLVED
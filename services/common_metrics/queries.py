@@ -0,0 +1,69 @@
+"""
+SQL query recording for requests and tests.
+
+``record_queries()`` installs a ``connection.execute_wrapper`` on every
+database connection of the current thread and counts the queries, their
+total duration and how often each query *shape* ran. The shape is the SQL
+with literals and ``IN (...)`` lists collapsed, so the same lookup repeated
+once per row (an N+1 pattern) shows up as one shape with a high count.
+"""
+
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from django.db import connections
+
+_string_literal = re.compile(r"'(?:[^']|'')*'")
+_number_literal = re.compile(r'\b\d+(?:\.\d+)?\b')
+_placeholder_list = re.compile(r'\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)')
+_whitespace = re.compile(r'\s+')
+
+
+def query_shape(sql):
+    """Return ``sql`` with literals and placeholder lists normalized."""
+    shape = _string_literal.sub('?', sql)
+    shape = _number_literal.sub('?', shape)
+    shape = shape.replace('%s', '?')
+    shape = _placeholder_list.sub('(...)', shape)
+    return _whitespace.sub(' ', shape).strip()
+
+
+class QueryRecorder:
+    """
+    ``execute_wrapper`` callable counting queries, DB time and shapes.
+    """
+
+    def __init__(self, keep_sql=False):
+        self.keep_sql = keep_sql
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start_time = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start_time
+            self.count += 1
+            self.duration += duration
+            self.shapes[query_shape(sql)] += 1
+            if self.keep_sql:
+                self.queries.append((sql, duration))
+
+    def repeated(self, threshold):
+        """Return ``{shape: count}`` for shapes run at least ``threshold`` times."""
+        return {shape: count for shape, count in self.shapes.items() if count >= threshold}
+
+
+@contextmanager
+def record_queries(using=None, keep_sql=False):
+    """Record queries on ``using`` (or every connection) while the block runs."""
+    recorder = QueryRecorder(keep_sql=keep_sql)
+    aliases = [using] if using else [alias for alias in connections]
+    with ExitStack() as stack:
+        for alias in aliases:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        yield recorder
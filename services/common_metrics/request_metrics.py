@@ -0,0 +1,311 @@
+"""
+Per-endpoint request metrics shared by the backend services.
+
+Requests are recorded per resolved URL name (``users:login``,
+``generic-list``) and method into:
+
+- a latency histogram with log-linear buckets (ten per decade from 0.1ms to
+  100s, HDR-style, so a bucket spans at most a third of its lower bound),
+- request counters per status code,
+- an in-flight gauge,
+- SQL query counts, DB time and repeated query shapes (see ``queries``).
+
+Each worker aggregates in process under a single short lock. When
+``multiprocess_dir`` is set, a daemon thread writes the worker's totals to
+``<dir>/<pid>-<start>.json`` every ``flush_interval`` seconds and the
+scraping worker merges every file, so ``/metrics/`` reports all gunicorn
+workers. Counters of exited workers are kept (they are cumulative); their
+in-flight gauges are dropped. Empty the directory when the service starts.
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+import logging
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the fine histogram buckets; the last bucket is +Inf.
+_MANTISSAS = (1.0, 1.25, 1.5, 2.0, 2.5, 3.0, 4.0, 5.0, 6.0, 7.5)
+BUCKET_BOUNDS = tuple(
+    round(mantissa * 10.0 ** exponent, 7)
+    for exponent in range(-4, 2)
+    for mantissa in _MANTISSAS
+) + (100.0,)
+
+# Buckets exported to Prometheus; each is also a fine bucket bound.
+EXPORT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def bucket_index(seconds):
+    """Return the index of the first bucket whose bound is >= ``seconds``."""
+    low, high = 0, len(BUCKET_BOUNDS)
+    while low < high:
+        middle = (low + high) // 2
+        if BUCKET_BOUNDS[middle] < seconds:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def quantile(buckets, q):
+    """Estimate quantile ``q`` (0-1) from fine bucket counts."""
+    total = sum(buckets)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for index, count in enumerate(buckets):
+        seen += count
+        if seen >= rank:
+            break
+    # Requests slower than the last bound are reported at that bound
+    return BUCKET_BOUNDS[min(index, len(BUCKET_BOUNDS) - 1)]
+
+
+class RequestMetrics:
+    """
+    In-process request histograms, counters and gauges with optional
+    cross-process merging through per-worker files.
+    """
+
+    def __init__(self, prefix='service', multiprocess_dir=None, flush_interval=5):
+        self.prefix = prefix
+        self.multiprocess_dir = multiprocess_dir or None
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._statuses = {}
+        self._in_flight = {}
+        self._queries = {}
+        self._started = time.time()
+        self._flush_thread = None
+        self._flush_pid = None
+
+    def start(self, view_name):
+        """Mark a request to ``view_name`` as in flight."""
+        self._ensure_flush_thread()
+        with self._lock:
+            self._in_flight[view_name] = self._in_flight.get(view_name, 0) + 1
+
+    def finish(self, view_name, method, status_code, seconds, in_flight=True):
+        """Record a completed request."""
+        index = bucket_index(seconds)
+        with self._lock:
+            if in_flight:
+                self._in_flight[view_name] = self._in_flight.get(view_name, 1) - 1
+            histogram = self._histograms.get((view_name, method))
+            if histogram is None:
+                histogram = self._histograms[(view_name, method)] = {
+                    'buckets': [0] * (len(BUCKET_BOUNDS) + 1), 'sum': 0.0, 'count': 0,
+                }
+            histogram['buckets'][index] += 1
+            histogram['sum'] += seconds
+            histogram['count'] += 1
+            key = (view_name, method, str(status_code))
+            self._statuses[key] = self._statuses.get(key, 0) + 1
+
+    def record_queries(self, view_name, method, count, seconds, repeated_shapes):
+        """Record the queries issued by one request."""
+        with self._lock:
+            # [requests, queries, db seconds, requests with repeated shapes]
+            totals = self._queries.get((view_name, method))
+            if totals is None:
+                totals = self._queries[(view_name, method)] = [0, 0, 0.0, 0]
+            totals[0] += 1
+            totals[1] += count
+            totals[2] += seconds
+            totals[3] += 1 if repeated_shapes else 0
+
+    def snapshot(self):
+        """Return this worker's totals as a JSON-serializable dict."""
+        with self._lock:
+            return {
+                'histograms': [
+                    [view, method, list(h['buckets']), h['sum'], h['count']]
+                    for (view, method), h in self._histograms.items()
+                ],
+                'statuses': [[*key, count] for key, count in self._statuses.items()],
+                'in_flight': dict(self._in_flight),
+                'queries': [[view, method, *totals] for (view, method), totals in self._queries.items()],
+            }
+
+    def collect(self):
+        """Merge this worker's totals with every other worker's file."""
+        snapshots = [self.snapshot()]
+        if self.multiprocess_dir:
+            own_file = self._file_path()
+            for path in glob.glob(os.path.join(self.multiprocess_dir, '*.json')):
+                if path == own_file:
+                    continue
+                try:
+                    with open(path) as handle:
+                        snapshot = json.load(handle)
+                except (OSError, ValueError):
+                    continue
+                if not _pid_alive(int(os.path.basename(path).split('-', 1)[0])):
+                    snapshot['in_flight'] = {}
+                snapshots.append(snapshot)
+
+        histograms, statuses, in_flight, queries = {}, {}, {}, {}
+        for snapshot in snapshots:
+            for view, method, buckets, total, count in snapshot['histograms']:
+                merged = histograms.setdefault(
+                    (view, method), {'buckets': [0] * len(buckets), 'sum': 0.0, 'count': 0}
+                )
+                merged['buckets'] = [a + b for a, b in zip(merged['buckets'], buckets)]
+                merged['sum'] += total
+                merged['count'] += count
+            for view, method, status_code, count in snapshot['statuses']:
+                key = (view, method, status_code)
+                statuses[key] = statuses.get(key, 0) + count
+            for view, count in snapshot['in_flight'].items():
+                in_flight[view] = in_flight.get(view, 0) + count
+            for view, method, *totals in snapshot.get('queries', []):
+                merged = queries.setdefault((view, method), [0, 0, 0.0, 0])
+                queries[(view, method)] = [a + b for a, b in zip(merged, totals)]
+        return histograms, statuses, in_flight, queries
+
+    def summary(self):
+        """Return merged per-endpoint counts and p50/p95/p99 latency."""
+        histograms, statuses, in_flight, queries = self.collect()
+        endpoints = {}
+        for (view, method), histogram in sorted(histograms.items()):
+            endpoints[f'{method} {view}'] = {
+                'count': histogram['count'],
+                'avg_seconds': round(histogram['sum'] / histogram['count'], 6),
+                'p50_seconds': quantile(histogram['buckets'], 0.50),
+                'p95_seconds': quantile(histogram['buckets'], 0.95),
+                'p99_seconds': quantile(histogram['buckets'], 0.99),
+                'statuses': {
+                    status_code: count for (v, m, status_code), count in statuses.items()
+                    if v == view and m == method
+                },
+            }
+            if (view, method) in queries:
+                requests, count, seconds, repeated = queries[(view, method)]
+                endpoints[f'{method} {view}'].update({
+                    'avg_queries': round(count / requests, 2),
+                    'avg_db_seconds': round(seconds / requests, 6),
+                    'repeated_query_requests': repeated,
+                })
+        return {'endpoints': endpoints, 'in_flight': in_flight}
+
+    def render_prometheus(self):
+        """Render merged metrics in Prometheus text format."""
+        histograms, statuses, in_flight, queries = self.collect()
+        name = f'{self.prefix}_request_duration_seconds'
+        lines = [f'# TYPE {name} histogram']
+        for (view, method), histogram in sorted(histograms.items()):
+            labels = f'view="{_escape(view)}",method="{method}"'
+            cumulative = 0
+            fine = iter(enumerate(histogram['buckets']))
+            for bound in EXPORT_BUCKETS:
+                for index, count in fine:
+                    cumulative += count
+                    if BUCKET_BOUNDS[index] >= bound:
+                        break
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram["count"]}')
+            lines.append(f'{name}_sum{{{labels}}} {histogram["sum"]}')
+            lines.append(f'{name}_count{{{labels}}} {histogram["count"]}')
+
+        name = f'{self.prefix}_requests_total'
+        lines.append(f'# TYPE {name} counter')
+        for (view, method, status_code), count in sorted(statuses.items()):
+            lines.append(
+                f'{name}{{view="{_escape(view)}",method="{method}",status="{status_code}"}} {count}'
+            )
+
+        name = f'{self.prefix}_requests_in_flight'
+        lines.append(f'# TYPE {name} gauge')
+        for view, count in sorted(in_flight.items()):
+            lines.append(f'{name}{{view="{_escape(view)}"}} {count}')
+
+        for index, (suffix, kind) in enumerate((
+                ('db_queries_total', 'counter'),
+                ('db_query_seconds_total', 'counter'),
+                ('repeated_query_requests_total', 'counter'))):
+            name = f'{self.prefix}_{suffix}'
+            lines.append(f'# TYPE {name} {kind}')
+            for (view, method), totals in sorted(queries.items()):
+                lines.append(f'{name}{{view="{_escape(view)}",method="{method}"}} {totals[index + 1]}')
+        return '\n'.join(lines) + '\n'
+
+    def flush(self):
+        """Write this worker's totals to its multiprocess file."""
+        if not self.multiprocess_dir:
+            return
+        path = self._file_path()
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w') as handle:
+            json.dump(self.snapshot(), handle)
+        os.replace(temporary, path)
+
+    def reset(self):
+        """Forget this worker's totals."""
+        with self._lock:
+            self._histograms.clear()
+            self._statuses.clear()
+            self._in_flight.clear()
+            self._queries.clear()
+
+    def _file_path(self):
+        return os.path.join(self.multiprocess_dir, f'{os.getpid()}-{int(self._started)}.json')
+
+    def _ensure_flush_thread(self):
+        """Start the flush thread in this process if it is not running."""
+        if not self.multiprocess_dir:
+            return
+        pid = os.getpid()
+        if self._flush_thread is not None and self._flush_pid == pid and self._flush_thread.is_alive():
+            return
+        with self._lock:
+            if self._flush_thread is not None and self._flush_pid == pid and self._flush_thread.is_alive():
+                return
+            if self._flush_pid is not None and self._flush_pid != pid:
+                # Forked worker: start from zero, the parent's totals are its own
+                self._histograms, self._statuses, self._in_flight = {}, {}, {}
+                self._queries = {}
+                self._started = time.time()
+            os.makedirs(self.multiprocess_dir, exist_ok=True)
+            self._flush_thread = threading.Thread(
+                target=self._run_flush, name='request-metrics', daemon=True
+            )
+            self._flush_pid = pid
+            self._flush_thread.start()
+
+    def _run_flush(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Request metrics flush failed: {str(e)}")
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+
+request_metrics = RequestMetrics(
+    prefix=getattr(settings, 'REQUEST_METRICS_SETTINGS', {}).get(
+        'prefix', getattr(settings, 'SERVICE_NAME', 'service')
+    ),
+    multiprocess_dir=getattr(settings, 'REQUEST_METRICS_SETTINGS', {}).get('multiprocess_dir'),
+    flush_interval=getattr(settings, 'REQUEST_METRICS_SETTINGS', {}).get('flush_interval', 5),
+)
@@ -0,0 +1,46 @@
+"""
+Query budget assertions for tests.
+
+Unlike ``assertNumQueries`` a budget is an upper bound, so endpoints can get
+cheaper without touching the test, while an added query per row fails it::
+
+    class ProfileTests(QueryBudgetMixin, APITestCase):
+        def test_profile_budget(self):
+            with self.assertQueryBudget(2, max_repeats=1):
+                self.client.get('/api/v1/auth/profile/')
+"""
+
+from contextlib import contextmanager
+from .queries import record_queries
+
+
+@contextmanager
+def query_budget(max_queries, max_repeats=None, using=None):
+    """
+    Fail if the block runs more than ``max_queries`` queries, or any query
+    shape more than ``max_repeats`` times.
+    """
+    with record_queries(using=using, keep_sql=True) as recorder:
+        yield recorder
+
+    if recorder.count > max_queries:
+        executed = '\n'.join(
+            f'{index}. {sql}' for index, (sql, duration) in enumerate(recorder.queries, 1)
+        )
+        raise AssertionError(
+            f"{recorder.count} queries executed, budget is {max_queries}:\n{executed}"
+        )
+    if max_repeats is not None:
+        repeated = recorder.repeated(max_repeats + 1)
+        if repeated:
+            shapes = '\n'.join(f'{count}x {shape}' for shape, count in repeated.items())
+            raise AssertionError(
+                f"Query shapes repeated more than {max_repeats} times (N+1?):\n{shapes}"
+            )
+
+
+class QueryBudgetMixin:
+    """TestCase mixin providing ``assertQueryBudget``."""
+
+    def assertQueryBudget(self, max_queries, max_repeats=None, using=None):
+        return query_budget(max_queries, max_repeats=max_repeats, using=using)